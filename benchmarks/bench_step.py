@@ -0,0 +1,338 @@
+"""
+Benchmark of the simulation step: steps/sec and per-phase latency of
+Playground.step() across worlds, robot counts, lidar resolutions, pymunk
+sub-steps and ray sensor backends.
+
+Run from the root of the repository, headless:
+
+    ARCADE_HEADLESS=1 python -m benchmarks.bench_step --output results.json
+    ARCADE_HEADLESS=1 python -m benchmarks.bench_step --compare results.json
+
+By default, each parameter is swept around a reference case (one parameter
+at a time). Use --full to run the whole cartesian product.
+"""
+import argparse
+import itertools
+import json
+import math
+import platform
+import random
+import sys
+import time
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pymunk
+
+from place_bot.simulation.gui_map.world_abstract import WorldAbstract
+from place_bot.simulation.ray_sensors.lidar import LidarParams
+from place_bot.simulation.utils.constants import ROBOT_DEFAULT_RADIUS
+from place_bot.simulation.utils.definitions import PYMUNK_STEPS
+from place_bot.simulation.utils.profiler import PROFILER
+
+from examples.robots.my_robot_random import MyRobotRandom
+from examples.worlds.world_complete_01 import MyWorldComplete01
+from examples.worlds.world_complete_02 import MyWorldComplete02
+from examples.worlds.world_intermediate_01 import MyWorldIntermediate01
+from examples.worlds.world_random import MyWorldRandom
+
+WORLDS = {
+    "intermediate_01": MyWorldIntermediate01,
+    "complete_01": MyWorldComplete01,
+    "complete_02": MyWorldComplete02,
+    "random": MyWorldRandom,
+}
+
+# "shader": compute shader on the ID framebuffer, "cpu": ID framebuffer read
+# back and sampled with NumPy, "analytic": exact intersections, windowless.
+BACKENDS = ("shader", "cpu", "analytic")
+
+REFERENCE_CASE = {
+    "world": "complete_01",
+    "n_robots": 1,
+    "resolution": 361,
+    "pymunk_steps": PYMUNK_STEPS,
+    "backend": "shader",
+}
+
+SWEEP = {
+    "world": list(WORLDS),
+    "n_robots": [1, 4, 16],
+    "resolution": [91, 361, 1441],
+    "pymunk_steps": [5, PYMUNK_STEPS, 20],
+    "backend": list(BACKENDS),
+}
+
+PARAMETERS = list(REFERENCE_CASE)
+
+
+def case_id(case: Dict) -> str:
+    """
+    Returns a string identifying a case, used to match the results with a baseline.
+    """
+    return ",".join(f"{name}={case[name]}" for name in PARAMETERS)
+
+
+def make_cases(sweep: Dict[str, List], full: bool = False) -> List[Dict]:
+    """
+    Build the list of the cases to run.
+
+    Args:
+        sweep (Dict[str, List]): Values of each parameter.
+        full (bool): If True, the cartesian product of all the values, otherwise
+            each parameter is varied alone around the reference case. A value
+            of the reference case missing from its sweep, e.g. filtered out on
+            the command line, is replaced by the first value of the sweep.
+
+    Returns:
+        List[Dict]: The cases, without duplicates.
+    """
+    if full:
+        cases = [dict(zip(PARAMETERS, values))
+                 for values in itertools.product(*(sweep[name] for name in PARAMETERS))]
+    else:
+        reference = {name: value if value in sweep[name] else sweep[name][0]
+                     for name, value in REFERENCE_CASE.items()}
+        cases = []
+        for name in PARAMETERS:
+            for value in sweep[name]:
+                cases.append({**reference, name: value})
+
+    unique = {case_id(case): case for case in cases}
+    return list(unique.values())
+
+
+def _playground_options(backend: str) -> Dict:
+    """
+    Returns the options of the playgrounds of the worlds selecting a ray sensor backend.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend '{backend}', expected one of {BACKENDS}")
+
+    return {"windowless": backend == "analytic",
+            "use_shaders": backend == "shader",
+            "analytic_rays": backend == "analytic"}
+
+
+def _lidar_params(resolution: int) -> LidarParams:
+    """
+    Returns the parameters of the lidar of the robots, with a given resolution.
+    """
+    lidar_params = LidarParams()
+    lidar_params.resolution = resolution
+    return lidar_params
+
+
+def _add_robots(world: WorldAbstract, n_robots: int, lidar_params: LidarParams,
+                seed: int = 0) -> List[MyRobotRandom]:
+    """
+    Add robots at random free positions in the playground of a world.
+    """
+    playground = world.playground
+    positions = playground.sample_free_positions(n_robots, radius=2 * ROBOT_DEFAULT_RADIUS,
+                                                 rng=np.random.default_rng(seed))
+    robots = []
+
+    for position in positions:
+        robot = MyRobotRandom(lidar_params=lidar_params)
+        coordinates = (tuple(float(v) for v in position), random.uniform(-math.pi, math.pi))
+        playground.add(robot, coordinates)
+        robots.append(robot)
+
+    return robots
+
+
+def run_case(case: Dict, n_steps: int = 200, n_warmup: int = 20, seed: int = 0) -> Dict:
+    """
+    Run one benchmark case.
+
+    The warm-up steps (shader compilation, static layer baking, etc.) are not
+    measured. The step time includes the control() function of the robots.
+
+    Args:
+        case (Dict): Values of the parameters of the case.
+        n_steps (int): Number of measured steps.
+        n_warmup (int): Number of steps run before the measure.
+        seed (int): Seed of the random generators.
+
+    Returns:
+        Dict: The case, with its steps/sec, ms per step and per-phase statistics.
+    """
+    random.seed(seed)
+    np.random.seed(seed)
+
+    lidar_params = _lidar_params(case["resolution"])
+    robot = MyRobotRandom(lidar_params=lidar_params)
+    world = WORLDS[case["world"]](robot, playground_options=_playground_options(case["backend"]))
+    robots = [robot] + _add_robots(world, case["n_robots"] - 1, lidar_params, seed)
+
+    playground = world.playground
+    pymunk_steps = case["pymunk_steps"]
+
+    def step():
+        commands = {robot: robot.control() for robot in robots}
+        playground.step(all_commands=commands, pymunk_steps=pymunk_steps)
+
+    was_enabled = PROFILER.enabled
+    try:
+        for _ in range(n_warmup):
+            step()
+
+        PROFILER.reset()
+        PROFILER.enable()
+        start_time = time.perf_counter()
+        for _ in range(n_steps):
+            step()
+        elapsed = time.perf_counter() - start_time
+        PROFILER.disable()
+
+        phases = {
+            name: {
+                "ms_per_step": 1000 * stats.total / n_steps,
+                "p50_ms": 1000 * stats.percentile(50),
+                "p95_ms": 1000 * stats.percentile(95),
+            }
+            for name, stats in PROFILER.phases.items()
+        }
+        counters = dict(PROFILER.counters)
+    finally:
+        PROFILER.reset()
+        if was_enabled:
+            PROFILER.enable()
+        playground.cleanup()
+
+    return {
+        "id": case_id(case),
+        **case,
+        "n_steps": n_steps,
+        "steps_per_sec": n_steps / elapsed,
+        "ms_per_step": 1000 * elapsed / n_steps,
+        "phases": phases,
+        "counters": counters,
+    }
+
+
+def metadata() -> Dict:
+    """
+    Returns the description of the machine and of the library versions,
+    stored with the results.
+    """
+    import arcade  # pylint: disable=import-outside-toplevel
+
+    return {
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pymunk": pymunk.version,
+        "arcade": arcade.version.VERSION,
+    }
+
+
+def compare(baseline: Dict, results: Dict, tolerance: float = 0.1) -> List[Dict]:
+    """
+    Compare the steps/sec of results with a baseline.
+
+    Args:
+        baseline (Dict): Results of a previous run, as written by this script.
+        results (Dict): Results of the current run.
+        tolerance (float): Relative slowdown above which a case is a regression.
+
+    Returns:
+        List[Dict]: One entry per case present in both runs, with the baseline
+            and current steps/sec, the relative change and a regression flag.
+    """
+    baseline_results = {result["id"]: result for result in baseline["results"]}
+
+    comparison = []
+    for result in results["results"]:
+        reference = baseline_results.get(result["id"])
+        if reference is None:
+            continue
+
+        change = result["steps_per_sec"] / reference["steps_per_sec"] - 1
+        comparison.append({
+            "id": result["id"],
+            "baseline_steps_per_sec": reference["steps_per_sec"],
+            "steps_per_sec": result["steps_per_sec"],
+            "change": change,
+            "regression": change < -tolerance,
+        })
+
+    return comparison
+
+
+def _print_results(results: Sequence[Dict]) -> None:
+    for result in results:
+        top_phases = sorted(result["phases"].items(), key=lambda item: -item[1]["ms_per_step"])[:3]
+        phases = ", ".join(f"{name} {stats['ms_per_step']:.2f}" for name, stats in top_phases)
+        print(f"{result['id']:<80}{result['steps_per_sec']:>9.1f} steps/s  ({phases} ms)")
+
+
+def _print_comparison(comparison: Sequence[Dict]) -> None:
+    for entry in comparison:
+        flag = "REGRESSION" if entry["regression"] else ""
+        print(f"{entry['id']:<80}{entry['baseline_steps_per_sec']:>9.1f} ->"
+              f"{entry['steps_per_sec']:>9.1f} steps/s {100 * entry['change']:>+7.1f}% {flag}")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Command line entry point.
+
+    Returns:
+        int: Exit code, 1 if a regression was found in comparison mode.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark of Playground.step()")
+    parser.add_argument("--worlds", nargs="+", choices=list(WORLDS), default=SWEEP["world"])
+    parser.add_argument("--robots", nargs="+", type=int, default=SWEEP["n_robots"])
+    parser.add_argument("--resolutions", nargs="+", type=int, default=SWEEP["resolution"])
+    parser.add_argument("--pymunk-steps", nargs="+", type=int, default=SWEEP["pymunk_steps"])
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=SWEEP["backend"])
+    parser.add_argument("--full", action="store_true",
+                        help="run the cartesian product of all the values")
+    parser.add_argument("--steps", type=int, default=200, help="number of measured steps")
+    parser.add_argument("--warmup", type=int, default=20, help="number of steps before the measure")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the results in this JSON file")
+    parser.add_argument("--compare", help="baseline JSON file to compare the results with")
+    parser.add_argument("--tolerance", type=float, default=0.1,
+                        help="relative slowdown reported as a regression (default 0.1)")
+    args = parser.parse_args(argv)
+
+    sweep = {
+        "world": args.worlds,
+        "n_robots": args.robots,
+        "resolution": args.resolutions,
+        "pymunk_steps": args.pymunk_steps,
+        "backend": args.backends,
+    }
+
+    results = {
+        "metadata": {**metadata(), "n_steps": args.steps, "n_warmup": args.warmup},
+        "results": [],
+    }
+    for case in make_cases(sweep, full=args.full):
+        result = run_case(case, n_steps=args.steps, n_warmup=args.warmup, seed=args.seed)
+        results["results"].append(result)
+        _print_results([result])
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as file:
+            baseline = json.load(file)
+        comparison = compare(baseline, results, tolerance=args.tolerance)
+        print()
+        _print_comparison(comparison)
+        if any(entry["regression"] for entry in comparison):
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
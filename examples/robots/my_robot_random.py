@@ -6,6 +6,7 @@ import math
 import random
 from enum import Enum
 
+from place_bot.simulation.ray_sensors.lidar import LidarParams
 from place_bot.simulation.robot.robot_abstract import RobotAbstract
 from place_bot.simulation.utils.utils import normalize_angle
 
@@ -24,14 +25,15 @@ class MyRobotRandom(RobotAbstract):
     - TURN: Rotating to a random target angle
     """
 
-    def __init__(self, debug=False):
+    def __init__(self, debug=False, lidar_params: LidarParams = LidarParams()):
         """
         Initialize the random robot.
 
         Args:
             debug (bool): If True, print debug information about state transitions.
+            lidar_params (LidarParams): Parameters of the lidar.
         """
-        super().__init__()
+        super().__init__(lidar_params=lidar_params)
         self.counter_straight = random.randint(50, 100)
         self.target_angle = random.uniform(-math.pi, math.pi)
         self.state = State.STRAIGHT
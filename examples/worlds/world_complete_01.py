@@ -1,5 +1,6 @@
 import math
 import random
+from typing import Any, Dict, Optional
 
 from place_bot.simulation.gui_map.closed_playground import ClosedPlayground
 from place_bot.simulation.gui_map.world_abstract import WorldAbstract
@@ -10,14 +11,14 @@ from .walls_complete_world_1 import add_walls, add_boxes
 
 class MyWorldComplete01(WorldAbstract):
 
-    def __init__(self, robot: RobotAbstract):
-        super().__init__(robot=robot)
+    def __init__(self, robot: RobotAbstract, playground_options: Optional[Dict[str, Any]] = None):
+        super().__init__(robot=robot, playground_options=playground_options)
 
         # PARAMETERS WORLD
         self._size_area = (1110, 750)
 
         # PLAYGROUND
-        self._playground = ClosedPlayground(size=self._size_area)
+        self._playground = ClosedPlayground(size=self._size_area, **self.playground_options)
         add_walls(self._playground)
         add_boxes(self._playground)
 
@@ -1,25 +1,30 @@
 import math
 import random
+from typing import Any, Dict, Optional
+
+import numpy as np
 
 from place_bot.simulation.robot.robot_abstract import RobotAbstract
 from place_bot.simulation.gui_map.closed_playground import ClosedPlayground
 from place_bot.simulation.gui_map.world_abstract import WorldAbstract
+from place_bot.simulation.utils.constants import ROBOT_DEFAULT_RADIUS
 
 
 class MyWorldRandom(WorldAbstract):
 
-    def __init__(self, robot: RobotAbstract):
-        super().__init__(robot=robot)
+    def __init__(self, robot: RobotAbstract, playground_options: Optional[Dict[str, Any]] = None):
+        super().__init__(robot=robot, playground_options=playground_options)
 
         # PARAMETERS WORLD
         self._size_area = (1500, 700)
 
         # PLAYGROUND
-        self._playground = ClosedPlayground(size=self._size_area)
+        self._playground = ClosedPlayground(size=self._size_area, **self.playground_options)
 
-        # POSITION OF THE ROBOT
-        x = random.uniform(-self._size_area[0] / 2, self._size_area[0] / 2)
-        y = random.uniform(-self._size_area[1] / 2, self._size_area[1] / 2)
-        angle = random.uniform(-math.pi, math.pi)
-        self._robot_pos = ((x, y), angle)
+        # POSITION OF THE ROBOT, away from the walls. The generator is seeded
+        # from the random module, so that random.seed() reproduces the world
+        rng = np.random.default_rng(random.getrandbits(64))
+        x, y = self._playground.sample_free_positions(1, radius=ROBOT_DEFAULT_RADIUS, rng=rng)[0]
+        angle = float(rng.uniform(-math.pi, math.pi))
+        self._robot_pos = ((float(x), float(y)), angle)
         self._playground.add(robot, self._robot_pos)
@@ -0,0 +1,315 @@
+"""
+Module that defines the training datasets harvested from episodes: records of
+(lidar, odometer, true pose, command) written into memory-mapped files, one
+shard per worker process, and read back without copy.
+"""
+import glob
+import json
+import os
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from place_bot.simulation.robot.robot_abstract import RobotAbstract
+
+# Name of the index file of a dataset directory
+INDEX_FILE = "index.json"
+
+# Episode of a dataset: index of its shard, first and last + 1 record, seed
+DatasetEpisode = Tuple[int, int, int, Optional[int]]
+
+
+def dataset_dtype(lidar_resolution: int) -> np.dtype:
+    """
+    Returns the dtype of the records of a dataset: seed of the episode
+    (-1 if None), timestep, true pose (x, y, angle), odometer values,
+    lidar distances and command (forward, rotation). Little-endian, so that
+    the files can be read on any machine.
+
+    Args:
+        lidar_resolution (int): Number of rays of the lidar.
+
+    Returns:
+        np.dtype: Structured dtype of a record.
+    """
+    return np.dtype([
+        ("seed", "<i8"),
+        ("timestep", "<i4"),
+        ("pose", "<f4", (3,)),
+        ("odometer", "<f4", (3,)),
+        ("lidar", "<f4", (lidar_resolution,)),
+        ("command", "<f4", (2,)),
+    ])
+
+
+def _shard_paths(directory: str, shard: str) -> Tuple[str, str]:
+    base = os.path.join(directory, f"shard_{shard}")
+    return base + ".bin", base + ".json"
+
+
+class DatasetWriter:
+    """
+    Appends records to one shard of a dataset: a raw binary file of records
+    of dataset_dtype(), pre-sized to a capacity and written through a
+    memory map, and a JSON file with its number of records and episodes.
+
+    Each worker process writes its own shard, so that no lock is needed.
+    The JSON file is written at the end of each episode: the records of the
+    episodes already ended stay readable if the worker is killed. Opening an
+    existing shard appends to it. close() releases the memory map.
+
+    Example Usage
+        writer = DatasetWriter("datasets/run_01", shard="0", lidar_resolution=181)
+        for _ in range(n_steps):
+            command = robot.control()
+            writer.append(robot, command, seed=seed, timestep=playground.timestep)
+            playground.step(all_commands={robot: command})
+        writer.end_episode(seed)
+        writer.close()
+    """
+
+    def __init__(self, directory: str, shard: str, lidar_resolution: int, capacity: int = 65536):
+        """
+        Initialize the DatasetWriter.
+
+        Args:
+            directory (str): Directory of the dataset, created if needed.
+            shard (str): Name of the shard, unique among the writers running at the same time.
+            lidar_resolution (int): Number of rays of the lidar of the robots.
+            capacity (int): Initial number of records of the file. It doubles when full.
+        """
+        os.makedirs(directory, exist_ok=True)
+
+        self._data_path, self._meta_path = _shard_paths(directory, shard)
+        self._dtype = dataset_dtype(lidar_resolution)
+        self._lidar_resolution = lidar_resolution
+
+        self._n_records = 0
+        self._episodes: List[Dict] = []
+        if os.path.exists(self._meta_path):
+            with open(self._meta_path, encoding="utf-8") as file:
+                metadata = json.load(file)
+            if metadata["lidar_resolution"] != lidar_resolution:
+                raise ValueError(f"Shard {shard} has a lidar resolution of "
+                                 f"{metadata['lidar_resolution']}, not {lidar_resolution}")
+            self._n_records = metadata["n_records"]
+            self._episodes = metadata["episodes"]
+
+        self._episode_start = self._n_records
+        self._records: Optional[np.memmap] = None
+        self._open(max(capacity, self._n_records, 1))
+
+    @property
+    def n_records(self) -> int:
+        """
+        Returns the number of records of the shard.
+        """
+        return self._n_records
+
+    @property
+    def closed(self) -> bool:
+        """
+        Returns whether the writer was closed.
+        """
+        return self._records is None
+
+    def _open(self, capacity: int) -> None:
+        """
+        Map the file, after extending it to the capacity if needed.
+        """
+        size = capacity * self._dtype.itemsize
+        with open(self._data_path, "ab") as file:
+            if file.tell() < size:
+                file.truncate(size)
+
+        self._records = np.memmap(self._data_path, dtype=self._dtype, mode="r+", shape=(capacity,))
+
+    def append(
+            self,
+            robot: RobotAbstract,
+            command: Dict[str, float],
+            seed: Optional[int] = None,
+            timestep: int = 0,
+    ) -> None:
+        """
+        Append the current observations of a robot and the command it chose.
+
+        Args:
+            robot (RobotAbstract): The robot.
+            command (Dict[str, float]): Command returned by robot.control().
+            seed (Optional[int]): Seed of the episode.
+            timestep (int): Timestep of the playground.
+        """
+        if self._records is None:
+            raise ValueError("The dataset writer is closed")
+
+        if self._n_records == len(self._records):
+            self._records.flush()
+            self._open(2 * len(self._records))
+
+        index = self._n_records
+        records = self._records
+        records["seed"][index] = -1 if seed is None else seed
+        records["timestep"][index] = timestep
+        records["pose"][index] = (*robot.true_position(), robot.true_angle())
+
+        odometer = robot.odometer_values()
+        records["odometer"][index] = np.nan if odometer is None else odometer
+        lidar = robot.lidar_values()
+        records["lidar"][index] = np.nan if lidar is None else lidar
+
+        records["command"][index] = (command.get("forward", 0.0), command.get("rotation", 0.0))
+
+        self._n_records += 1
+
+    def end_episode(self, seed: Optional[int] = None) -> None:
+        """
+        End the current episode: flush the records and write the metadata of the shard.
+
+        Args:
+            seed (Optional[int]): Seed of the episode.
+        """
+        if self._n_records > self._episode_start:
+            self._episodes.append({"seed": seed, "start": self._episode_start,
+                                   "stop": self._n_records})
+        self._episode_start = self._n_records
+
+        if self._records is None:
+            raise ValueError("The dataset writer is closed")
+        self._records.flush()
+        with open(self._meta_path, "w", encoding="utf-8") as file:
+            json.dump({"lidar_resolution": self._lidar_resolution,
+                       "n_records": self._n_records,
+                       "episodes": self._episodes}, file)
+
+    def close(self) -> None:
+        """
+        Flush the records and release the memory map of the shard. The records
+        of an episode not ended are not listed in the metadata of the shard.
+        """
+        if self._records is None:
+            return
+
+        self._records.flush()
+        self._records = None
+
+
+def write_index(directory: str) -> Dict:
+    """
+    Gather the metadata of the shards of a dataset into its index file.
+
+    Args:
+        directory (str): Directory of the dataset.
+
+    Returns:
+        Dict: The index.
+    """
+    shards = []
+    lidar_resolution = None
+    for meta_path in sorted(glob.glob(os.path.join(directory, "shard_*.json"))):
+        with open(meta_path, encoding="utf-8") as file:
+            metadata = json.load(file)
+
+        if lidar_resolution not in (None, metadata["lidar_resolution"]):
+            raise ValueError("The shards of the dataset have different lidar resolutions")
+        lidar_resolution = metadata["lidar_resolution"]
+
+        shards.append({"file": os.path.basename(meta_path)[:-len(".json")] + ".bin",
+                       "n_records": metadata["n_records"],
+                       "episodes": metadata["episodes"]})
+
+    index = {
+        "lidar_resolution": lidar_resolution,
+        "n_records": sum(shard["n_records"] for shard in shards),
+        "shards": shards,
+    }
+    with open(os.path.join(directory, INDEX_FILE), "w", encoding="utf-8") as file:
+        json.dump(index, file, indent=1)
+
+    return index
+
+
+class Dataset:
+    """
+    Read-only view on a dataset written by DatasetWriter: each shard is a
+    np.memmap of records of dataset_dtype(), so that the fields are read
+    without copy, e.g. dataset.shards[0]["lidar"].
+
+    Without a file format of its own, a shard can also be opened directly:
+        np.memmap(path, dtype=dataset_dtype(lidar_resolution), mode="r", shape=(n_records,))
+    with the values of the index file.
+
+    Example Usage
+        dataset = Dataset("datasets/run_01")
+        for shard in dataset.shards:
+            train_on(shard["lidar"], shard["odometer"], shard["command"])
+    """
+
+    def __init__(self, directory: str):
+        """
+        Initialize the Dataset. The index file is written if it is missing.
+
+        Args:
+            directory (str): Directory of the dataset.
+        """
+        index_path = os.path.join(directory, INDEX_FILE)
+        if os.path.exists(index_path):
+            with open(index_path, encoding="utf-8") as file:
+                self._index = json.load(file)
+        else:
+            self._index = write_index(directory)
+
+        lidar_resolution = self._index["lidar_resolution"]
+        self._dtype = None if lidar_resolution is None else dataset_dtype(lidar_resolution)
+
+        self._shards: List[np.ndarray] = []
+        self._episodes: List[DatasetEpisode] = []
+        for shard in self._index["shards"]:
+            n_records = shard["n_records"]
+            if n_records:
+                records = np.memmap(os.path.join(directory, shard["file"]), dtype=self._dtype,
+                                    mode="r", shape=(n_records,))
+            else:
+                records = np.zeros(0, dtype=self._dtype)
+
+            for episode in shard["episodes"]:
+                self._episodes.append((len(self._shards), episode["start"],
+                                       episode["stop"], episode["seed"]))
+            self._shards.append(records)
+
+    def __len__(self) -> int:
+        return self._index["n_records"]
+
+    @property
+    def dtype(self) -> Optional[np.dtype]:
+        """
+        Returns the dtype of the records, None if the dataset is empty.
+        """
+        return self._dtype
+
+    @property
+    def shards(self) -> List[np.ndarray]:
+        """
+        Returns the records of each shard, memory-mapped.
+        """
+        return self._shards
+
+    @property
+    def episodes(self) -> List[DatasetEpisode]:
+        """
+        Returns the episodes of the dataset: (shard, start, stop, seed).
+        """
+        return self._episodes
+
+    def episode(self, index: int) -> np.ndarray:
+        """
+        Returns the records of an episode, as a view on its shard.
+
+        Args:
+            index (int): Index of the episode in episodes.
+
+        Returns:
+            np.ndarray: The records.
+        """
+        shard, start, stop, _ = self._episodes[index]
+        return self._shards[shard][start:stop]
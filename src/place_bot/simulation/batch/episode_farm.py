@@ -0,0 +1,312 @@
+"""
+Module that defines the episode farm, which runs many independent episodes
+in parallel on a pool of processes, e.g. to grade many robot controllers.
+"""
+import gc
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Iterator, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+import pymunk
+
+from place_bot.simulation.batch.dataset import DatasetWriter, write_index
+from place_bot.simulation.batch.vector_playground import (
+    RobotFactory,
+    WorldFactory,
+    make_windowless_world,
+)
+from place_bot.simulation.robot.robot_abstract import RobotAbstract
+from place_bot.simulation.utils.constants import FRAME_RATE
+from place_bot.simulation.utils.profiler import PROFILER
+from place_bot.simulation.utils.utils import normalize_angle
+
+
+class EpisodeResult:
+    """
+    Result of one episode run by the episode farm.
+
+    Attributes:
+        seed (Optional[int]): Seed of the episode.
+        n_steps (int): Number of timesteps actually run.
+        trajectory (np.ndarray): True poses (n_steps + 1, 3) of the robot, as (x, y, orientation).
+        odometer (np.ndarray): Odometer values (n_steps + 1, 3), in the frame of the initial pose.
+        odometer_drift (np.ndarray): Odometer drift (n_steps + 1, 2), as (position error, angle error).
+        n_collisions (int): Number of new contacts between the robot and another entity.
+        n_steps_in_contact (int): Number of timesteps during which the robot touches something.
+        walltime (float): Wall-clock duration of the episode, in seconds.
+        error (Optional[str]): Description of the exception raised by the episode, if any.
+    """
+
+    def __init__(self, seed: Optional[int]):
+        self.seed = seed
+        self.n_steps = 0
+        self.trajectory = np.zeros((0, 3))
+        self.odometer = np.zeros((0, 3))
+        self.odometer_drift = np.zeros((0, 2))
+        self.n_collisions = 0
+        self.n_steps_in_contact = 0
+        self.walltime = 0.0
+        self.error: Optional[str] = None
+
+    @property
+    def final_drift(self) -> float:
+        """
+        Returns the position error of the odometer at the end of the episode.
+        """
+        if len(self.odometer_drift) == 0:
+            return math.nan
+        return float(self.odometer_drift[-1, 0])
+
+    def __repr__(self) -> str:
+        return (f"EpisodeResult(seed={self.seed}, n_steps={self.n_steps}, "
+                f"final_drift={self.final_drift:.2f}, n_collisions={self.n_collisions}, "
+                f"walltime={self.walltime:.2f}s, error={self.error!r})")
+
+
+def _touching_shapes(robot: RobotAbstract) -> Set[pymunk.Shape]:
+    """
+    Returns the shapes of other entities currently touching the base of the robot.
+
+    The arbiters are read after the timestep, so a contact lasting only a
+    fraction of the physics sub-steps may be missed.
+    """
+    shapes = set()
+    robot_shapes = set(robot.base.pm_shapes)
+
+    def collect(arbiter: pymunk.Arbiter) -> None:
+        if any(shape.sensor for shape in arbiter.shapes):
+            return
+        shapes.update(shape for shape in arbiter.shapes if shape not in robot_shapes)
+
+    robot.base.pm_body.each_arbiter(collect)
+    return shapes
+
+
+def run_episode(
+        world_factory: WorldFactory,
+        robot_factory: RobotFactory,
+        n_steps: int,
+        seed: Optional[int] = None,
+        dataset_directory: Optional[str] = None,
+) -> EpisodeResult:
+    """
+    Run one episode in a windowless playground, with the commands given by
+    the control() function of the robot.
+
+    The timesteps follow the sequence of the Simulator: the robot is not
+    controlled at the first timestep, and before each call of control() its
+    elapsed_timestep and elapsed_walltime are set, the latter to the
+    simulated time of the previous timestep.
+
+    Exceptions raised by the robot controller are caught and stored in the
+    result, so that one faulty controller does not stop the whole farm.
+
+    Args:
+        world_factory (WorldFactory): Builds a world around a robot.
+        robot_factory (RobotFactory): Builds a robot.
+        n_steps (int): Step budget of the episode.
+        seed (Optional[int]): Seed of the episode.
+        dataset_directory (Optional[str]): Directory of a dataset where the
+            observations of the robot and its commands are appended at each
+            timestep, in the shard of the current process (see DatasetWriter).
+
+    Returns:
+        EpisodeResult: The result of the episode.
+    """
+    result = EpisodeResult(seed)
+    start_time = time.perf_counter()
+
+    trajectory: List[np.ndarray] = []
+    odometer: List[np.ndarray] = []
+
+    world = None
+    writer = None
+    try:
+        world = make_windowless_world(world_factory, robot_factory, seed)
+        playground = world.playground
+        robot = world.robot
+        if dataset_directory is not None:
+            # The writer is only open during the episode: the next episode
+            # of the process appends to the same shard with a new writer
+            writer = DatasetWriter(dataset_directory, shard=str(os.getpid()),
+                                   lidar_resolution=robot.lidar().resolution)
+
+        def record():
+            trajectory.append(np.array([*robot.true_position(), robot.true_angle()]))
+            values = robot.odometer_values()
+            odometer.append(np.full(3, np.nan) if values is None else np.array(values))
+
+        previous_touching: Set[pymunk.Shape] = set()
+        all_commands = {}
+        # Initial value of Simulator.elapsed_walltime
+        elapsed_walltime = 0.001
+        record()
+        for elapsed_timestep in range(1, n_steps + 1):
+            # As in the Simulator, the robot is not controlled at the first timestep
+            controlled = elapsed_timestep >= 2
+            if controlled:
+                robot.elapsed_timestep = elapsed_timestep
+                robot.elapsed_walltime = elapsed_walltime
+                with PROFILER.phase("control"):
+                    all_commands[robot] = robot.control()
+            if writer is not None:
+                writer.append(robot, all_commands.get(robot, {}), seed=seed,
+                              timestep=playground.timestep)
+            playground.step(all_commands=all_commands)
+
+            touching = _touching_shapes(robot)
+            result.n_collisions += len(touching - previous_touching)
+            result.n_steps_in_contact += int(len(touching) > 0)
+            previous_touching = touching
+            result.n_steps += 1
+            record()
+
+            if controlled:
+                elapsed_walltime = elapsed_timestep * FRAME_RATE
+
+    except Exception as error:  # pylint: disable=broad-except
+        result.error = f"{type(error).__name__}: {error}"
+
+    finally:
+        if writer is not None:
+            writer.end_episode(seed)
+            writer.close()
+        if world is not None and world.playground is not None:
+            world.playground.cleanup()
+
+    if trajectory:
+        result.trajectory = np.stack(trajectory)
+        result.odometer = np.stack(odometer)
+        result.odometer_drift = odometer_drift(result.trajectory, result.odometer)
+
+    result.walltime = time.perf_counter() - start_time
+    return result
+
+
+def odometer_drift(trajectory: np.ndarray, odometer: np.ndarray) -> np.ndarray:
+    """
+    Compute the drift of the odometer along a trajectory.
+
+    The odometer integrates from zero, in the frame of the initial pose of the
+    robot, so the true poses are first expressed in this frame.
+
+    Args:
+        trajectory (np.ndarray): True poses (n, 3) of the robot.
+        odometer (np.ndarray): Odometer values (n, 3).
+
+    Returns:
+        np.ndarray: Drift (n, 2), as (position error in pixels, absolute angle error in radians).
+    """
+    x0, y0, angle0 = trajectory[0]
+    cos0, sin0 = math.cos(angle0), math.sin(angle0)
+
+    dx = trajectory[:, 0] - x0
+    dy = trajectory[:, 1] - y0
+    local_x = cos0 * dx + sin0 * dy
+    local_y = -sin0 * dx + cos0 * dy
+    local_angle = normalize_angle(trajectory[:, 2] - angle0)
+
+    drift = np.zeros((len(trajectory), 2))
+    drift[:, 0] = np.hypot(odometer[:, 0] - local_x, odometer[:, 1] - local_y)
+    drift[:, 1] = np.abs(normalize_angle(odometer[:, 2] - local_angle))
+    return drift
+
+
+class EpisodeFarm:
+    """
+    Runs episodes of a world and a robot over many seeds, in parallel on a pool
+    of processes. Each worker builds its own windowless playground, so no
+    window nor OpenGL context is shared between processes.
+
+    The factories must be picklable, i.e. defined at the top level of a module
+    (the world and robot classes themselves are fine).
+
+    Example Usage
+        farm = EpisodeFarm(MyWorldComplete01, MyRobotRandom, n_steps=2000)
+        for result in farm.run(seeds=range(100)):
+            print(result)
+    """
+
+    def __init__(
+            self,
+            world_factory: WorldFactory,
+            robot_factory: RobotFactory,
+            n_steps: int,
+            max_workers: Optional[int] = None,
+            mp_context=None,
+            dataset_directory: Optional[str] = None,
+    ):
+        """
+        Initialize the EpisodeFarm.
+
+        Args:
+            world_factory (WorldFactory): Builds a world around a robot.
+            robot_factory (RobotFactory): Builds a robot.
+            n_steps (int): Step budget of each episode.
+            max_workers (Optional[int]): Number of worker processes, by default the number of CPUs.
+            mp_context: Multiprocessing context of the pool, e.g. multiprocessing.get_context("spawn").
+            dataset_directory (Optional[str]): Directory of a training dataset
+                of the observations and commands of the robots, one shard per
+                worker process (see Dataset).
+        """
+        self._world_factory = world_factory
+        self._robot_factory = robot_factory
+        self._n_steps = n_steps
+        self._max_workers = max_workers
+        self._mp_context = mp_context
+        self._dataset_directory = dataset_directory
+
+    def run(self, seeds: Sequence[Optional[int]]) -> Iterator[EpisodeResult]:
+        """
+        Run one episode per seed and yield the results as soon as they are completed,
+        i.e. not necessarily in the order of the seeds. With a dataset
+        directory, its index file is written once all the episodes are completed.
+
+        Args:
+            seeds (Sequence[Optional[int]]): Seeds of the episodes.
+
+        Yields:
+            EpisodeResult: The result of each episode.
+        """
+        for _, result in self._run(seeds):
+            yield result
+
+    def _run(self, seeds: Sequence[Optional[int]]) -> Iterator[Tuple[int, EpisodeResult]]:
+        """
+        Run one episode per seed and yield the results as soon as they are
+        completed, with the index of their seed, as seeds may be repeated.
+        """
+        # The forked workers must not run the finalizers of the garbage of the
+        # parent, e.g. the EGL display of a closed window, which blocks there
+        gc.collect()
+        with ProcessPoolExecutor(max_workers=self._max_workers,
+                                 mp_context=self._mp_context) as executor:
+            futures = {executor.submit(run_episode,
+                                       self._world_factory,
+                                       self._robot_factory,
+                                       self._n_steps,
+                                       seed,
+                                       self._dataset_directory): index
+                       for index, seed in enumerate(seeds)}
+
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+
+        if self._dataset_directory is not None:
+            write_index(self._dataset_directory)
+
+    def run_all(self, seeds: Sequence[Optional[int]]) -> List[EpisodeResult]:
+        """
+        Run one episode per seed and return all the results, in the order of the seeds.
+
+        Args:
+            seeds (Sequence[Optional[int]]): Seeds of the episodes.
+
+        Returns:
+            List[EpisodeResult]: The results of the episodes.
+        """
+        results = sorted(self._run(seeds), key=lambda indexed: indexed[0])
+        return [result for _, result in results]
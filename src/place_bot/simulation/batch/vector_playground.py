@@ -0,0 +1,236 @@
+"""
+Module that defines VectorPlayground, which steps several independent
+worlds in lockstep, e.g. for reinforcement learning.
+"""
+from __future__ import annotations
+
+import random
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from place_bot.simulation.gui_map.playground import Playground
+from place_bot.simulation.gui_map.world_abstract import WorldAbstract
+from place_bot.simulation.ray_sensors.ray_compute import RayCompute
+from place_bot.simulation.robot.robot_abstract import RobotAbstract
+from place_bot.simulation.utils.definitions import PYMUNK_STEPS
+from place_bot.simulation.utils.profiler import PROFILER
+
+# Builds a world around a robot, with the keyword arguments of its playground
+WorldFactory = Callable[..., WorldAbstract]
+RobotFactory = Callable[[], RobotAbstract]
+
+
+def make_windowless_world(
+        world_factory: WorldFactory,
+        robot_factory: RobotFactory,
+        seed: Optional[int] = None,
+) -> WorldAbstract:
+    """
+    Build a world and its robot without any arcade window: the world is
+    given the playground options {"windowless": True, "seed": seed}.
+
+    The seed is the one of the playground, from which the noise of the
+    sensors is drawn. As the worlds and the robots draw their initial
+    positions from the global random generators of 'random' and 'numpy',
+    these are also seeded while the world is built, and their state is
+    restored afterwards.
+
+    Args:
+        world_factory (WorldFactory): Builds the world around a robot, e.g.
+            MyWorldComplete01. It takes the playground_options of WorldAbstract.
+        robot_factory (RobotFactory): Builds the robot, e.g. MyRobotRandom.
+        seed (Optional[int]): Seed of the world.
+
+    Returns:
+        WorldAbstract: The world, with a windowless playground.
+    """
+    playground_options = {"windowless": True, "seed": seed}
+    if seed is None:
+        return world_factory(robot_factory(), playground_options=playground_options)
+
+    random_state = random.getstate()
+    np_random_state = np.random.get_state()
+    random.seed(seed)
+    np.random.seed(seed)
+    try:
+        return world_factory(robot_factory(), playground_options=playground_options)
+    finally:
+        random.setstate(random_state)
+        np.random.set_state(np_random_state)
+
+
+class VectorPlayground:
+    """
+    Steps K independent worlds in lockstep, each with one robot.
+
+    Commands are given as a (K, 2) array of (forward, rotation) values, and
+    the observations are returned as stacked arrays: lidar values (K, resolution)
+    and odometer values (K, 3). The lidars of the K worlds are computed by a
+    single call of the analytic ray casting kernel.
+
+    Example Usage
+        vector_playground = VectorPlayground(MyWorldComplete01, MyRobotRandom,
+                                             seeds=range(16))
+        lidar, odometer = vector_playground.reset()
+        for _ in range(1000):
+            commands = policy(lidar, odometer)  # array of shape (16, 2)
+            lidar, odometer = vector_playground.step(commands)
+    """
+
+    def __init__(
+            self,
+            world_factory: WorldFactory,
+            robot_factory: RobotFactory,
+            seeds: Sequence[Optional[int]],
+    ):
+        """
+        Initialize the VectorPlayground.
+
+        Args:
+            world_factory (WorldFactory): Builds a world around a robot.
+            robot_factory (RobotFactory): Builds a robot.
+            seeds (Sequence[Optional[int]]): One seed per world.
+        """
+        self._worlds: List[WorldAbstract] = [
+            make_windowless_world(world_factory, robot_factory, seed) for seed in seeds
+        ]
+
+        resolutions = {world.robot.lidar().resolution for world in self._worlds}
+        if len(resolutions) != 1:
+            raise ValueError("All the robots must have the same lidar resolution")
+
+        self._resolution = resolutions.pop()
+
+    @property
+    def n_worlds(self) -> int:
+        """
+        Returns the number of worlds.
+        """
+        return len(self._worlds)
+
+    @property
+    def worlds(self) -> List[WorldAbstract]:
+        """
+        Returns the worlds.
+        """
+        return self._worlds
+
+    @property
+    def playgrounds(self) -> List[Playground]:
+        """
+        Returns the playgrounds of the worlds.
+        """
+        return [world.playground for world in self._worlds]
+
+    @property
+    def robots(self) -> List[RobotAbstract]:
+        """
+        Returns the robots of the worlds.
+        """
+        return [world.robot for world in self._worlds]
+
+    def reset(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Reset all the worlds.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Lidar values (K, resolution) and odometer values (K, 3).
+        """
+        for playground in self.playgrounds:
+            playground.reset()
+
+        return self.observations()
+
+    def step(
+            self,
+            commands: np.ndarray,
+            pymunk_steps: int = PYMUNK_STEPS,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Step all the worlds by one timestep.
+
+        Args:
+            commands (np.ndarray): Commands (K, 2) of the robots, (forward, rotation) in [-1, 1].
+            pymunk_steps (int): Number of steps for the pymunk physics engine to run.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Lidar values (K, resolution) and odometer values (K, 3).
+        """
+        commands = np.asarray(commands, dtype=float)
+        if commands.shape != (self.n_worlds, 2):
+            raise ValueError(f"commands must have shape ({self.n_worlds}, 2)")
+
+        for world, (forward, rotation) in zip(self._worlds, commands):
+            all_commands = {world.robot: {"forward": forward, "rotation": rotation}}
+            world.playground.begin_step(all_commands, pymunk_steps)
+
+        RayCompute.update_sensors_batch(
+            [playground.ray_compute for playground in self.playgrounds]
+        )
+
+        for playground in self.playgrounds:
+            playground.end_step(update_ray_sensors=False)
+
+        return self.observations()
+
+    def robot_commands(self) -> np.ndarray:
+        """
+        Call the control() function of each robot.
+
+        Returns:
+            np.ndarray: Commands (K, 2) of the robots.
+        """
+        commands = np.zeros((self.n_worlds, 2))
+
+        for index, robot in enumerate(self.robots):
+            with PROFILER.phase("control"):
+                command = robot.control() or {}
+            commands[index, 0] = command.get("forward", 0.0)
+            commands[index, 1] = command.get("rotation", 0.0)
+
+        return commands
+
+    def observations(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the current observations of all the robots. Values of disabled
+        sensors are NaN.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Lidar values (K, resolution) and odometer values (K, 3).
+        """
+        lidar = np.full((self.n_worlds, self._resolution), np.nan)
+        odometer = np.full((self.n_worlds, 3), np.nan)
+
+        for index, robot in enumerate(self.robots):
+            lidar_values = robot.lidar_values()
+            if lidar_values is not None:
+                lidar[index] = lidar_values
+
+            odometer_values = robot.odometer_values()
+            if odometer_values is not None:
+                odometer[index] = odometer_values
+
+        return lidar, odometer
+
+    def true_poses(self) -> np.ndarray:
+        """
+        Returns the true poses of the robots, for debugging or rewards.
+
+        Returns:
+            np.ndarray: Poses (K, 3) as (x, y, orientation).
+        """
+        poses = np.zeros((self.n_worlds, 3))
+
+        for index, robot in enumerate(self.robots):
+            poses[index, :2] = robot.true_position()
+            poses[index, 2] = robot.true_angle()
+
+        return poses
+
+    def close(self) -> None:
+        """
+        Release the resources of all the playgrounds.
+        """
+        for playground in self.playgrounds:
+            playground.cleanup()
@@ -17,6 +17,8 @@ class DisappearingWall(NormalWall):
         wall = DisappearingWall(pos_start=(0, 0), pos_end=(100, 0), disappear_after_timesteps=150)
     """
 
+    _snapshot_attributes = ("_disappeared", "_creation_timestep")
+
     def __init__(
         self,
         pos_start: Tuple[float, float],
@@ -89,6 +91,8 @@ class DisappearingBox(NormalBox):
         box = DisappearingBox(up_left_point=(0, 0), width=50, height=50, disappear_after_timesteps=1350)
     """
 
+    _snapshot_attributes = ("_disappeared", "_creation_timestep")
+
     def __init__(
         self,
         up_left_point: Tuple[float, float],
@@ -9,9 +9,9 @@ from typing import List, Optional, Tuple, Union
 import arcade
 import pymunk
 import pymunk.autogeometry
-from PIL import Image
 
 from place_bot.simulation.elements.entity import Entity
+from place_bot.simulation.utils.texture_manager import TEXTURE_MANAGER, uid_to_color
 from place_bot.simulation.utils.definitions import ELASTICITY_ENTITY, FRICTION_ENTITY
 
 Coordinate = Tuple[Tuple[float, float], float]
@@ -224,7 +224,7 @@ class EmbodiedEntity(Entity, ABC):
         Returns:
             Tuple[int, int, int, int]: RGBA color tuple.
         """
-        return self._uid & 255, (self._uid >> 8) & 255, (self._uid >> 16) & 255, 255
+        return uid_to_color(self._uid)
 
     @property
     def moved(self) -> bool:
@@ -399,6 +399,10 @@ class EmbodiedEntity(Entity, ABC):
         """
         Returns the arcade.Sprite for this entity, optionally using a color UID.
 
+        With the color UID, the sprite uses the white mask of the texture,
+        tinted with the color UID, so that the entities with the same texture
+        share it in the ID views.
+
         Args:
             zoom (float): Zoom factor.
             use_color_uid (bool): Whether to use color UID.
@@ -408,7 +412,7 @@ class EmbodiedEntity(Entity, ABC):
         """
         texture = self._base_sprite.texture
         if use_color_uid:
-            texture = self.generate_texture_with_id_color(texture)
+            texture = TEXTURE_MANAGER.mask_texture(texture)
 
         assert isinstance(texture, arcade.Texture)
 
@@ -419,50 +423,13 @@ class EmbodiedEntity(Entity, ABC):
             hit_box_detail=1,
         )
 
-        if self._color and not use_color_uid:
+        if use_color_uid:
+            sprite.color = self.color_uid[:3]
+        elif self._color:
             sprite.color = self._color
 
         return sprite
 
-    def generate_texture_with_id_color(self, texture: arcade.Texture) -> arcade.Texture:
-        """
-        Generates a new texture where the entity's unique identifier (UID) is encoded
-        as a color. This is useful for rendering objects with unique colors for debugging
-        or identification purposes.
-
-        Args:
-            texture (arcade.Texture): The original texture of the entity.
-
-        Returns:
-            arcade.Texture: A new texture with the UID encoded as a color.
-        """
-        # Create a new blank RGBA image with the same size as the input texture
-        img_uid = Image.new("RGBA", texture.size)
-        pixels = img_uid.load()  # Access the pixel data of the new image
-        pixels_texture = texture.image.load()  # Access the pixel data of the original texture
-
-        # Iterate over each pixel in the new image img_uid
-        for i in range(img_uid.size[0]):
-            for j in range(img_uid.size[1]):
-
-                # If the pixel is fully transparent in the original texture,
-                # set the pixel to fully transparent and black in the new image
-                if pixels_texture[i, j][3] == 0:
-                    pixels[i, j] = (0, 0, 0, 0)
-
-                # Else if the pixel is not black in the original texture
-                else:
-                    pixels[i, j] = self.color_uid  # type: ignore
-
-        texture = arcade.Texture(
-            name=str(self._uid),
-            image=img_uid,
-            hit_box_algorithm="Detailed",
-            hit_box_detail=1,
-        )
-
-        return texture
-
     @property
     def needs_sprite_update(self) -> bool:
         """
@@ -573,6 +540,8 @@ class EmbodiedEntity(Entity, ABC):
             self._pm_body.space.reindex_shapes_for_body(self._pm_body)
 
         self._moved = True
+        self._playground.mark_sprite_dirty(self)
+        self._playground.mark_geometry_dirty(self)
 
 
     ##############
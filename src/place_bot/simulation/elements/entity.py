@@ -9,8 +9,9 @@ objects in simple-playgrounds.
 """
 from __future__ import annotations
 
+import copy
 from abc import ABC
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
 
 if TYPE_CHECKING:
     from place_bot.simulation.gui_map.playground import Playground
@@ -22,6 +23,10 @@ class Entity(ABC):
     Entities can be: SceneElement, Agent, Spawner, Timer, ...
     """
 
+    # Attributes holding the state of the entity that changes during an
+    # episode, captured by Playground.snapshot() (see get_state)
+    _snapshot_attributes: Tuple[str, ...] = ()
+
     def __init__(
             self,
             name: Optional[str] = None,
@@ -135,6 +140,32 @@ class Entity(ABC):
         revert the entity back to its original state.
         """
 
+    def get_state(self) -> Dict[str, Any]:
+        """
+        Returns a copy of the state of the entity that changes during an
+        episode: the attributes listed in _snapshot_attributes. The position
+        and velocity of the body are captured by the Playground.
+
+        The attributes are copied together, so that objects shared by several
+        of them (e.g. a random generator and the noise model using it) stay
+        shared in the copy.
+
+        Returns:
+            Dict[str, Any]: The attributes, by name.
+        """
+        return copy.deepcopy({name: getattr(self, name) for name in self._snapshot_attributes})
+
+    def set_state(self, state: Dict[str, Any]) -> None:
+        """
+        Restore a state returned by get_state(). The state is copied, so that
+        it can be restored again.
+
+        Args:
+            state (Dict[str, Any]): The attributes, by name.
+        """
+        for name, value in copy.deepcopy(state).items():
+            setattr(self, name, value)
+
     def pre_step(self) -> None:
         """
         Preliminary calculations before the pymunk engine steps.
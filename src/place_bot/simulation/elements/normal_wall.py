@@ -2,14 +2,13 @@ import math
 import random
 from typing import Tuple
 
-import arcade
 import numpy as np
 import pymunk
-from PIL import Image
 
 from place_bot.resources import path_resources
 from place_bot.simulation.elements.physical_element import PhysicalElement
 from place_bot.simulation.utils.definitions import CollisionTypes
+from place_bot.simulation.utils.texture_manager import N_TEXTURE_VARIANTS, TEXTURE_MANAGER
 
 
 class ColorWall(PhysicalElement):
@@ -54,25 +53,13 @@ class ColorWall(PhysicalElement):
 
         self.wall_coordinates = (position.x, position.y), angle
 
+        # The textures are shared by all the walls of the same size
+        size = (round(length), int(wall_thickness))
         if color is not None:
-            img = Image.new("RGBA",
-                            (int(wall_thickness), int(length)), color)
-            texture = arcade.Texture(
-                name=f"Wall_{int(position.x)}_{int(position.y)}_{int(math.degrees(angle))}_{length}",
-                image=img,
-                hit_box_algorithm="Detailed",
-                hit_box_detail=1,
-            )
+            texture = TEXTURE_MANAGER.solid_texture(size, color)
         elif file_name is not None:
-            w_img = 2000
-            h_img = 2000
-            x = random.randint(0, int(w_img - length - 1))
-            y = random.randint(0, int(h_img - wall_thickness - 1))
-            texture = arcade.load_texture(file_name=file_name,
-                                          x=x,
-                                          y=y,
-                                          width=length,
-                                          height=wall_thickness)
+            variant = random.randrange(N_TEXTURE_VARIANTS)
+            texture = TEXTURE_MANAGER.crop_texture(file_name, size, variant)
         else:
             raise ValueError('Either color or file_name must be provided')
 
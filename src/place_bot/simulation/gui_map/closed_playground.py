@@ -1,5 +1,5 @@
 import platform
-from typing import Tuple
+from typing import Optional, Tuple
 
 from place_bot.simulation.robot.agent import Agent
 from place_bot.simulation.elements.embodied import EmbodiedEntity
@@ -28,13 +28,22 @@ class ClosedPlayground(Playground):
         _height: The height of the playground.
     """
 
-    def __init__(self, size: Tuple[int, int], use_shaders: bool = True, border_thickness: int = 6):
+    def __init__(self, size: Tuple[int, int], use_shaders: bool = True, border_thickness: int = 6,
+                 analytic_rays: bool = False, windowless: bool = False,
+                 async_ray_readback: bool = False, seed: Optional[int] = None):
         """
         Initialize the ClosedPlayground.
 
         Args:
             size (Tuple[int, int]): Size of the playground (width, height).
+            use_shaders (bool): Whether to use shaders for the ray sensors.
             border_thickness (int): Thickness of the border walls.
+            analytic_rays (bool): Whether to intersect the rays of the sensors
+                analytically with the walls, without any framebuffer.
+            windowless (bool): Whether to run without any arcade window.
+            async_ray_readback (bool): Whether to read the hitpoints of the compute
+                shader back asynchronously, with a latency of one timestep.
+            seed (Optional[int]): Seed of the random number generator of the playground.
         """
         background = (220, 220, 220)
 
@@ -42,9 +51,12 @@ class ClosedPlayground(Playground):
             use_shaders = False
 
         super().__init__(size=size,
-                         seed=None,
+                         seed=seed,
                          background=background,
-                         use_shaders=use_shaders)
+                         use_shaders=use_shaders,
+                         analytic_rays=analytic_rays,
+                         windowless=windowless,
+                         async_ray_readback=async_ray_readback)
 
         assert isinstance(self.size[0], int)
         assert isinstance(self.size[1], int)
@@ -0,0 +1,237 @@
+"""
+Ground-truth occupancy grid of a playground, rasterized from the pymunk
+shapes of its elements (walls, boxes, movable elements).
+"""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+import cv2
+import numpy as np
+import pymunk
+
+if TYPE_CHECKING:
+    from place_bot.simulation.elements.embodied import EmbodiedEntity
+
+# Values of the cells of an occupancy grid
+FREE = 0
+OCCUPIED = 1
+
+# Fixed-point precision of the coordinates given to OpenCV, in bits
+_SHIFT = 8
+
+# Rasterized entity: first row, first column and occupied cells of its window
+Patch = Tuple[int, int, np.ndarray]
+
+
+def _pose(entity: EmbodiedEntity) -> Tuple[float, float, float]:
+    body = entity.pm_body
+    return body.position.x, body.position.y, body.angle
+
+
+class OccupancyGrid:
+    """
+    Occupancy grid of the elements of a playground, as a uint8 array of
+    FREE and OCCUPIED cells. Row 0 is the top of the playground (largest y)
+    and column 0 its left side, as in the images of the views.
+
+    Each element is rasterized once into a patch covering its bounding box.
+    The grid counts the elements covering each cell, so that adding,
+    removing or moving an element only updates the cells of its patches.
+    Elements with a non-static body are rasterized again by update() when
+    they moved.
+
+    Example Usage
+        grid = OccupancyGrid(size=(800, 600), center=(0, 0), resolution=5)
+        for wall in walls:
+            grid.add(wall)
+        occupied_ratio = grid.array.mean()
+    """
+
+    def __init__(self, size: Tuple[int, int], center: Tuple[float, float], resolution: float):
+        """
+        Initialize the OccupancyGrid.
+
+        Args:
+            size (Tuple[int, int]): Size of the playground (width, height).
+            center (Tuple[float, float]): Center of the playground.
+            resolution (float): Size of a cell, in pixels of the playground.
+        """
+        if resolution <= 0:
+            raise ValueError("resolution must be positive")
+
+        self._resolution = float(resolution)
+        self._shape = (int(np.ceil(size[1] / resolution)), int(np.ceil(size[0] / resolution)))
+        self._left = center[0] - size[0] / 2
+        self._top = center[1] + size[1] / 2
+
+        self._counts = np.zeros(self._shape, dtype=np.uint16)
+        self._grid = np.zeros(self._shape, dtype=np.uint8)
+
+        self._patches: Dict[EmbodiedEntity, Optional[Patch]] = {}
+        self._poses: Dict[EmbodiedEntity, Tuple[float, float, float]] = {}
+        self._dirty: Dict[EmbodiedEntity, None] = {}
+
+    @property
+    def resolution(self) -> float:
+        """
+        Returns the size of a cell, in pixels of the playground.
+        """
+        return self._resolution
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        """
+        Returns the number of rows and columns of the grid.
+        """
+        return self._shape
+
+    @property
+    def array(self) -> np.ndarray:
+        """
+        Returns a read-only view on the grid (rows, columns), without copy.
+        It follows the updates of the grid.
+        """
+        view = self._grid.view()
+        view.flags.writeable = False
+        return view
+
+    def world_to_cells(self, points: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the cells of positions of the playground, possibly outside the grid.
+
+        Args:
+            points (np.ndarray): Positions (n, 2).
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Rows (n,) and columns (n,).
+        """
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        cols = np.floor((points[:, 0] - self._left) / self._resolution).astype(int)
+        rows = np.floor((self._top - points[:, 1]) / self._resolution).astype(int)
+        return rows, cols
+
+    def add(self, entity: EmbodiedEntity) -> None:
+        """
+        Rasterize an entity into the grid.
+
+        Args:
+            entity (EmbodiedEntity): The entity.
+        """
+        if entity in self._patches:
+            return
+
+        patch = self._rasterize(entity)
+        self._patches[entity] = patch
+        self._poses[entity] = _pose(entity)
+        self._apply(patch, 1)
+
+    def remove(self, entity: EmbodiedEntity) -> None:
+        """
+        Remove an entity from the grid.
+
+        Args:
+            entity (EmbodiedEntity): The entity.
+        """
+        if entity not in self._patches:
+            return
+
+        self._apply(self._patches.pop(entity), -1)
+        self._poses.pop(entity)
+        self._dirty.pop(entity, None)
+
+    def mark_dirty(self, entity: EmbodiedEntity) -> None:
+        """
+        Mark an entity as moved, so that it is rasterized again by update().
+
+        Args:
+            entity (EmbodiedEntity): The entity.
+        """
+        if entity in self._patches:
+            self._dirty[entity] = None
+
+    def update(self) -> None:
+        """
+        Rasterize again the entities marked as dirty and the entities with a
+        non-static body that moved since they were rasterized.
+        """
+        for entity, pose in self._poses.items():
+            if entity.pm_body.body_type != pymunk.Body.STATIC and _pose(entity) != pose:
+                self._dirty[entity] = None
+
+        for entity in self._dirty:
+            self._apply(self._patches[entity], -1)
+            self._patches[entity] = self._rasterize(entity)
+            self._poses[entity] = _pose(entity)
+            self._apply(self._patches[entity], 1)
+
+        self._dirty.clear()
+
+    def _apply(self, patch: Optional[Patch], sign: int) -> None:
+        """
+        Add (sign 1) or remove (sign -1) a patch, and update the cells it covers.
+        """
+        if patch is None:
+            return
+
+        row, col, cells = patch
+        window = (slice(row, row + cells.shape[0]), slice(col, col + cells.shape[1]))
+        if sign > 0:
+            self._counts[window] += cells
+        else:
+            self._counts[window] -= cells
+        self._grid[window] = self._counts[window] > 0
+
+    def _rasterize(self, entity: EmbodiedEntity) -> Optional[Patch]:
+        """
+        Rasterize the solid shapes of an entity, in a window of the grid
+        covering their bounding box. Cells touched by a shape are occupied.
+
+        Returns:
+            Optional[Patch]: The patch, None if the entity is outside the grid.
+        """
+        shapes = [pm_shape for pm_shape in entity.pm_shapes if not pm_shape.sensor]
+        if not shapes:
+            return None
+
+        # Bounding box, in cells, clipped to the grid
+        bbs = [pm_shape.cache_bb() for pm_shape in shapes]
+        rows, cols = self.world_to_cells([(min(bb.left for bb in bbs), max(bb.top for bb in bbs)),
+                                          (max(bb.right for bb in bbs), min(bb.bottom for bb in bbs))])
+        row_0, col_0 = max(rows[0], 0), max(cols[0], 0)
+        row_1, col_1 = min(rows[1], self._shape[0] - 1), min(cols[1], self._shape[1] - 1)
+        if row_1 < row_0 or col_1 < col_0:
+            return None
+
+        cells = np.zeros((row_1 - row_0 + 1, col_1 - col_0 + 1), dtype=np.uint8)
+        scale = 1 << _SHIFT
+
+        def to_window(points):
+            # Continuous coordinates of the window, the center of a cell being an integer
+            points = np.asarray(points, dtype=float).reshape(-1, 2)
+            x = (points[:, 0] - self._left) / self._resolution - col_0 - 0.5
+            y = (self._top - points[:, 1]) / self._resolution - row_0 - 0.5
+            return np.round(np.stack([x, y], axis=1) * scale).astype(np.int32)
+
+        for pm_shape in shapes:
+            body = pm_shape.body
+
+            if isinstance(pm_shape, pymunk.Circle):
+                center = to_window([tuple(body.local_to_world(pm_shape.offset))])[0]
+                radius = int(round(pm_shape.radius / self._resolution * scale))
+                cv2.circle(cells, tuple(int(v) for v in center), radius, 1, -1, cv2.LINE_8, _SHIFT)
+                continue
+
+            if isinstance(pm_shape, pymunk.Segment):
+                start = np.array(tuple(body.local_to_world(pm_shape.a)))
+                end = np.array(tuple(body.local_to_world(pm_shape.b)))
+                direction = end - start
+                normal = np.array([-direction[1], direction[0]]) / max(np.hypot(*direction), 1e-9)
+                offset = normal * pm_shape.radius
+                vertices = [start + offset, end + offset, end - offset, start - offset]
+            else:
+                vertices = [tuple(body.local_to_world(vertex)) for vertex in pm_shape.get_vertices()]
+
+            cv2.fillConvexPoly(cells, to_window(vertices), 1, cv2.LINE_8, _SHIFT)
+
+        return row_0, col_0, cells
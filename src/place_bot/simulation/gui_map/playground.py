@@ -9,7 +9,8 @@ how elements interact with each other.
 
 from __future__ import annotations
 
-from typing import Dict, List, Optional, Tuple, Union
+import copy
+from typing import Dict, Iterator, List, Optional, Tuple, Union
 
 import arcade
 import matplotlib.pyplot as plt
@@ -18,6 +19,8 @@ import pymunk
 import pymunk.matplotlib_util
 
 from place_bot.simulation.robot.agent import Agent
+from place_bot.simulation.robot.odometer import Odometer
+from place_bot.simulation.robot.odometer_compute import OdometerCompute
 from place_bot.simulation.robot.controller import CommandsDict
 from place_bot.simulation.robot.robot_part import RobotPart
 from place_bot.simulation.robot.interactive_anchored import InteractiveAnchored
@@ -28,11 +31,16 @@ from place_bot.simulation.elements.embodied import EmbodiedEntity
 from place_bot.simulation.elements.entity import Entity
 from place_bot.simulation.elements.physical_element import PhysicalElement
 from place_bot.simulation.elements.scene_element import SceneElement
+from place_bot.simulation.gui_map.occupancy_grid import OccupancyGrid
+from place_bot.simulation.gui_map.snapshot import EntitySnapshot, PlaygroundSnapshot
+from place_bot.simulation.gui_map.static_index import StaticIndex, disk_overlaps, shapes_geometry
+from place_bot.simulation.reporting.episode_recorder import EpisodeRecorder
 from place_bot.simulation.utils.definitions import (
     PYMUNK_STEPS,
     SPACE_DAMPING,
     CollisionTypes,
 )
+from place_bot.simulation.utils.profiler import PROFILER
 
 # pylint: disable=unused-argument
 # pylint: disable=line-too-long
@@ -42,6 +50,29 @@ AllCommandsDict = Dict[Agent, CommandsDict]
 ObservationsDict = Dict[Agent, Dict[Sensor, SensorValue]]
 
 
+class _PlaygroundWindow(arcade.Window):
+    """
+    Hidden arcade window of a playground, providing its OpenGL context.
+
+    arcade.Window.close() always resets the active window of arcade to None.
+    A playground discarded without cleanup() has its window closed whenever it
+    is garbage collected, e.g. during the constructor of the window of another
+    playground: the window active before the close is thus made active again.
+    """
+
+    def close(self) -> None:
+        try:
+            active = arcade.get_window()
+        except RuntimeError:
+            active = None
+
+        super().close()
+
+        if active is not None and active is not self:
+            arcade.set_window(active)
+            active.switch_to()
+
+
 class Playground:
     """Playground is a Base Class that manages the physical simulation.
 
@@ -53,6 +84,11 @@ class Playground:
           instantiating the playground.
 
           Always reset the playground before starting a run.
+
+          The arcade window (and its OpenGL context) is only created when
+          it is first needed, by a view or by a ray sensor using the ID
+          framebuffer. A windowless playground uses analytic ray sensors,
+          so it never needs a display.
     """
 
     # pylint: disable=too-many-instance-attributes
@@ -68,6 +104,9 @@ class Playground:
                 Union[Tuple[int, int, int], List[int], Tuple[int, int, int, int]]
             ] = None,
             use_shaders: bool = True,
+            analytic_rays: bool = False,
+            windowless: bool = False,
+            async_ray_readback: bool = False,
     ):
         """
         Initialize the Playground.
@@ -77,10 +116,24 @@ class Playground:
             seed (Optional[int]): Seed for the random number generator.
             background (Optional[Tuple[int, int, int] or List[int] or Tuple[int, int, int, int]]): Background color.
             use_shaders (bool): Whether to use shaders for rendering.
+            analytic_rays (bool): Whether ray sensors intersect their rays
+                analytically with the pymunk shapes instead of sampling the
+                ID framebuffer. No OpenGL context is used by the sensors then.
+            windowless (bool): Whether the playground must run without
+                any arcade window. Implies analytic_rays. The window is still
+                created if a view is requested later.
+            async_ray_readback (bool): Whether the hitpoints computed by the
+                compute shader are read back asynchronously. The sensors then
+                have a latency of one timestep: the values available after
+                step t are the ones computed at step t-1. Only used by the
+                shader backend.
         """
 
         # Random number generator for replication, rewind, etc.
-        self._rng = np.random.default_rng(seed)
+        # The seed sequence also spawns the independent generators of the
+        # entities, e.g. for the noise of the sensors.
+        self._seed_sequence = np.random.SeedSequence(seed)
+        self._rng = np.random.default_rng(self._seed_sequence)
 
         # By default, size is infinite and center is at (0,0)
         self._center = (0, 0)
@@ -113,15 +166,29 @@ class Playground:
         self._name_to_agents: Dict[str, Agent] = {}
         self._uids_to_entities: Dict[int, Entity] = {}
 
+        # Entities removed definitively, by uid, which restore() can add back
+        self._removed_entities: Dict[int, Entity] = {}
+
+        # Spatial index of the static shapes, built on first use
+        self._static_index: Optional[StaticIndex] = None
+
+        # Occupancy grids of the elements, by resolution, built on first use
+        self._occupancy_grids: Dict[float, OccupancyGrid] = {}
+
         self._handle_interactions()
         self._views = []
 
-        # Arcade window necessary to create contexts, views, sensors and gui
-        self._window = arcade.Window(width=1, height=1, visible=False, antialiasing=True)  # type: ignore
-        self._window.ctx.blend_func = self._window.ctx.ONE, self._window.ctx.ZERO
+        # Arcade window necessary to create contexts, views, sensors and gui.
+        # It is created on first use.
+        self._window: Optional[arcade.Window] = None
+        self._windowless = windowless
 
         self._ray_compute = None
+        self._odometer_compute: Optional[OdometerCompute] = None
+        self._episode_recorder: Optional[EpisodeRecorder] = None
         self._use_shaders = use_shaders
+        self._analytic_rays = analytic_rays or windowless
+        self._async_ray_readback = async_ray_readback
 
     def debug_draw(self, plt_width: int = 10, center: Optional[Tuple[float, float]] = None, size: Optional[Tuple[int, int]] = None) -> None:
         """
@@ -161,18 +228,75 @@ class Playground:
     def window(self) -> arcade.Window:
         """
         Returns the Arcade window associated with the playground.
+        The window is created on first access.
 
         Returns:
             arcade.Window: The window.
         """
+        if not self._window:
+            self._window = _PlaygroundWindow(width=1, height=1, visible=False, antialiasing=True)  # type: ignore
+            self._window.ctx.blend_func = self._window.ctx.ONE, self._window.ctx.ZERO
+
         return self._window
 
+    @property
+    def odometer_compute(self) -> OdometerCompute:
+        """
+        Returns the OdometerCompute updating all the odometers of the playground.
+        It is created on first access.
+
+        Returns:
+            OdometerCompute: The odometer engine.
+        """
+        if not self._odometer_compute:
+            self._odometer_compute = OdometerCompute(rng=self.spawn_rng())
+
+        return self._odometer_compute
+
+    def start_episode_recording(self, directory: str, chunk_size: int = 1000) -> EpisodeRecorder:
+        """
+        Start recording the episode: commands, poses and sensor values of the
+        robots at each timestep, and the elements added or removed.
+
+        Args:
+            directory (str): Directory of the episode, see EpisodeRecorder.
+            chunk_size (int): Number of timesteps of a chunk file.
+
+        Returns:
+            EpisodeRecorder: The recorder.
+        """
+        self.stop_episode_recording()
+        self._episode_recorder = EpisodeRecorder(self, directory, chunk_size=chunk_size)
+        return self._episode_recorder
+
+    def stop_episode_recording(self) -> None:
+        """
+        Stop recording the episode and write the last chunk.
+        """
+        if self._episode_recorder:
+            self._episode_recorder.close()
+            self._episode_recorder = None
+
+    @property
+    def has_window(self) -> bool:
+        """
+        Returns whether the arcade window has been created.
+        """
+        return self._window is not None
+
+    @property
+    def windowless(self) -> bool:
+        """
+        Returns whether the playground runs without arcade window.
+        """
+        return self._windowless
+
     @property
     def ctx(self):
         """
         Returns the OpenGL context of the window.
         """
-        return self._window.ctx
+        return self.window.ctx
 
     @property
     def ray_compute(self) -> RayCompute:
@@ -185,7 +309,13 @@ class Playground:
         if not self._ray_compute:
             assert self._size
             self._ray_compute = RayCompute(
-                self, self._size, self._center, zoom=1, use_shader=self._use_shaders
+                self,
+                self._size,
+                self._center,
+                zoom=1,
+                use_shader=self._use_shaders,
+                use_analytic=self._analytic_rays,
+                async_readback=self._async_ray_readback,
             )
 
         return self._ray_compute
@@ -204,6 +334,17 @@ class Playground:
         """
         return self._rng
 
+    def spawn_rng(self) -> np.random.Generator:
+        """
+        Returns a new random number generator, independent of the generator of
+        the playground and of the ones spawned before. The generators spawned
+        in the same order from playgrounds with the same seed are identical.
+
+        Returns:
+            np.random.Generator: The new generator.
+        """
+        return np.random.default_rng(self._seed_sequence.spawn(1)[0])
+
     @property
     def size(self) -> Optional[Tuple[int, int]]:
         """
@@ -371,20 +512,57 @@ class Playground:
         """
         mess, rew = None, None
 
-        self._pre_step()
+        self.begin_step(all_commands, pymunk_steps)
 
-        self._apply_commands(all_commands)
+        self.end_step()
 
-        for _ in range(pymunk_steps):
-            self.space.step(1.0 / pymunk_steps)
+        return mess, rew
 
-        self._compute_observations()
+    def begin_step(
+            self,
+            all_commands: Optional[AllCommandsDict] = None,
+            pymunk_steps: int = PYMUNK_STEPS,
+    ) -> None:
+        """
+        First half of step(): apply the commands and move the physics forward.
 
-        self._post_step()
+        step() is begin_step() followed by end_step(). Calling them separately
+        allows several playgrounds to share the computation of their ray
+        sensors, see RayCompute.update_sensors_batch.
 
-        self._timestep += 1
+        Args:
+            all_commands (Optional[AllCommandsDict]): All commands for agents.
+            pymunk_steps (int): Number of steps for the pymunk physics engine to run.
+        """
+        with PROFILER.phase("pre_step"):
+            self._pre_step()
 
-        return mess, rew
+        with PROFILER.phase("commands"):
+            self._apply_commands(all_commands)
+
+        with PROFILER.phase("physics"):
+            for _ in range(pymunk_steps):
+                self.space.step(1.0 / pymunk_steps)
+
+    def end_step(self, update_ray_sensors: bool = True) -> None:
+        """
+        Second half of step(): compute the observations and end the timestep.
+
+        Args:
+            update_ray_sensors (bool): Whether to compute the hitpoints of the
+                ray sensors. Set it to False if they were already computed.
+        """
+        self._compute_observations(update_ray_sensors)
+
+        with PROFILER.phase("post_step"):
+            self._post_step()
+
+        if self._episode_recorder:
+            with PROFILER.phase("recording"):
+                self._episode_recorder.record_step()
+
+        self._timestep += 1
+        PROFILER.count("steps")
 
     def _pre_step(self) -> None:
         """
@@ -424,18 +602,23 @@ class Playground:
 
 
 
-    def _compute_observations(self) -> None:
+    def _compute_observations(self, update_ray_sensors: bool = True) -> None:
         """
         Compute observations for all agents.
 
-        Returns:
-            dict: Observations for each agent.
+        Args:
+            update_ray_sensors (bool): Whether to compute the hitpoints of the ray sensors.
         """
-        if self._ray_compute:
+        if self._ray_compute and update_ray_sensors:
             self._ray_compute.update_sensors()
 
-        for agent in self.agents:
-            agent.compute_observations()
+        if self._odometer_compute:
+            with PROFILER.phase("odometer"):
+                self._odometer_compute.update_sensors()
+
+        with PROFILER.phase("sensors"):
+            for agent in self.agents:
+                agent.compute_observations()
 
     def reset(self):
         """
@@ -477,10 +660,156 @@ class Playground:
         for view in self._views:
             view.update_and_draw_in_framebuffer(force=True)
 
+        if self._ray_compute:
+            self._ray_compute.reset()
+
         self._timestep = 0
 
         self._compute_observations()
 
+    def snapshot(self) -> PlaygroundSnapshot:
+        """
+        Capture the state of the playground: timestep, random state, position
+        and velocity of the bodies, internal state of the entities (see
+        Entity.get_state) and state of the odometers.
+
+        The internal state of the controllers of the robots (e.g. a map being
+        built) is not captured: it belongs to the caller.
+
+        Returns:
+            PlaygroundSnapshot: The snapshot, which can be pickled.
+        """
+        entities = {}
+        for uid, entity in self._uids_to_entities.items():
+            body = None
+            if isinstance(entity, EmbodiedEntity) and not isinstance(entity, InteractiveAnchored):
+                pm_body = entity.pm_body
+                body = (pm_body.position.x, pm_body.position.y, pm_body.angle,
+                        pm_body.velocity.x, pm_body.velocity.y, pm_body.angular_velocity)
+            entities[int(uid)] = EntitySnapshot(entity.removed, body, entity.get_state())
+
+        return PlaygroundSnapshot(
+            timestep=self._timestep,
+            rng_state=copy.deepcopy(self._rng.bit_generator.state),
+            seed_sequence=copy.deepcopy(self._seed_sequence),
+            entities=entities,
+            odometer_state=self._odometer_compute.get_state() if self._odometer_compute else None,
+        )
+
+    def restore(self, snapshot: PlaygroundSnapshot) -> None:
+        """
+        Restore a snapshot taken with snapshot(): entities added since are
+        removed, entities removed since (e.g. disappeared walls) are added
+        back, and the bodies, entities, random state and timestep take their
+        value of the snapshot.
+
+        Restoring twice the same snapshot and giving the same commands gives
+        the same episodes, so that several controllers can be evaluated from
+        the same state. Outputs of the ray sensors still waiting to be read
+        are dropped.
+
+        Args:
+            snapshot (PlaygroundSnapshot): Snapshot taken in this playground.
+
+        Raises:
+            ValueError: If an entity of the snapshot is not in the playground.
+        """
+        states = snapshot.entities
+
+        # Top-level entities added since the snapshot
+        for entity in self._agents + self._elements:
+            if entity.uid not in states:
+                if entity.removed:
+                    self.add(entity, from_removed=True)
+                self.remove(entity, definitive=True)
+
+        # Top-level entities removed definitively since the snapshot
+        for uid, entity in list(self._removed_entities.items()):
+            if uid in states and isinstance(entity, (Agent, SceneElement)):
+                for sub_entity in self._entity_tree(entity):
+                    self._add_to_mappings(sub_entity, keep_identifier=True)
+                self.add(entity, from_removed=True)
+
+        for entity in self._agents + self._elements:
+            removed = states[entity.uid].removed
+            if removed and not entity.removed:
+                self.remove(entity)
+            elif not removed and entity.removed:
+                self.add(entity, from_removed=True)
+
+        for uid, entity_snapshot in states.items():
+            entity = self._uids_to_entities.get(uid)
+            if entity is None:
+                raise ValueError(f"Entity {uid} of the snapshot is not in the playground")
+
+            if entity_snapshot.body is not None:
+                self._restore_body(entity, entity_snapshot.body)
+            entity.set_state(entity_snapshot.state)
+
+        if snapshot.odometer_state is not None:
+            self.odometer_compute.set_state(snapshot.odometer_state)
+
+        self._rng.bit_generator.state = copy.deepcopy(snapshot.rng_state)
+        self._seed_sequence = copy.deepcopy(snapshot.seed_sequence)
+        self._timestep = snapshot.timestep
+
+        # Pymunk keeps the contacts of the last steps to solve the next ones:
+        # adding the shapes again drops them, so that the episodes do not
+        # depend on what was simulated before the restore
+        dynamic_shapes = [pm_shape for pm_shape in self._space.shapes
+                          if pm_shape.body.body_type != pymunk.Body.STATIC]
+        self._space.remove(*dynamic_shapes)
+        self._space.add(*dynamic_shapes)
+
+        if self._ray_compute:
+            self._ray_compute.reset()
+
+        for view in self._views:
+            view.update_and_draw_in_framebuffer(force=True)
+
+    def _restore_body(self, entity: EmbodiedEntity, body_state: Tuple[float, ...]) -> None:
+        """
+        Set the position and velocity of the body of an entity.
+
+        Args:
+            entity (EmbodiedEntity): The entity.
+            body_state (Tuple[float, ...]): Position, angle, velocity and angular velocity.
+        """
+        x, y, angle, vx, vy, angular_velocity = body_state
+        pm_body = entity.pm_body
+        moved = (pm_body.position.x, pm_body.position.y, pm_body.angle) != (x, y, angle)
+
+        pm_body.position, pm_body.angle = (x, y), angle
+        pm_body.velocity, pm_body.angular_velocity = (vx, vy), angular_velocity
+
+        if moved:
+            if pm_body.space:
+                pm_body.space.reindex_shapes_for_body(pm_body)
+            self.mark_sprite_dirty(entity)
+            self.mark_geometry_dirty(entity)
+
+    @staticmethod
+    def _entity_tree(entity: Entity) -> Iterator[Entity]:
+        """
+        Iterate over an entity and the entities added with it: base and
+        devices of an agent, interactives of an element.
+
+        Args:
+            entity (Entity): The entity.
+        """
+        yield entity
+
+        if isinstance(entity, Agent):
+            yield from Playground._entity_tree(entity.base)
+
+        if isinstance(entity, RobotPart):
+            for device in entity.devices:
+                yield from Playground._entity_tree(device)
+
+        elif isinstance(entity, PhysicalElement):
+            for interactive in entity.interactives:
+                yield from Playground._entity_tree(interactive)
+
 
     def add(
             self,
@@ -501,6 +830,9 @@ class Playground:
 
         entity.playground = self
 
+        if self._episode_recorder and isinstance(entity, (Agent, SceneElement)):
+            self._episode_recorder.record_event("added", entity)
+
         if from_removed:
             initial_coordinates = entity.initial_coordinates
             allow_overlapping = entity.allow_overlapping
@@ -512,6 +844,10 @@ class Playground:
 
         self._add_to_views(entity)
 
+        if isinstance(entity, PhysicalElement):
+            for grid in self._occupancy_grids.values():
+                grid.add(entity)
+
         if isinstance(entity, Agent):
             self.add(
                 entity.base,
@@ -530,6 +866,8 @@ class Playground:
 
                 if isinstance(device, RaySensor):
                     self.ray_compute.add(device)
+                elif isinstance(device, Odometer):
+                    self.odometer_compute.add(device)
 
         elif isinstance(entity, PhysicalElement):
             for interactive in entity.interactives:
@@ -582,14 +920,19 @@ class Playground:
             allow_overlapping=allow_overlapping,
         )
 
-    def _add_to_mappings(self, entity):
+    def _add_to_mappings(self, entity, keep_identifier=False):
         """
         Add the entity to internal mappings.
 
         Args:
             entity: The entity to map.
+            keep_identifier (bool): Whether to keep the uid and name of an
+                entity removed definitively, instead of generating new ones.
         """
-        entity.uid, entity.name = self._get_identifier(entity)
+        if keep_identifier:
+            self._removed_entities.pop(entity.uid, None)
+        else:
+            entity.uid, entity.name = self._get_identifier(entity)
 
         self._uids_to_entities[entity.uid] = entity
 
@@ -619,6 +962,9 @@ class Playground:
         for view in self._views:
             view.add_as_sprite(entity)
 
+        if self._ray_compute:
+            self._ray_compute.add_entity(entity)
+
     def remove(self, entity, definitive=False):
         """
         Remove an entity from the playground.
@@ -627,12 +973,21 @@ class Playground:
             entity: The entity to remove.
             definitive (bool): Whether to remove definitively.
         """
+        if self._episode_recorder and isinstance(entity, (Agent, SceneElement)):
+            self._episode_recorder.record_event("removed", entity)
+
         self._remove_from_space(entity)
         self._remove_from_views(entity)
 
+        for grid in self._occupancy_grids.values():
+            grid.remove(entity)
+
         if definitive:
             self._remove_from_mappings(entity)
 
+            if isinstance(entity, Odometer) and self._odometer_compute:
+                self._odometer_compute.remove(entity)
+
         if isinstance(entity, Agent):
             self.remove(entity.base, definitive)
 
@@ -659,6 +1014,9 @@ class Playground:
 
         self._space.remove(*entity.pm_elements)
 
+        if entity.pm_body.body_type == pymunk.Body.STATIC:
+            self.invalidate_static_index()
+
     def _remove_from_mappings(self, entity):
         """
         Remove the entity from internal mappings.
@@ -669,6 +1027,7 @@ class Playground:
         assert entity.uid
 
         self._uids_to_entities.pop(entity.uid)
+        self._removed_entities[entity.uid] = entity
 
         if isinstance(entity, Agent):
             self._agents.remove(entity)
@@ -699,6 +1058,19 @@ class Playground:
         for view in self._views:
             view.remove_as_sprite(entity)
 
+        if self._ray_compute:
+            self._ray_compute.remove_entity(entity)
+
+    def mark_sprite_dirty(self, entity):
+        """
+        Notify all registered views that the sprite of an entity has to be updated.
+
+        Args:
+            entity: The entity that was moved.
+        """
+        for view in self._views:
+            view.mark_sprite_dirty(entity)
+
     def add_view(self, view):
         """
         Add a view to the playground and register all entities with it.
@@ -770,43 +1142,187 @@ class Playground:
         Returns:
             bool: True if overlaps, False otherwise.
         """
-        dummy_body = pymunk.Body(body_type=pymunk.Body.STATIC)
-        dummy_shapes = []
+        # The copies of the shapes are queried without being added to the
+        # space, so that the static index of pymunk is not rebuilt.
+        dummy_body = pymunk.Body(body_type=pymunk.Body.KINEMATIC)
+        dummy_body.position, dummy_body.angle = coordinates
+
+        # A robot part does not overlap the other parts of its agent
+        ignored_shapes = set(entity.pm_shapes)
+        if isinstance(entity, RobotPart) and entity.agent:
+            base = entity.agent.base
+            for part in [base, *base.devices]:
+                ignored_shapes.update(part.pm_shapes)
+
         for pm_shape in entity.pm_shapes:
             dummy_shape = pm_shape.copy()
             dummy_shape.body = dummy_body
             dummy_shape.sensor = True
-            dummy_shapes.append(dummy_shape)
 
-        self.space.add(dummy_body, *dummy_shapes)
+            for query in self.space.shape_query(dummy_shape):
+                if query.shape and not query.shape.sensor and query.shape not in ignored_shapes:
+                    return True
 
-        dummy_body.position, dummy_body.angle = coordinates
-        self.space.reindex_static()
-
-        overlaps = []
-        for dummy_shape in dummy_shapes:
-            overlaps += self.space.shape_query(dummy_shape)
-        self.space.remove(dummy_body, *dummy_shapes)
-
-        # remove sensor shapes
-        overlaps = [
-            elem
-            for elem in overlaps
-            if elem.shape
-               and not elem.shape.sensor
-               and elem.shape not in entity.pm_shapes
+        return False
+
+    @property
+    def static_index(self) -> StaticIndex:
+        """
+        Returns the spatial index of the static shapes (walls, fixed boxes).
+        It is built again after a static entity was added, removed or moved.
+        """
+        if self._static_index is None:
+            self._static_index = StaticIndex([
+                pm_shape for pm_shape in self._space.shapes
+                if pm_shape.body.body_type == pymunk.Body.STATIC and not pm_shape.sensor
+            ])
+        return self._static_index
+
+    def invalidate_static_index(self) -> None:
+        """
+        Mark the static index as outdated, e.g. after a static entity was moved.
+        """
+        self._static_index = None
+
+    def mark_geometry_dirty(self, entity: EmbodiedEntity) -> None:
+        """
+        Notify that an entity was moved outside of the physics, e.g. by
+        EmbodiedEntity.move_to(), so that the static index and the occupancy
+        grids take its new position into account.
+
+        Args:
+            entity (EmbodiedEntity): The entity that was moved.
+        """
+        if entity.pm_body.body_type == pymunk.Body.STATIC:
+            self.invalidate_static_index()
+
+        for grid in self._occupancy_grids.values():
+            grid.mark_dirty(entity)
+
+    def occupancy_grid(self, resolution: float) -> np.ndarray:
+        """
+        Returns the ground-truth occupancy grid of the elements of the
+        playground (walls, boxes, movable elements), robots excluded.
+
+        The grid of a resolution is rasterized on the first call, then only
+        the cells of the elements added, removed or moved since the previous
+        call are updated (e.g. when a DisappearingWall disappears).
+
+        Args:
+            resolution (float): Size of a cell, in pixels of the playground.
+
+        Returns:
+            np.ndarray: Read-only uint8 view (rows, columns) on the cached grid,
+                with values FREE (0) and OCCUPIED (1). Row 0 is the top of the
+                playground. The view follows the later updates of the grid.
+
+        Raises:
+            ValueError: If the playground has no size.
+        """
+        if not self._size:
+            raise ValueError("The occupancy grid needs a playground with a size")
+
+        grid = self._occupancy_grids.get(float(resolution))
+        if grid is None:
+            grid = OccupancyGrid(self._size, self._center, resolution)
+            for element in self._elements:
+                if isinstance(element, PhysicalElement) and not element.removed:
+                    grid.add(element)
+            self._occupancy_grids[float(resolution)] = grid
+
+        grid.update()
+        return grid.array
+
+    def overlaps_many(
+            self,
+            positions: np.ndarray,
+            radius: Union[float, np.ndarray],
+    ) -> np.ndarray:
+        """
+        Test whether disks placed at several positions would overlap the
+        static shapes or the solid shapes of the other entities (robots,
+        movable elements).
+
+        Args:
+            positions (np.ndarray): Centers of the disks (n, 2).
+            radius (Union[float, np.ndarray]): Radius of the disks, or radii (n,).
+
+        Returns:
+            np.ndarray: Whether each position overlaps (n,).
+        """
+        positions = np.asarray(positions, dtype=float).reshape(-1, 2)
+        radius = np.broadcast_to(np.asarray(radius, dtype=float), (len(positions),))
+
+        overlaps = self.static_index.overlaps_many(positions, radius)
+
+        dynamic_shapes = [
+            pm_shape for pm_shape in self._space.shapes
+            if pm_shape.body.body_type != pymunk.Body.STATIC and not pm_shape.sensor
         ]
+        if dynamic_shapes and len(positions):
+            vertices, n_vertices, radii = shapes_geometry(dynamic_shapes)
+            queries = np.repeat(np.arange(len(positions)), len(dynamic_shapes))
+            shapes = np.tile(np.arange(len(dynamic_shapes)), len(positions))
+            hits = disk_overlaps(positions[queries], radius[queries],
+                                 vertices[shapes], n_vertices[shapes], radii[shapes])
+            overlaps |= hits.reshape(len(positions), -1).any(axis=1)
 
-        if isinstance(entity, RobotPart):
-            agent_shapes = []
-            for part in entity.agent.parts:
-                agent_shapes += part.pm_shapes
+        return overlaps
+
+    def sample_free_positions(
+            self,
+            n: int,
+            radius: float,
+            rng: Optional[np.random.Generator] = None,
+            max_attempts: int = 100,
+    ) -> np.ndarray:
+        """
+        Sample random positions within the playground where a disk does not
+        overlap anything, nor the disks at the other sampled positions.
+        Candidates are drawn and tested by batches.
 
-            overlaps = [elem for elem in overlaps if elem.shape not in agent_shapes]
+        Args:
+            n (int): Number of positions.
+            radius (float): Radius of the disks.
+            rng (Optional[np.random.Generator]): Random generator, by default
+                the generator of the playground.
+            max_attempts (int): Maximum number of batches of candidates.
 
-        self.space.reindex_static()
+        Returns:
+            np.ndarray: Positions (n, 2).
 
-        return bool(overlaps)
+        Raises:
+            ValueError: If the playground has no size.
+            RuntimeError: If not enough free positions were found.
+        """
+        if not self._size:
+            raise ValueError("Free positions can only be sampled in a playground with a size")
+
+        if rng is None:
+            rng = self._rng
+
+        half_size = np.maximum(np.array(self._size, dtype=float) / 2 - radius, 0)
+        lower = np.array(self._center, dtype=float) - half_size
+        upper = np.array(self._center, dtype=float) + half_size
+
+        found: List[np.ndarray] = []
+        for _ in range(max_attempts):
+            if len(found) == n:
+                break
+
+            candidates = rng.uniform(lower, upper, size=(max(4 * (n - len(found)), 16), 2))
+            candidates = candidates[~self.overlaps_many(candidates, radius)]
+
+            for candidate in candidates:
+                if len(found) == n:
+                    break
+                if all(np.hypot(*(candidate - position)) >= 2 * radius for position in found):
+                    found.append(candidate)
+
+        if len(found) < n:
+            raise RuntimeError(f"Only {len(found)} free positions found out of {n}")
+
+        return np.array(found).reshape(n, 2)
 
     def get_closest_agent(self, entity: EmbodiedEntity) -> Agent:
         """
@@ -847,6 +1363,11 @@ class Playground:
         Clean up resources and prepare for garbage collection.
         Should be called when the playground is no longer needed.
         """
+        self.stop_episode_recording()
+
+        if self._odometer_compute:
+            self._odometer_compute.stop_recording()
+
         # Clear all entities
         for agent in self._agents.copy():
             self.remove(agent, definitive=True)
@@ -862,18 +1383,26 @@ class Playground:
         self._shapes_to_entities.clear()
         self._name_to_agents.clear()
         self._uids_to_entities.clear()
+        self._removed_entities.clear()
+        self._static_index = None
+        self._occupancy_grids.clear()
 
         # Clear views
         self._views.clear()
 
         # Close window if it exists
-        if hasattr(self, '_window') and self._window:
+        if self._window:
             self._window.close()
+            self._window = None
 
         # Clear ray compute
         if self._ray_compute:
             self._ray_compute = None
 
+        if self._odometer_compute:
+            self._odometer_compute.stop_recording()
+            self._odometer_compute = None
+
     def add_interaction(
             self,
             collision_type_1: CollisionTypes,
@@ -13,6 +13,7 @@ from place_bot.simulation.reporting.screen_recorder import ScreenRecorder
 from place_bot.simulation.utils.constants import FRAME_RATE, ENABLE_WINDOW_AUTO_RESIZE
 from place_bot.simulation.utils.fps_display import FpsDisplay
 from place_bot.simulation.utils.mouse_measure import MouseMeasure
+from place_bot.simulation.utils.profiler import PROFILER
 from place_bot.simulation.utils.visu_noises import VisuNoises
 from place_bot.simulation.utils.window_utils import auto_resize_window
 
@@ -82,6 +83,9 @@ class Simulator(TopDownView):
             enable_visu_noises: bool = False,
             filename_video_capture: str = None,
             headless: bool = False,
+            steps_per_frame: int = 1,
+            turbo_steps_per_frame: int = 50,
+            turbo_fps: float = 10,
     ) -> None:
         """
         Initialize the Simulator graphical user interface.
@@ -100,7 +104,15 @@ class Simulator(TopDownView):
             enable_visu_noises (bool): Enable visualization of sensor noises.
             filename_video_capture (str): Output filename for video capture.
             headless (bool): Run in headless mode without display window.
+            steps_per_frame (int): Number of timesteps simulated per update of the window.
+            turbo_steps_per_frame (int): Maximum number of timesteps simulated
+                per update of the window in turbo mode (key T).
+            turbo_fps (float): Frame rate kept in turbo mode: the timesteps of
+                an update stop once 1 / turbo_fps seconds are spent.
         """
+        if steps_per_frame < 1 or turbo_steps_per_frame < 1:
+            raise ValueError("The number of timesteps per frame must be at least 1")
+
         # Handle automatic window resizing
         size, zoom = self._handle_window_auto_resize(the_world, size, zoom, headless)
 
@@ -148,6 +160,11 @@ class Simulator(TopDownView):
         self._use_mouse_measure = use_mouse_measure
         self._enable_visu_noises = enable_visu_noises
 
+        self._steps_per_frame = steps_per_frame
+        self._turbo_steps_per_frame = turbo_steps_per_frame
+        self._turbo_fps = turbo_fps
+        self._turbo = False
+
         self._elapsed_timestep = 0
         self._start_timestamp = time.time()
         self._elapsed_walltime = 0.001
@@ -184,6 +201,48 @@ class Simulator(TopDownView):
         """
         self._playground.window.run()
 
+    def run_steps(self, n_steps: int, render_every: int = 0) -> int:
+        """
+        Run the simulation for a number of timesteps in a tight loop, without
+        the event loop of the window and its pacing at FRAME_RATE: the robot
+        is controlled, the playground stepped and the robot displayed as in
+        on_update(), as fast as possible.
+
+        The elapsed wall time given to the robot is the simulated time, i.e.
+        the number of timesteps times FRAME_RATE, so that a mission of ten
+        minutes runs in a few seconds with the same behaviour of the robot.
+
+        Example Usage
+            simulator = Simulator(the_world=my_world, headless=True)
+            simulator.run_steps(36000)
+
+        Args:
+            n_steps (int): Number of timesteps to run.
+            render_every (int): Draw the window and capture the frame of the
+                video recording every render_every timesteps. Never if 0.
+
+        Returns:
+            int: Number of timesteps run, fewer than n_steps if the simulation
+                was terminated (key Q).
+        """
+        window = self._playground.window
+
+        for index in range(n_steps):
+            self._step(simulated_time=True)
+
+            if render_every and (index + 1) % render_every == 0:
+                if not self._headless:
+                    window.dispatch_events()
+                    self.on_draw()
+                    window.flip()
+                self.recorder.capture_frame(self)
+
+            if self._terminate:
+                self.recorder.end_recording()
+                return index + 1
+
+        return n_steps
+
 
     def on_draw(self) -> None:
         """
@@ -201,21 +260,60 @@ class Simulator(TopDownView):
 
     def on_update(self, delta_time: float) -> None:
         """
-        Update the simulation state and draw the playground and entities.
+        Update the simulation state: simulate steps_per_frame timesteps, or
+        in turbo mode as many timesteps as possible, up to
+        turbo_steps_per_frame, while keeping turbo_fps frames per second.
 
         Args:
             delta_time (float): Time since last update.
         """
+        if self._turbo:
+            n_steps = self._turbo_steps_per_frame
+            deadline = time.perf_counter() + 1 / self._turbo_fps
+        else:
+            n_steps = self._steps_per_frame
+            deadline = None
+
+        controlled = False
+        for _ in range(n_steps):
+            controlled = self._step(simulated_time=False) or controlled
+
+            if self._terminate or (deadline is not None and time.perf_counter() > deadline):
+                break
+
+        # Capture one frame per update, as only the last timestep is drawn
+        if controlled:
+            self.recorder.capture_frame(self)
+
+        self.fps_display.update(display=False)
+
+        if self._terminate:
+            self.recorder.end_recording()
+            arcade.close_window()
+
+    def _step(self, simulated_time: bool) -> bool:
+        """
+        Compute the commands of the robot, step the playground and update the
+        display of the robot.
+
+        Args:
+            simulated_time (bool): Whether the elapsed wall time is the
+                simulated time instead of the time since the start.
+
+        Returns:
+            bool: False for the first timestep, where the robot is not controlled.
+        """
         self._elapsed_timestep += 1
 
         if self._elapsed_timestep < 2:
             self._playground.step(all_commands=self._robot_commands)
-            return
+            return False
 
         # COMPUTE COMMANDS
         self._robot.elapsed_walltime = self._elapsed_walltime
         self._robot.elapsed_timestep = self._elapsed_timestep
-        command = self._robot.control()
+        with PROFILER.phase("control"):
+            command = self._robot.control()
         if self._use_keyboard:
             command = self._keyboardController.control()
 
@@ -230,18 +328,13 @@ class Simulator(TopDownView):
 
         self._visu_noises.update(enable=self._enable_visu_noises)
 
-        last_timestamp = time.time()
-        self._elapsed_walltime = last_timestamp - self._start_timestamp
+        if simulated_time:
+            self._elapsed_walltime = self._elapsed_timestep * FRAME_RATE
+        else:
+            last_timestamp = time.time()
+            self._elapsed_walltime = last_timestamp - self._start_timestamp
 
-        # Capture the frame
-        # Au bon endroit ? Il faudrait le mettre avant le draw() ?
-        self.recorder.capture_frame(self)
-
-        self.fps_display.update(display=False)
-
-        if self._terminate:
-            self.recorder.end_recording()
-            arcade.close_window()
+        return True
 
     def get_playground_image(self) -> cv2.typing.MatLike:
         """
@@ -281,6 +374,7 @@ class Simulator(TopDownView):
 
         self._transparent_sprites.draw(pixelated=True)
         self._interactive_sprites.draw(pixelated=True)
+        self._static_sprites.draw(pixelated=True)
         self._visible_sprites.draw(pixelated=True)
 
         for robot in self._playground.agents:
@@ -302,6 +396,9 @@ class Simulator(TopDownView):
         if key == arcade.key.Q:
             self._terminate = True
 
+        if key == arcade.key.T:
+            self._turbo = not self._turbo
+
         if key == arcade.key.R:
             self._playground.reset()
             self._visu_noises.reset()
@@ -357,6 +454,26 @@ class Simulator(TopDownView):
         self._mouse_measure.on_mouse_release(x, y, button,
                                              enable=self._use_mouse_measure)
 
+    @property
+    def turbo(self) -> bool:
+        """
+        Returns whether the turbo mode is on, toggled with the key T.
+
+        Returns:
+            bool: True if several timesteps are simulated per frame, as fast as possible.
+        """
+        return self._turbo
+
+    @turbo.setter
+    def turbo(self, turbo: bool) -> None:
+        """
+        Set the turbo mode.
+
+        Args:
+            turbo (bool): Whether the turbo mode is on.
+        """
+        self._turbo = turbo
+
     @property
     def elapsed_timestep(self) -> int:
         """
@@ -0,0 +1,74 @@
+"""
+Module that defines PlaygroundSnapshot, the state of a playground at a given
+timestep, as captured by Playground.snapshot().
+"""
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+# Position (x, y), angle, velocity (vx, vy) and angular velocity of a body
+BodyState = Tuple[float, float, float, float, float, float]
+
+
+class EntitySnapshot:
+    """
+    State of one entity of a snapshot.
+
+    Args:
+        removed (bool): Whether the entity was removed (not definitively) from the playground.
+        body (Optional[BodyState]): State of the body of the entity, None if
+            the entity has no body of its own (agents, devices).
+        state (Dict[str, Any]): State of the entity, returned by Entity.get_state().
+    """
+
+    __slots__ = ("removed", "body", "state")
+
+    def __init__(self, removed: bool, body: Optional[BodyState], state: Dict[str, Any]):
+        self.removed = removed
+        self.body = body
+        self.state = state
+
+
+class PlaygroundSnapshot:
+    """
+    State of a playground at a given timestep: timestep, random state, bodies
+    and internal state of the entities (sensor values and noise, controller
+    commands, disappeared walls, ...) and state of the odometers.
+
+    Entities are identified by their uid, so that a snapshot only holds
+    numbers and arrays: it is small and can be pickled, e.g. to be sent to
+    the workers evaluating several controllers from the same state. It can
+    only be restored in the playground it was taken from.
+
+    Example Usage
+        snapshot = playground.snapshot()
+        for controller in controllers:
+            playground.restore(snapshot)
+            run_episode(playground, controller)
+    """
+
+    def __init__(
+            self,
+            timestep: int,
+            rng_state: Dict[str, Any],
+            seed_sequence: np.random.SeedSequence,
+            entities: Dict[int, EntitySnapshot],
+            odometer_state: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        Initialize the PlaygroundSnapshot.
+
+        Args:
+            timestep (int): Timestep of the playground.
+            rng_state (Dict[str, Any]): State of the bit generator of the playground.
+            seed_sequence (np.random.SeedSequence): Seed sequence of the
+                playground, which spawns the generators of the sensors.
+            entities (Dict[int, EntitySnapshot]): States of the entities, by uid.
+            odometer_state (Optional[Dict[str, Any]]): State of the
+                OdometerCompute of the playground, None if it has none.
+        """
+        self.timestep = timestep
+        self.rng_state = rng_state
+        self.seed_sequence = seed_sequence
+        self.entities = entities
+        self.odometer_state = odometer_state
@@ -0,0 +1,227 @@
+"""
+Spatial index of the static geometry of a playground (walls, fixed boxes),
+used to test many candidate positions at once, e.g. to place robots.
+"""
+from typing import Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pymunk
+
+# Geometry of shapes: vertices (S, K, 2) padded with the last vertex,
+# number of vertices (S,) and radii (S,)
+ShapesGeometry = Tuple[np.ndarray, np.ndarray, np.ndarray]
+
+
+def shapes_geometry(shapes: Sequence[pymunk.Shape]) -> ShapesGeometry:
+    """
+    Convert pymunk shapes to convex polygons with a radius, in the frame of
+    the playground: a polygon is its vertices, a segment its two ends and a
+    circle its center.
+
+    Args:
+        shapes (Sequence[pymunk.Shape]): The shapes.
+
+    Returns:
+        ShapesGeometry: Vertices (S, K, 2), padded with the last vertex of each
+        shape, number of vertices (S,) and radii (S,).
+    """
+    polygons, radii = [], []
+
+    for shape in shapes:
+        body = shape.body
+        if isinstance(shape, pymunk.Poly):
+            points = [body.local_to_world(vertex) for vertex in shape.get_vertices()]
+        elif isinstance(shape, pymunk.Segment):
+            points = [body.local_to_world(shape.a), body.local_to_world(shape.b)]
+        elif isinstance(shape, pymunk.Circle):
+            points = [body.local_to_world(shape.offset)]
+        else:
+            raise ValueError(f"Unsupported shape {shape}")
+
+        polygons.append(np.array([tuple(point) for point in points], dtype=float))
+        radii.append(shape.radius)
+
+    n_vertices = np.array([len(polygon) for polygon in polygons], dtype=int)
+    max_vertices = int(n_vertices.max()) if len(polygons) else 1
+
+    vertices = np.zeros((len(polygons), max_vertices, 2))
+    for index, polygon in enumerate(polygons):
+        vertices[index, :len(polygon)] = polygon
+        vertices[index, len(polygon):] = polygon[-1]
+
+    return vertices, n_vertices, np.array(radii, dtype=float)
+
+
+def disk_overlaps(
+        centers: np.ndarray,
+        radius: np.ndarray,
+        vertices: np.ndarray,
+        n_vertices: np.ndarray,
+        radii: np.ndarray,
+) -> np.ndarray:
+    """
+    Test pairs of disks and shapes for overlap.
+
+    Args:
+        centers (np.ndarray): Centers of the disks (M, 2).
+        radius (np.ndarray): Radii of the disks (M,).
+        vertices (np.ndarray): Vertices of the shapes (M, K, 2), as returned
+            by shapes_geometry.
+        n_vertices (np.ndarray): Number of vertices of the shapes (M,).
+        radii (np.ndarray): Radii of the shapes (M,).
+
+    Returns:
+        np.ndarray: Whether each disk overlaps its shape (M,).
+    """
+    starts = vertices
+    edges = np.roll(vertices, -1, axis=1) - starts
+    relative = centers[:, np.newaxis, :] - starts
+
+    # Distance to the closest edge, degenerate edges being points
+    length_sqrd = np.einsum("mkd,mkd->mk", edges, edges)
+    t = np.einsum("mkd,mkd->mk", relative, edges) / np.where(length_sqrd > 0, length_sqrd, 1)
+    t = np.clip(t, 0, 1)
+    closest = relative - t[..., np.newaxis] * edges
+    distance = np.sqrt(np.einsum("mkd,mkd->mk", closest, closest).min(axis=1))
+
+    # A disk centered inside a polygon is on the same side of all its edges
+    cross = edges[..., 0] * relative[..., 1] - edges[..., 1] * relative[..., 0]
+    inside = (n_vertices >= 3) & (np.all(cross >= 0, axis=1) | np.all(cross <= 0, axis=1))
+
+    return inside | (distance < radius + radii)
+
+
+def _expand(counts: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Returns, for each of the sum(counts) items, the index of its group and its
+    index in the group.
+    """
+    owners = np.repeat(np.arange(len(counts)), counts)
+    starts = np.cumsum(counts) - counts
+    return owners, np.arange(len(owners)) - starts[owners]
+
+
+class StaticIndex:
+    """
+    Uniform grid over the bounding boxes of static shapes. Each cell stores
+    the shapes whose bounding box intersects it, so that a query only tests
+    the shapes of the cells it covers.
+
+    The index is immutable: the Playground builds a new one when a static
+    entity is added, removed or moved.
+
+    Example Usage
+        index = StaticIndex(wall_shapes)
+        free = ~index.overlaps_many(candidates, radius=15)
+    """
+
+    def __init__(self, shapes: Sequence[pymunk.Shape], cell_size: Optional[float] = None):
+        """
+        Initialize the StaticIndex.
+
+        Args:
+            shapes (Sequence[pymunk.Shape]): Static shapes, with their body at
+                its final position.
+            cell_size (Optional[float]): Size of the cells. By default, chosen
+                to have about one cell per shape.
+        """
+        self._vertices, self._n_vertices, self._radii = shapes_geometry(shapes)
+
+        if not len(shapes):
+            self._lower = np.zeros(2)
+            self._cell_size = cell_size or 1.0
+            self._grid_shape = (1, 1)
+            self._cell_start = np.zeros(2, dtype=int)
+            self._cell_items = np.zeros(0, dtype=int)
+            return
+
+        lower = self._vertices.min(axis=1) - self._radii[:, np.newaxis]
+        upper = self._vertices.max(axis=1) + self._radii[:, np.newaxis]
+
+        self._lower = lower.min(axis=0)
+        extent = np.maximum(upper.max(axis=0) - self._lower, 1.0)
+        if cell_size is None:
+            cell_size = max(float(np.sqrt(extent[0] * extent[1] / len(shapes))), 1.0)
+        self._cell_size = cell_size
+        self._grid_shape = tuple(int(n) for n in np.ceil(extent / cell_size).astype(int))
+
+        first_cells = self._cells(lower)
+        last_cells = self._cells(upper)
+        spans = last_cells - first_cells + 1
+
+        shapes_index, local = _expand(spans[:, 0] * spans[:, 1])
+        cell_x = first_cells[shapes_index, 0] + local // spans[shapes_index, 1]
+        cell_y = first_cells[shapes_index, 1] + local % spans[shapes_index, 1]
+        cells = cell_x * self._grid_shape[1] + cell_y
+
+        order = np.argsort(cells, kind="stable")
+        n_cells = self._grid_shape[0] * self._grid_shape[1]
+        self._cell_start = np.zeros(n_cells + 1, dtype=int)
+        self._cell_start[1:] = np.cumsum(np.bincount(cells, minlength=n_cells))
+        self._cell_items = shapes_index[order]
+
+    @property
+    def n_shapes(self) -> int:
+        """
+        Returns the number of indexed shapes.
+        """
+        return len(self._radii)
+
+    @property
+    def cell_size(self) -> float:
+        """
+        Returns the size of the cells of the grid.
+        """
+        return self._cell_size
+
+    def _cells(self, points: np.ndarray) -> np.ndarray:
+        """
+        Returns the (x, y) cells of points, clipped to the grid.
+        """
+        cells = np.floor((points - self._lower) / self._cell_size).astype(int)
+        return np.clip(cells, 0, np.array(self._grid_shape) - 1)
+
+    def overlaps_many(
+            self,
+            positions: np.ndarray,
+            radius: Union[float, np.ndarray],
+    ) -> np.ndarray:
+        """
+        Test whether disks overlap the static shapes.
+
+        Args:
+            positions (np.ndarray): Centers of the disks (n, 2).
+            radius (Union[float, np.ndarray]): Radius of the disks, or radii (n,).
+
+        Returns:
+            np.ndarray: Whether each disk overlaps a static shape (n,).
+        """
+        positions = np.asarray(positions, dtype=float).reshape(-1, 2)
+        radius = np.broadcast_to(np.asarray(radius, dtype=float), (len(positions),))
+        overlaps = np.zeros(len(positions), dtype=bool)
+
+        if not self.n_shapes or not len(positions):
+            return overlaps
+
+        first_cells = self._cells(positions - radius[:, np.newaxis])
+        last_cells = self._cells(positions + radius[:, np.newaxis])
+        spans = last_cells - first_cells + 1
+
+        queries, local = _expand(spans[:, 0] * spans[:, 1])
+        cells = ((first_cells[queries, 0] + local // spans[queries, 1]) * self._grid_shape[1]
+                 + first_cells[queries, 1] + local % spans[queries, 1])
+
+        cell_index, item = _expand(self._cell_start[cells + 1] - self._cell_start[cells])
+        pair_queries = queries[cell_index]
+        pair_shapes = self._cell_items[self._cell_start[cells[cell_index]] + item]
+
+        hits = disk_overlaps(
+            positions[pair_queries],
+            radius[pair_queries],
+            self._vertices[pair_shapes],
+            self._n_vertices[pair_shapes],
+            self._radii[pair_shapes],
+        )
+        overlaps[pair_queries[hits]] = True
+
+        return overlaps
@@ -1,13 +1,15 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Dict, Optional, Tuple
+from typing import TYPE_CHECKING, Dict, Optional, Set, Tuple
 
 import arcade
 import matplotlib.pyplot as plt
 import numpy as np
+import pymunk
 
 from place_bot.simulation.robot.interactive_anchored import InteractiveAnchored
 from place_bot.simulation.elements.physical_entity import PhysicalEntity
+from place_bot.simulation.utils.profiler import PROFILER
 
 if TYPE_CHECKING:
     from place_bot.simulation.elements.embodied import EmbodiedEntity
@@ -17,6 +19,16 @@ if TYPE_CHECKING:
 class TopDownView:
     """
     TopDownView provides a 2D top-down rendering of the playground and its entities.
+
+    Visible entities with a static pymunk body (walls, fixed boxes, borders) are
+    kept in a separate sprite list. When nothing has to be drawn below them,
+    they are baked once into a static layer framebuffer, which is then copied
+    into the view framebuffer at each draw, before drawing the dynamic sprites.
+    The static layer is rebaked when a static entity is added, removed or moved.
+
+    Only the sprites of entities with a non-static body are checked at each
+    update. The other sprites are updated when their entity is moved with
+    move_to(), which marks them as dirty in every view of the playground.
     """
 
     def __init__(
@@ -58,19 +70,33 @@ class TopDownView:
 
         self._transparent_sprites = arcade.SpriteList()
         self._visible_sprites = arcade.SpriteList()
+        self._static_sprites = arcade.SpriteList()
         self._interactive_sprites = arcade.SpriteList()
 
+        self._static_fbo = None
+        self._static_layer_dirty = True
+
         self._sprites: Dict[EmbodiedEntity, arcade.Sprite] = {}
+        self._dynamic_sprites: Dict[EmbodiedEntity, arcade.Sprite] = {}
+        self._dirty_entities: Set[EmbodiedEntity] = set()
 
         self._background = playground.background
 
         self._playground = playground
         self._ctx = playground.ctx
         # Create the framebuffer object which will be used to draw the map
-        self._fbo = self._ctx.framebuffer(
+        self._fbo = self._create_framebuffer()
+
+        playground.add_view(self)
+
+    def _create_framebuffer(self):
+        """
+        Create a framebuffer of the size of the view.
+        """
+        return self._ctx.framebuffer(
             color_attachments=[
                 self._ctx.texture(
-                    size,
+                    self._size,
                     components=4,
                     wrap_x=self._ctx.CLAMP_TO_BORDER,  # type: ignore
                     wrap_y=self._ctx.CLAMP_TO_BORDER,  # type: ignore
@@ -80,8 +106,6 @@ class TopDownView:
             ]
         )
 
-        playground.add_view(self)
-
     @property
     def texture(self):
         """
@@ -125,7 +149,7 @@ class TopDownView:
             new_size: New (width, height) dimensions
         """
         self._width, self._height = self._size = new_size
-
+        self._static_layer_dirty = True
 
     @property
     def sprites(self) -> Dict[EmbodiedEntity, arcade.Sprite]:
@@ -135,6 +159,26 @@ class TopDownView:
         """
         return self._sprites
 
+    @staticmethod
+    def _has_static_body(entity) -> bool:
+        """
+        Whether the entity has a static pymunk body, i.e. only moves with move_to().
+
+        Args:
+            entity: The entity.
+        """
+        return (isinstance(entity, PhysicalEntity)
+                and entity.pm_body.body_type == pymunk.Body.STATIC)
+
+    def _is_static(self, entity) -> bool:
+        """
+        Whether the entity is drawn in the static layer.
+
+        Args:
+            entity: The entity.
+        """
+        return self._has_static_body(entity) and not entity.transparent
+
     def add_as_sprite(self, entity) -> None:
         """
         Add the entity to the view, create a sprite for it and add it to the
@@ -162,6 +206,10 @@ class TopDownView:
                 if self._draw_transparent:
                     self._transparent_sprites.append(sprite)
 
+            elif self._is_static(entity):
+                self._static_sprites.append(sprite)
+                self._static_layer_dirty = True
+
             else:
                 self._visible_sprites.append(sprite)
 
@@ -171,6 +219,9 @@ class TopDownView:
         entity.update_sprite(self, sprite)
         self._sprites[entity] = sprite
 
+        if not self._has_static_body(entity):
+            self._dynamic_sprites[entity] = sprite
+
     def remove_as_sprite(self, entity) -> None:
         """
         Remove the entity from the view and remove the sprite from the sprite lists.
@@ -182,6 +233,8 @@ class TopDownView:
             return
 
         sprite = self._sprites.pop(entity)
+        self._dynamic_sprites.pop(entity, None)
+        self._dirty_entities.discard(entity)
 
         if isinstance(entity, InteractiveAnchored):
             self._interactive_sprites.remove(sprite)
@@ -190,21 +243,90 @@ class TopDownView:
             if entity.transparent:
                 self._transparent_sprites.remove(sprite)
 
+            elif self._is_static(entity):
+                self._static_sprites.remove(sprite)
+                self._static_layer_dirty = True
+
             else:
                 self._visible_sprites.remove(sprite)
 
+    def mark_sprite_dirty(self, entity) -> None:
+        """
+        Register an entity whose sprite has to be updated at the next update,
+        e.g. because it was moved with move_to().
+
+        Args:
+            entity: The entity.
+        """
+        if entity in self._sprites:
+            self._dirty_entities.add(entity)
+
     def update_sprites_position(self, force: bool = False) -> None:
         """
         Update the sprites position and angle of the entities in the view from
         the pymunk position and angle.
 
+        Only the dirty entities and the entities with a non-static body are
+        checked, so the cost does not depend on the number of walls.
+
         Args:
             force (bool): If True, force update all sprites.
         """
-        # check that
-        for entity, sprite in self._sprites.items():
-            if entity.needs_sprite_update or force:
+        if force:
+            for entity, sprite in self._sprites.items():
                 entity.update_sprite(self, sprite)
+            PROFILER.count("sprite_updates", len(self._sprites))
+            self._dirty_entities.clear()
+            self._static_layer_dirty = True
+            return
+
+        n_updates = len(self._dirty_entities)
+
+        for entity, sprite in self._dynamic_sprites.items():
+            if entity.needs_sprite_update:
+                entity.update_sprite(self, sprite)
+                n_updates += 1
+
+        for entity in self._dirty_entities:
+            entity.update_sprite(self, self._sprites[entity])
+            if self._is_static(entity):
+                self._static_layer_dirty = True
+
+        self._dirty_entities.clear()
+        PROFILER.count("sprite_updates", n_updates)
+
+    @property
+    def uses_static_layer(self) -> bool:
+        """
+        Whether the static sprites are drawn from the cached static layer.
+        This is not possible when transparent or interactive sprites have to be
+        drawn below them.
+        """
+        if self._draw_transparent and self._transparent_sprites:
+            return False
+
+        if self._draw_interactive and self._interactive_sprites:
+            return False
+
+        return True
+
+    def _bake_static_layer(self) -> None:
+        """
+        Draw the background and the static sprites in the static layer framebuffer.
+        """
+        if self._static_fbo is None or self._static_fbo.size != self._fbo.size:
+            self._static_fbo = self._create_framebuffer()
+
+        with self._static_fbo.activate() as fbo:
+            if self._use_color_uid:
+                fbo.clear()
+            else:
+                fbo.clear(self._background)
+
+            self._ctx.projection_2d = 0, self._width, 0, self._height
+            self._static_sprites.draw(pixelated=True)
+
+        self._static_layer_dirty = False
 
     def update_and_draw_in_framebuffer(self, force: bool = False) -> None:
         """
@@ -221,6 +343,21 @@ class TopDownView:
         # Update the sprites' positions and angles
         self.update_sprites_position(force)
 
+        if self.uses_static_layer:
+            if self._static_layer_dirty:
+                self._bake_static_layer()
+
+            with self._fbo.activate():
+                # The static layer already contains the background. The copy is
+                # done once the framebuffer is active, as it is clipped by the
+                # scissor box of the active framebuffer.
+                self._ctx.copy_framebuffer(self._static_fbo, self._fbo)
+
+                self._ctx.projection_2d = 0, self._width, 0, self._height
+                self._visible_sprites.draw(pixelated=True)
+
+            return
+
         # Activate the framebuffer for drawing
         with self._fbo.activate() as fbo:
             # Clear the framebuffer
@@ -241,6 +378,7 @@ class TopDownView:
                 self._interactive_sprites.draw(pixelated=True)
 
             # Draw the visible sprites
+            self._static_sprites.draw(pixelated=True)
             self._visible_sprites.draw(pixelated=True)
 
     def get_np_img(self) -> np.ndarray:
@@ -271,3 +409,6 @@ class TopDownView:
         self._transparent_sprites.clear()
         self._interactive_sprites.clear()
         self._visible_sprites.clear()
+        self._static_sprites.clear()
+        self._static_layer_dirty = True
+        self._dirty_entities.clear()
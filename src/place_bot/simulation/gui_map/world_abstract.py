@@ -1,5 +1,5 @@
 from abc import ABC
-from typing import Type, Union, Optional
+from typing import Any, Dict, Optional, Type, Union
 
 from place_bot.simulation.robot.robot_abstract import RobotAbstract
 from place_bot.simulation.gui_map.playground import Playground
@@ -9,18 +9,37 @@ class WorldAbstract(ABC):
     """
     The WorldAbstract class is an abstract class that serves as a blueprint for
     constructing different types of maps used in the directory "maps".
+
+    The playground_options are the keyword arguments given to the constructor
+    of the playground of the world, e.g. windowless or seed, so that the same
+    world can run with a window or without one, with a given seed.
+
+    Example Usage
+        class MyWorld(WorldAbstract):
+            def __init__(self, robot, playground_options=None):
+                super().__init__(robot=robot, playground_options=playground_options)
+                self._playground = ClosedPlayground(size=(800, 600), **self.playground_options)
+
+        world = MyWorld(robot, playground_options={"windowless": True, "seed": 3})
     """
 
-    def __init__(self, robot: Union[RobotAbstract, None]):
+    def __init__(
+            self,
+            robot: Union[RobotAbstract, None],
+            playground_options: Optional[Dict[str, Any]] = None,
+    ):
         """
         Initialize the WorldAbstract.
 
         Args:
             robot (RobotAbstract): The robot instance to use.
+            playground_options (Optional[Dict[str, Any]]): Keyword arguments of
+                the constructor of the playground, e.g. {"windowless": True}.
         """
         self._playground: Optional[Playground] = None
         self._robot = robot
         self._size_area = None
+        self._playground_options: Dict[str, Any] = dict(playground_options or {})
 
 
     @property
@@ -33,6 +52,16 @@ class WorldAbstract(ABC):
         """
         return self._playground
 
+    @property
+    def playground_options(self) -> Dict[str, Any]:
+        """
+        Returns the keyword arguments of the constructor of the playground.
+
+        Returns:
+            Dict[str, Any]: The options, e.g. {"windowless": True, "seed": 3}.
+        """
+        return self._playground_options
+
     @property
     def robot(self) -> RobotAbstract:
         """
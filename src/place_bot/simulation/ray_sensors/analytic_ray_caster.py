@@ -0,0 +1,589 @@
+"""
+Analytic ray casting against the pymunk geometry of a playground.
+
+Rays are intersected directly with the polygon edges and circles of the
+visible entities, so no framebuffer and no OpenGL context are needed.
+"""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pymunk
+
+from place_bot.simulation.elements.physical_entity import PhysicalEntity
+from place_bot.simulation.robot.interactive_anchored import InteractiveAnchored
+
+if TYPE_CHECKING:
+    from place_bot.simulation.elements.embodied import EmbodiedEntity
+    from place_bot.simulation.gui_map.playground import Playground
+    from place_bot.simulation.ray_sensors.ray_sensor import RaySensor
+
+# Upper bound on the number of (ray, segment) or (ray, circle) pairs evaluated
+# at once by the kernels, to keep the temporary arrays small when many sensors
+# are batched.
+MAX_KERNEL_PAIRS = 2_000_000
+
+# Local geometry of an entity: segment starts, segment ends, circle centers, circle radii
+LocalGeometry = Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+
+
+def _local_geometry(entity: EmbodiedEntity) -> LocalGeometry:
+    """
+    Extract the geometry of the shapes of an entity, in the frame of its body.
+
+    Polygons are split into their edges. Segments are approximated by their
+    center line.
+
+    Args:
+        entity (EmbodiedEntity): The entity.
+
+    Returns:
+        LocalGeometry: Segment starts (S, 2), segment ends (S, 2),
+        circle centers (C, 2) and circle radii (C,).
+    """
+    starts, ends, centers, radii = [], [], [], []
+
+    for pm_shape in entity.pm_shapes:
+        if pm_shape.sensor:
+            continue
+
+        if isinstance(pm_shape, pymunk.Poly):
+            vertices = np.array([tuple(v) for v in pm_shape.get_vertices()], dtype=float)
+            starts.append(vertices)
+            ends.append(np.roll(vertices, -1, axis=0))
+
+        elif isinstance(pm_shape, pymunk.Segment):
+            starts.append(np.array([tuple(pm_shape.a)], dtype=float))
+            ends.append(np.array([tuple(pm_shape.b)], dtype=float))
+
+        elif isinstance(pm_shape, pymunk.Circle):
+            centers.append(np.array([tuple(pm_shape.offset)], dtype=float))
+            radii.append(pm_shape.radius)
+
+    seg_start = np.concatenate(starts) if starts else np.zeros((0, 2))
+    seg_end = np.concatenate(ends) if ends else np.zeros((0, 2))
+    circle_center = np.concatenate(centers) if centers else np.zeros((0, 2))
+    circle_radius = np.array(radii, dtype=float)
+
+    return seg_start, seg_end, circle_center, circle_radius
+
+
+def _to_world(points: np.ndarray, body: pymunk.Body) -> np.ndarray:
+    """
+    Transform points from the frame of a body to the frame of the playground.
+
+    Args:
+        points (np.ndarray): Points (N, 2) in the body frame.
+        body (pymunk.Body): The body.
+
+    Returns:
+        np.ndarray: Points (N, 2) in the playground frame.
+    """
+    cos_a, sin_a = np.cos(body.angle), np.sin(body.angle)
+    rotation = np.array([[cos_a, sin_a], [-sin_a, cos_a]])
+    return points @ rotation + np.array(tuple(body.position))
+
+
+def intersect_rays_segments(
+        origins: np.ndarray,
+        directions: np.ndarray,
+        seg_start: np.ndarray,
+        seg_end: np.ndarray,
+        seg_mask: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized ray versus segment intersection.
+
+    Args:
+        origins (np.ndarray): Origins of the rays of each sensor, shape (B, 2).
+        directions (np.ndarray): Unit directions of the rays, shape (B, R, 2).
+        seg_start (np.ndarray): Start points of the segments, shape (S, 2) or (B, S, 2).
+        seg_end (np.ndarray): End points of the segments, same shape as seg_start.
+        seg_mask (np.ndarray): Boolean mask (B, S) of the segments visible by each sensor.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Distance to the first hit (B, R), np.inf
+        if no hit, and index of the segment hit (B, R).
+    """
+    n_batch, n_rays = directions.shape[:2]
+    n_seg = seg_mask.shape[1]
+
+    dist = np.full((n_batch, n_rays), np.inf)
+    index = np.zeros((n_batch, n_rays), dtype=int)
+    if n_seg == 0:
+        return dist, index
+
+    if seg_start.ndim == 2:
+        seg_start = seg_start[np.newaxis]
+        seg_end = seg_end[np.newaxis]
+
+    chunk = max(1, MAX_KERNEL_PAIRS // (n_rays * n_seg))
+
+    for begin in range(0, n_batch, chunk):
+        sl = slice(begin, begin + chunk)
+        start = seg_start if seg_start.shape[0] == 1 else seg_start[sl]
+        end = seg_end if seg_end.shape[0] == 1 else seg_end[sl]
+
+        # Edge vectors and vectors from the ray origin to the segment start
+        e = end - start
+        w = start - origins[sl, np.newaxis, :]
+
+        dx = directions[sl, :, 0, np.newaxis]
+        dy = directions[sl, :, 1, np.newaxis]
+        ex = e[:, np.newaxis, :, 0]
+        ey = e[:, np.newaxis, :, 1]
+        wx = w[:, np.newaxis, :, 0]
+        wy = w[:, np.newaxis, :, 1]
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            denom = dx * ey - dy * ex
+            t = (wx * ey - wy * ex) / denom
+            u = (wx * dy - wy * dx) / denom
+
+        valid = (denom != 0) & (t >= 0) & (u >= 0) & (u <= 1)
+        valid &= seg_mask[sl, np.newaxis, :]
+        t = np.where(valid, t, np.inf)
+
+        index[sl] = np.argmin(t, axis=2)
+        dist[sl] = np.take_along_axis(t, index[sl, :, np.newaxis], axis=2)[:, :, 0]
+
+    return dist, index
+
+
+def intersect_rays_circles(
+        origins: np.ndarray,
+        directions: np.ndarray,
+        centers: np.ndarray,
+        radii: np.ndarray,
+        circle_mask: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized ray versus circle intersection.
+
+    A ray starting inside a circle hits it at distance 0.
+
+    Args:
+        origins (np.ndarray): Origins of the rays of each sensor, shape (B, 2).
+        directions (np.ndarray): Unit directions of the rays, shape (B, R, 2).
+        centers (np.ndarray): Centers of the circles, shape (C, 2) or (B, C, 2).
+        radii (np.ndarray): Radii of the circles, shape (C,) or (B, C).
+        circle_mask (np.ndarray): Boolean mask (B, C) of the circles visible by each sensor.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Distance to the first hit (B, R), np.inf
+        if no hit, and index of the circle hit (B, R).
+    """
+    n_batch, n_rays = directions.shape[:2]
+    n_circles = circle_mask.shape[1]
+
+    dist = np.full((n_batch, n_rays), np.inf)
+    index = np.zeros((n_batch, n_rays), dtype=int)
+    if n_circles == 0:
+        return dist, index
+
+    if centers.ndim == 2:
+        centers = centers[np.newaxis]
+        radii = radii[np.newaxis]
+
+    chunk = max(1, MAX_KERNEL_PAIRS // (n_rays * n_circles))
+
+    for begin in range(0, n_batch, chunk):
+        sl = slice(begin, begin + chunk)
+        center = centers if centers.shape[0] == 1 else centers[sl]
+        radius = radii if radii.shape[0] == 1 else radii[sl]
+
+        # Vector from the circle center to the ray origin
+        oc = origins[sl, np.newaxis, :] - center
+        b = np.einsum("brk,bck->brc", directions[sl], oc)
+        c = (np.sum(oc * oc, axis=2) - radius * radius)[:, np.newaxis, :]
+
+        disc = b * b - c
+        with np.errstate(invalid="ignore"):
+            t = -b - np.sqrt(disc)
+        t = np.where(c <= 0, 0.0, t)
+
+        valid = (disc >= 0) & (t >= 0) & circle_mask[sl, np.newaxis, :]
+        t = np.where(valid, t, np.inf)
+
+        index[sl] = np.argmin(t, axis=2)
+        dist[sl] = np.take_along_axis(t, index[sl, :, np.newaxis], axis=2)[:, :, 0]
+
+    return dist, index
+
+
+def _hit_uids(uids: np.ndarray, index: np.ndarray) -> np.ndarray:
+    """
+    Look up the uids of the shapes hit by the rays.
+
+    Args:
+        uids (np.ndarray): Uids of the shapes, shape (N,) or (B, N).
+        index (np.ndarray): Index of the shape hit by each ray, shape (B, R).
+
+    Returns:
+        np.ndarray: Uids (B, R).
+    """
+    if uids.shape[-1] == 0:
+        return np.zeros(index.shape)
+
+    if uids.ndim == 1:
+        return uids[index]
+
+    return np.take_along_axis(uids, index, axis=1)
+
+
+class AnalyticRayCaster:
+    """
+    Computes the hitpoints of ray sensors by intersecting the rays with the
+    pymunk shapes of the visible entities of a playground.
+
+    The geometry of static entities (walls, boxes) is transformed once into
+    a static index, which is rebuilt only when a static entity is added or
+    removed. The geometry of the other entities (robots, movable elements)
+    is transformed at each update.
+
+    The hitpoints have the same layout as those computed from the ID
+    framebuffer, so the sensors are not affected by the choice of backend.
+    """
+
+    def __init__(
+            self,
+            playground: Playground,
+            size: Tuple[int, int],
+            center: Tuple[float, float],
+            zoom: float = 1,
+    ):
+        """
+        Initialize the AnalyticRayCaster.
+
+        Args:
+            playground (Playground): The playground environment.
+            size (Tuple[int, int]): Size of the view used for the view coordinates.
+            center (Tuple[float, float]): Center of the view.
+            zoom (float): Zoom factor of the view.
+        """
+        self._playground = playground
+        self._width, self._height = size
+        self._center = center
+        self._zoom = zoom
+
+        self._local_geometries: Dict[EmbodiedEntity, LocalGeometry] = {}
+        self._static_entities: Dict[EmbodiedEntity, None] = {}
+        self._dynamic_entities: Dict[EmbodiedEntity, None] = {}
+
+        self._static_geometry: Optional[Tuple[np.ndarray, ...]] = None
+
+        for entity in playground.elements:
+            self.add_entity(entity)
+
+        for agent in playground.agents:
+            self.add_entity(agent.base)
+
+    @staticmethod
+    def _is_visible(entity) -> bool:
+        """
+        Returns whether an entity can be detected by ray sensors.
+        Interactive and transparent entities are not drawn in the ID view,
+        so they are not detected either.
+        """
+        if isinstance(entity, InteractiveAnchored):
+            return False
+
+        return isinstance(entity, PhysicalEntity) and not entity.transparent
+
+    def add_entity(self, entity) -> None:
+        """
+        Register an entity so that it can be hit by the rays.
+
+        Args:
+            entity: The entity to add.
+        """
+        if not self._is_visible(entity):
+            return
+
+        self._local_geometries[entity] = _local_geometry(entity)
+
+        if entity.pm_body.body_type == pymunk.Body.STATIC:
+            self._static_entities[entity] = None
+            self.invalidate()
+        else:
+            self._dynamic_entities[entity] = None
+
+    def remove_entity(self, entity) -> None:
+        """
+        Unregister an entity.
+
+        Args:
+            entity: The entity to remove.
+        """
+        if entity in self._static_entities:
+            self._static_entities.pop(entity)
+            self.invalidate()
+
+        self._dynamic_entities.pop(entity, None)
+        self._local_geometries.pop(entity, None)
+
+    def invalidate(self) -> None:
+        """
+        Mark the static index as outdated, e.g. after a static entity was moved.
+        """
+        self._static_geometry = None
+
+    def _build_geometry(self, entities) -> Tuple[np.ndarray, ...]:
+        """
+        Transform the geometry of entities in the frame of the playground.
+
+        Args:
+            entities: Iterable of registered entities.
+
+        Returns:
+            Tuple[np.ndarray, ...]: Segment starts, segment ends, segment uids,
+            circle centers, circle radii and circle uids.
+        """
+        starts, ends, seg_uids = [np.zeros((0, 2))], [np.zeros((0, 2))], [np.zeros(0)]
+        centers, radii, circle_uids = [np.zeros((0, 2))], [np.zeros(0)], [np.zeros(0)]
+
+        for entity in entities:
+            seg_start, seg_end, circle_center, circle_radius = self._local_geometries[entity]
+            body = entity.pm_body
+
+            if len(seg_start):
+                starts.append(_to_world(seg_start, body))
+                ends.append(_to_world(seg_end, body))
+                seg_uids.append(np.full(len(seg_start), entity.uid, dtype=float))
+
+            if len(circle_center):
+                centers.append(_to_world(circle_center, body))
+                radii.append(circle_radius)
+                circle_uids.append(np.full(len(circle_center), entity.uid, dtype=float))
+
+        return (
+            np.concatenate(starts),
+            np.concatenate(ends),
+            np.concatenate(seg_uids),
+            np.concatenate(centers),
+            np.concatenate(radii),
+            np.concatenate(circle_uids),
+        )
+
+    def geometry(self) -> Tuple[np.ndarray, ...]:
+        """
+        Returns the current geometry of all the registered entities, static
+        index first.
+
+        Returns:
+            Tuple[np.ndarray, ...]: Segment starts, segment ends, segment uids,
+            circle centers, circle radii and circle uids.
+        """
+        if self._static_geometry is None:
+            self._static_geometry = self._build_geometry(self._static_entities)
+
+        dynamic_geometry = self._build_geometry(self._dynamic_entities)
+
+        return tuple(
+            np.concatenate((static, dynamic))
+            for static, dynamic in zip(self._static_geometry, dynamic_geometry)
+        )
+
+    @staticmethod
+    def sensor_rays(sensors: Sequence[RaySensor], max_n_rays: int) -> Tuple[np.ndarray, ...]:
+        """
+        Compute the origins, directions and ranges of the rays of the sensors.
+        Sensors with fewer rays than max_n_rays are padded with null directions,
+        which never hit anything.
+
+        Args:
+            sensors (Sequence[RaySensor]): The sensors.
+            max_n_rays (int): Number of rays of the output arrays.
+
+        Returns:
+            Tuple[np.ndarray, ...]: Origins (B, 2), directions (B, R, 2),
+            ranges (B,) and invisible uids of each sensor.
+        """
+        n_sensors = len(sensors)
+        origins = np.empty((n_sensors, 2))
+        directions = np.zeros((n_sensors, max_n_rays, 2))
+        ranges = np.empty(n_sensors)
+        invisible_ids = []
+
+        for index, sensor in enumerate(sensors):
+            origins[index] = tuple(sensor.position)
+            angles = np.linspace(
+                sensor.angle - sensor.fov / 2, sensor.angle + sensor.fov / 2, sensor.resolution
+            )
+            directions[index, : sensor.resolution, 0] = np.cos(angles)
+            directions[index, : sensor.resolution, 1] = np.sin(angles)
+            ranges[index] = sensor.max_range
+            invisible_ids.append([sensor.anchor.uid] + sensor.invisible_ids)
+
+        return origins, directions, ranges, invisible_ids
+
+    @staticmethod
+    def in_range_mask(
+            origins: np.ndarray,
+            ranges: np.ndarray,
+            box_min: np.ndarray,
+            box_max: np.ndarray,
+    ) -> np.ndarray:
+        """
+        Returns the mask (B, N) of the bounding boxes that are within range of each sensor.
+
+        Args:
+            origins (np.ndarray): Sensor positions (B, 2).
+            ranges (np.ndarray): Sensor ranges (B,).
+            box_min (np.ndarray): Lower corners (N, 2) of the bounding boxes.
+            box_max (np.ndarray): Upper corners (N, 2) of the bounding boxes.
+        """
+        origins = origins[:, np.newaxis, :]
+        gap = np.maximum(np.maximum(box_min - origins, origins - box_max), 0)
+        return np.sum(gap * gap, axis=2) <= (ranges * ranges)[:, np.newaxis]
+
+    @staticmethod
+    def stack_geometries(
+            geometries: Sequence[Tuple[np.ndarray, ...]],
+            repeats: Sequence[int],
+    ) -> Tuple[np.ndarray, ...]:
+        """
+        Stack the geometries of several playgrounds along a batch axis, so that
+        the sensors of all the playgrounds can be cast in a single kernel call.
+        Each geometry is repeated once per sensor of its playground, and padded
+        with NaN, which never hits anything.
+
+        Args:
+            geometries (Sequence[Tuple[np.ndarray, ...]]): Geometries, as returned by geometry().
+            repeats (Sequence[int]): Number of sensors of each playground.
+
+        Returns:
+            Tuple[np.ndarray, ...]: Batched geometry, with arrays of shape (B, S, 2) or (B, S).
+        """
+        n_seg = max(len(geometry[0]) for geometry in geometries)
+        n_circles = max(len(geometry[3]) for geometry in geometries)
+        sizes = (n_seg, n_seg, n_seg, n_circles, n_circles, n_circles)
+        fill_values = (np.nan, np.nan, 0, np.nan, np.nan, 0)
+
+        stacked = []
+        for index, (size, fill_value) in enumerate(zip(sizes, fill_values)):
+            arrays = []
+            for geometry, repeat in zip(geometries, repeats):
+                array = geometry[index]
+                pad = [(0, size - len(array))] + [(0, 0)] * (array.ndim - 1)
+                array = np.pad(array, pad, constant_values=fill_value)
+                arrays.append(np.repeat(array[np.newaxis], repeat, axis=0))
+            stacked.append(np.concatenate(arrays))
+
+        return tuple(stacked)
+
+    @staticmethod
+    def cast(
+            origins: np.ndarray,
+            directions: np.ndarray,
+            ranges: np.ndarray,
+            invisible_ids: List[List[int]],
+            geometry: Tuple[np.ndarray, ...],
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Cast the rays of a batch of sensors against a geometry.
+
+        Args:
+            origins (np.ndarray): Sensor positions (B, 2).
+            directions (np.ndarray): Ray directions (B, R, 2).
+            ranges (np.ndarray): Sensor ranges (B,).
+            invisible_ids (List[List[int]]): Uids invisible to each sensor.
+            geometry (Tuple[np.ndarray, ...]): Geometry shared by all the sensors,
+                as returned by geometry(), or one geometry per sensor, as
+                returned by stack_geometries().
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Distances (B, R), equal to the range
+            when nothing is hit, and uids (B, R) of the entities hit, 0 if none.
+        """
+        seg_start, seg_end, seg_uids, centers, radii, circle_uids = geometry
+        batched = seg_start.ndim == 3
+
+        seg_mask = AnalyticRayCaster.in_range_mask(
+            origins, ranges, np.minimum(seg_start, seg_end), np.maximum(seg_start, seg_end)
+        )
+        circle_mask = AnalyticRayCaster.in_range_mask(
+            origins, ranges, centers - radii[..., np.newaxis], centers + radii[..., np.newaxis]
+        )
+
+        for index, inv_ids in enumerate(invisible_ids):
+            seg_mask[index] &= ~np.isin(seg_uids[index] if batched else seg_uids, inv_ids)
+            circle_mask[index] &= ~np.isin(circle_uids[index] if batched else circle_uids, inv_ids)
+
+        # Keep only the segments seen by at least one sensor
+        keep = seg_mask.any(axis=0)
+        seg_dist, seg_index = intersect_rays_segments(
+            origins, directions, seg_start[..., keep, :], seg_end[..., keep, :], seg_mask[:, keep]
+        )
+        seg_hit_uids = _hit_uids(seg_uids[..., keep], seg_index)
+
+        keep = circle_mask.any(axis=0)
+        circle_dist, circle_index = intersect_rays_circles(
+            origins, directions, centers[..., keep, :], radii[..., keep], circle_mask[:, keep]
+        )
+        circle_hit_uids = _hit_uids(circle_uids[..., keep], circle_index)
+
+        dist = np.minimum(seg_dist, circle_dist)
+        uids = np.where(seg_dist <= circle_dist, seg_hit_uids, circle_hit_uids)
+
+        hit = dist <= ranges[:, np.newaxis]
+        dist = np.where(hit, dist, ranges[:, np.newaxis])
+        uids = np.where(hit, uids, 0)
+
+        return dist, uids
+
+    def hitpoints(
+            self,
+            origins: np.ndarray,
+            directions: np.ndarray,
+            dist: np.ndarray,
+            uids: np.ndarray,
+    ) -> np.ndarray:
+        """
+        Assemble the hitpoints array consumed by RaySensor.update_hitpoints.
+
+        Columns are: view position (2), position in the playground (2),
+        position relative to the sensor (2, unused), sensor position on the view (2),
+        uid of the entity hit and distance.
+
+        Args:
+            origins (np.ndarray): Sensor positions (B, 2).
+            directions (np.ndarray): Ray directions (B, R, 2).
+            dist (np.ndarray): Distances (B, R).
+            uids (np.ndarray): Uids of the entities hit (B, R).
+
+        Returns:
+            np.ndarray: Hitpoints (B, R, 10).
+        """
+        n_batch, n_rays = dist.shape
+        half_view = np.array((self._width / 2, self._height / 2))
+        center = np.asarray(self._center, dtype=float)
+
+        hitpoints = np.zeros((n_batch, n_rays, 10))
+
+        env_position = origins[:, np.newaxis, :] + dist[:, :, np.newaxis] * directions
+        hitpoints[:, :, 0:2] = (env_position - center) * self._zoom + half_view
+        hitpoints[:, :, 2:4] = env_position
+        hitpoints[:, :, 6:8] = ((origins - center) * self._zoom + half_view)[:, np.newaxis, :]
+        hitpoints[:, :, 8] = uids
+        hitpoints[:, :, 9] = dist
+
+        return hitpoints
+
+    def compute_hitpoints(self, sensors: Sequence[RaySensor]) -> np.ndarray:
+        """
+        Compute the hitpoints of all the sensors at once.
+
+        Args:
+            sensors (Sequence[RaySensor]): The sensors.
+
+        Returns:
+            np.ndarray: Hitpoints (n_sensors, max_n_rays, 10).
+        """
+        max_n_rays = max(sensor.resolution for sensor in sensors)
+        origins, directions, ranges, invisible_ids = self.sensor_rays(sensors, max_n_rays)
+
+        dist, uids = self.cast(origins, directions, ranges, invisible_ids, self.geometry())
+
+        return self.hitpoints(origins, directions, dist, uids)
@@ -0,0 +1,51 @@
+"""
+OpenGL sync objects (fences), which are not wrapped by pyglet.
+
+A fence is inserted in the command stream after some GPU work, and the CPU
+can then wait until this work is completed, e.g. before reading a buffer.
+"""
+import ctypes
+
+from pyglet import gl
+from pyglet.gl.lib import link_GL
+
+GLsync = ctypes.c_void_p
+
+glFenceSync = link_GL("glFenceSync", GLsync, [gl.GLenum, gl.GLbitfield],
+                      requires="OpenGL 3.2")
+glClientWaitSync = link_GL("glClientWaitSync", gl.GLenum,
+                           [GLsync, gl.GLbitfield, gl.GLuint64],
+                           requires="OpenGL 3.2")
+glDeleteSync = link_GL("glDeleteSync", None, [GLsync], requires="OpenGL 3.2")
+
+
+def insert_fence() -> GLsync:
+    """
+    Insert a fence after all the GL commands issued so far.
+
+    Returns:
+        GLsync: The fence.
+    """
+    return glFenceSync(gl.GL_SYNC_GPU_COMMANDS_COMPLETE, 0)
+
+
+def wait_and_delete_fence(fence: GLsync) -> None:
+    """
+    Block until the GL commands issued before the fence are completed, then
+    delete the fence.
+
+    Args:
+        fence (GLsync): The fence.
+    """
+    glClientWaitSync(fence, gl.GL_SYNC_FLUSH_COMMANDS_BIT, gl.GL_TIMEOUT_IGNORED)
+    glDeleteSync(fence)
+
+
+def delete_fence(fence: GLsync) -> None:
+    """
+    Delete a fence without waiting for it.
+
+    Args:
+        fence (GLsync): The fence.
+    """
+    glDeleteSync(fence)
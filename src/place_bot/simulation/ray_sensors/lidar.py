@@ -39,6 +39,8 @@ class Lidar(DistanceSensor):
     - max range (maximum range of the sensor): 600 pix
     """
 
+    _snapshot_attributes = DistanceSensor._snapshot_attributes + ("_noise_model",)
+
     def __init__(self, lidar_params: LidarParams = LidarParams(), invisible_elements=None, **kwargs):
         # Initialize the base class
         super().__init__(normalize=False,
@@ -107,6 +109,8 @@ class Lidar(DistanceSensor):
         """
         Applies noise to the sensor values.
         """
+        if self._noise_model.rng is None:
+            self._noise_model.rng = self.noise_rng
         self._values = self._noise_model.add_noise(self._values)
 
     def draw(self) -> None:
@@ -2,23 +2,59 @@ from __future__ import annotations
 
 from array import array
 from os import path
-from typing import TYPE_CHECKING, List
+from typing import TYPE_CHECKING, List, Sequence
 
 import numpy as np
+from pyglet import gl
 
 from place_bot.simulation.gui_map.top_down_view import TopDownView
+from place_bot.simulation.ray_sensors.analytic_ray_caster import AnalyticRayCaster
+from place_bot.simulation.ray_sensors.gl_sync import delete_fence, insert_fence, wait_and_delete_fence
 from place_bot.simulation.ray_sensors.ray_sensor import RaySensor
+from place_bot.simulation.ray_sensors.shader_cache import SHADER_CACHE
+from place_bot.simulation.utils.profiler import PROFILER
 
 if TYPE_CHECKING:
     from place_bot.simulation.gui_map.playground import Playground
 
+# Minimal number of invisible IDs per sensor in the GPU buffer, so that
+# temporary invisible elements do not require a reallocation
+MIN_INVISIBLE_CAPACITY = 8
+
+# Number of rays computed by a work group of the compute shader. The maximum
+# size of a work group is only guaranteed to be at least 1024 by OpenGL, so a
+# sensor with more rays is computed by several groups.
+RAYS_PER_GROUP = 256
+
 
 class RayCompute:
     """
     Class for computing ray-based ray_sensors hitpoints using shaders or CPU.
+
+    Three backends are available:
+    - shader: the ID framebuffer is sampled by a compute shader,
+    - CPU: the ID framebuffer is read back and sampled with NumPy,
+    - analytic: the rays are intersected with the pymunk shapes with NumPy.
+      It gives exact distances and does not need any OpenGL context.
+
+    With the shader backend, the hitpoints can be read back asynchronously.
+    The compute shader of step t writes in one of two output buffers and a
+    fence is inserted after it. The buffer is only read at step t+1, once the
+    physics of step t+1 has run, so that the GPU work overlaps the CPU work.
+    The sensors then have a latency of one timestep. In synchronous mode
+    (default), the output buffer is read right after the dispatch, as before.
     """
 
-    def __init__(self, playground: Playground, size, center, zoom, use_shader: bool = True):
+    def __init__(
+            self,
+            playground: Playground,
+            size,
+            center,
+            zoom,
+            use_shader: bool = True,
+            use_analytic: bool = False,
+            async_readback: bool = False,
+    ):
         """
         Initialize RayCompute.
 
@@ -28,10 +64,27 @@ class RayCompute:
             center: Center of the view.
             zoom: Zoom factor.
             use_shader (bool): Whether to use shaders for computation.
+            use_analytic (bool): Whether to intersect rays analytically with
+                the pymunk shapes. Takes precedence over use_shader.
+            async_readback (bool): Whether to read back the shader outputs one
+                timestep later, without blocking. Sensor values then have a
+                latency of one timestep.
         """
-        self._ctx = playground.window._ctx
+        self._use_analytic = use_analytic
+        self._use_shader = use_shader and not use_analytic
+        self._async_readback = async_readback
 
-        self._use_shader = use_shader
+        self._sensors: List[RaySensor] = []
+
+        self._ray_caster = None
+        self._id_view = None
+
+        if self._use_analytic:
+            self._ray_caster = AnalyticRayCaster(playground, size, center, zoom)
+            return
+
+        self._window = playground.window
+        self._ctx = self._window.ctx
 
         self._id_view = TopDownView(
             playground,
@@ -43,8 +96,6 @@ class RayCompute:
             draw_transparent=False,
         )
 
-        self._sensors: List[RaySensor] = []
-
         if self._use_shader:
             self._view_params_buffer = self._ctx.buffer(
                 data=array(
@@ -61,11 +112,25 @@ class RayCompute:
 
             self._view_params_buffer.bind_to_storage_buffer(binding=6)
 
+            # Buffers are allocated with some headroom, and filled from
+            # preallocated NumPy arrays
+            self._sensor_capacity = 0
+            self._invisible_capacity = 0
+            self._shader_n_rays = 0
+
+            self._params = None
+            self._positions = None
+            self._invisible = None
+
             self._position_buffer = None
             self._param_buffer = None
-            self._output_rays_buffer = None
+            self._output_rays_buffers = []
             self._inv_buffer = None
 
+            # Double buffering of the outputs for the asynchronous readback
+            self._output_index = 0
+            self._pending_readback = None
+
             shader_dir = path.abspath(path.join(path.dirname(__file__), "shaders"))
 
             with open(path.join(shader_dir, "id_compute.glsl"), "rt", encoding="utf-8") as f_id:
@@ -73,6 +138,10 @@ class RayCompute:
 
             self._id_shader = None
 
+            # Sensors are registered in bulk: buffers and shader are updated
+            # once, before the next computation
+            self._buffers_need_update = False
+
     @property
     def _n_sensors(self) -> int:
         """
@@ -94,131 +163,176 @@ class RayCompute:
         """
         return 1 + max(len(sensor.invisible_ids) for sensor in self._sensors)
 
-    def _generate_buffers(self):
+    @staticmethod
+    def _capacity(size: int) -> int:
         """
-        Generate GPU buffers for sensor computation.
+        Returns the capacity to allocate for a given size, with some headroom
+        so that buffers are not reallocated each time a sensor is added.
 
-        Returns:
-            Tuple of buffers.
+        Args:
+            size (int): The size needed.
         """
-        position_buffer = self._ctx.buffer(
-            data=array("f", self._generate_position_buffer())
-        )
-        param_buffer = self._ctx.buffer(
-            data=array("f", self._generate_parameter_buffer())
-        )
-        output_rays_buffer = self._ctx.buffer(
-            data=array("f", self._generate_output_buffer())
-        )
-        inv_buffer = self._ctx.buffer(data=array("I", self._generate_invisible_buffer()))
-
-        param_buffer.bind_to_storage_buffer(binding=2)
-        position_buffer.bind_to_storage_buffer(binding=3)
-        output_rays_buffer.bind_to_storage_buffer(binding=4)
-        inv_buffer.bind_to_storage_buffer(binding=5)
-
-        return position_buffer, param_buffer, output_rays_buffer, inv_buffer
+        return 1 << max(size - 1, 0).bit_length()
 
-    def _generate_parameter_buffer(self):
+    def _allocate_buffers(self) -> None:
         """
-        Generate parameter buffer for all sensors.
+        Allocate the GPU buffers and the NumPy arrays used to fill them, for
+        the current capacities.
         """
-        for sensor in self._sensors:
-            yield sensor.max_range
-            yield sensor.fov
-            yield sensor.resolution
-            yield sensor.n_points
+        self._discard_pending_readback()
 
-    def _generate_position_buffer(self):
-        """
-        Generate position buffer for all sensors.
-        """
-        for sensor in self._sensors:
-            yield sensor.position[0]
-            yield sensor.position[1]
-            yield sensor.angle
+        self._params = np.zeros((self._sensor_capacity, 4), dtype=np.float32)
+        self._positions = np.zeros((self._sensor_capacity, 3), dtype=np.float32)
+        self._invisible = np.zeros((self._sensor_capacity, self._invisible_capacity),
+                                   dtype=np.int32)
 
-    def _generate_output_buffer(self):
-        """
-        Generate output buffer for all sensors.
-        """
-        for _ in range(self._n_sensors):
-            for _ in range(self._max_n_rays):
-                # View Position
-                yield 0.0
-                yield 0.0
+        self._param_buffer = self._ctx.buffer(reserve=self._params.nbytes)
+        self._position_buffer = self._ctx.buffer(reserve=self._positions.nbytes)
+        self._inv_buffer = self._ctx.buffer(reserve=self._invisible.nbytes)
 
-                # Abs Env Position
-                yield 0.0
-                yield 0.0
+        n_output_buffers = 2 if self._async_readback else 1
+        output_size = self._sensor_capacity * self._shader_n_rays * 10 * 4
+        self._output_rays_buffers = [
+            self._ctx.buffer(reserve=output_size) for _ in range(n_output_buffers)
+        ]
+        self._output_index = 0
 
-                # Rel Position
-                yield 0.0
-                yield 0.0
+    def _write_parameters(self) -> None:
+        """
+        Write the parameters of all sensors in the parameter buffer.
+        """
+        for index, sensor in enumerate(self._sensors):
+            self._params[index] = (sensor.max_range, sensor.fov,
+                                   sensor.resolution, sensor.n_points)
 
-                # Sensor center on view
-                yield 0.0
-                yield 0.0
+        self._param_buffer.write(self._params[:self._n_sensors])
 
-                # ID
-                yield 0.0
+    def _write_positions(self) -> None:
+        """
+        Write the current positions of all sensors in the position buffer.
+        """
+        for index, sensor in enumerate(self._sensors):
+            position = sensor.position
+            self._positions[index] = (position[0], position[1], sensor.angle)
 
-                # Distance
-                yield 0.0
+        self._position_buffer.write(self._positions[:self._n_sensors])
 
-    def _generate_invisible_buffer(self):
+    def _write_invisible(self) -> None:
         """
-        Generate buffer for invisible elements for all sensors.
+        Write the invisible IDs of all sensors in the invisible buffer. The
+        first invisible ID of a sensor is the one of its anchor.
         """
-        for sensor in self._sensors:
+        self._invisible[:] = 0
 
-            count = 1
-            yield sensor.anchor.uid
+        for index, sensor in enumerate(self._sensors):
+            inv_ids = [sensor.anchor.uid] + sensor.invisible_ids
+            self._invisible[index, :len(inv_ids)] = inv_ids
 
-            for inv in sensor.invisible_ids:
-                yield inv
-                count += 1
+        self._inv_buffer.write(self._invisible[:self._n_sensors])
 
-            while count < self._max_invisible:
-                yield 0
-                count += 1
+    @property
+    def _rays_per_group(self) -> int:
+        """
+        Returns the size of the work groups of the compute shader.
+        """
+        return min(self._shader_n_rays, RAYS_PER_GROUP)
 
     def _generate_shaders(self):
         """
-        Generate compute shaders for sensor computation.
+        Generate compute shaders for sensor computation. Compiled shaders are
+        shared through the process-wide shader cache.
         """
-        new_source = self._source_compute_ids
-        new_source = new_source.replace("N_SENSORS", str(len(self._sensors)))
-        new_source = new_source.replace("MAX_N_RAYS", str(self._max_n_rays))
-        new_source = new_source.replace("MAX_N_INVISIBLE", str(self._max_invisible))
-        id_shader = self._ctx.compute_shader(source=new_source)
-
-        return id_shader
+        return SHADER_CACHE.get(self._ctx, self._source_compute_ids,
+                                {"MAX_N_RAYS": self._shader_n_rays,
+                                 "RAYS_PER_GROUP": self._rays_per_group})
 
     def add(self, sensor) -> None:
         """
         Add a sensor to the computation.
 
+        The GPU buffers and the shader are only updated before the next
+        computation, so that adding many robots during the construction of a
+        world compiles the shader at most once.
+
         Args:
             sensor: The sensor to add.
         """
-        self._sensors.append(sensor)
+        self.add_sensors([sensor])
+
+    def add_sensors(self, sensors: Sequence[RaySensor]) -> None:
+        """
+        Add several sensors to the computation at once. An output of the
+        shader still waiting to be read is dropped, as it holds no values for
+        the new sensors: the next computation is read synchronously.
+
+        Args:
+            sensors (Sequence[RaySensor]): The sensors to add.
+        """
+        self._sensors.extend(sensors)
 
         if self._use_shader:
-            self._update_buffers_and_shaders()
+            self._buffers_need_update = True
+            self._discard_pending_readback()
 
     def _update_buffers_and_shaders(self) -> None:
         """
-        Update GPU buffers and shaders.
+        Update GPU buffers and shaders after sensors were added or their
+        invisible elements changed.
+
+        Buffers are only reallocated when a capacity is exceeded, and the
+        shader is only compiled again when the maximum number of rays changes.
+        """
+        reallocate = (self._n_sensors > self._sensor_capacity
+                      or self._max_invisible > self._invisible_capacity)
+
+        # The output buffers depend on the number of rays of the shader
+        if self._shader_n_rays != self._max_n_rays:
+            self._shader_n_rays = self._max_n_rays
+            self._id_shader = self._generate_shaders()
+            reallocate = True
+
+        if reallocate:
+            self._sensor_capacity = max(self._sensor_capacity,
+                                        self._capacity(self._n_sensors))
+            self._invisible_capacity = max(self._invisible_capacity,
+                                           self._capacity(self._max_invisible),
+                                           MIN_INVISIBLE_CAPACITY)
+            self._allocate_buffers()
+
+        self._write_parameters()
+        self._write_invisible()
+
+    def add_entity(self, entity) -> None:
         """
-        (
-            self._position_buffer,
-            self._param_buffer,
-            self._output_rays_buffer,
-            self._inv_buffer,
-        ) = self._generate_buffers()
+        Notify the analytic backend that an entity was added to the playground.
 
-        self._id_shader = self._generate_shaders()
+        Args:
+            entity: The entity added.
+        """
+        if self._ray_caster:
+            self._ray_caster.add_entity(entity)
+
+    def remove_entity(self, entity) -> None:
+        """
+        Notify the analytic backend that an entity was removed from the playground.
+
+        Args:
+            entity: The entity removed.
+        """
+        if self._ray_caster:
+            self._ray_caster.remove_entity(entity)
+
+    def reset(self) -> None:
+        """
+        Rebuild the static geometry of the analytic backend, as static entities
+        may have been moved back to their initial coordinates. Outputs of the
+        shader still waiting to be read are dropped.
+        """
+        if self._ray_caster:
+            self._ray_caster.invalidate()
+
+        if self._use_shader:
+            self._discard_pending_readback()
 
     def update_sensors(self) -> None:
         """
@@ -227,36 +341,156 @@ class RayCompute:
         if not self._sensors:
             return
 
-        self._id_view.update_and_draw_in_framebuffer(force=True)
+        if self._use_analytic:
+            with PROFILER.phase("ray_analytic"):
+                self._update_sensors_analytic()
+            return
+
+        # Framebuffers are not shared between GL contexts: make the context of
+        # this playground current, in case other playgrounds were created since.
+        self._window.switch_to()
+        with PROFILER.phase("render"):
+            self._id_view.update_and_draw_in_framebuffer()
 
         if self._use_shader:
             self._update_sensors_shaders()
         else:
-            self._update_sensors_cpu()
+            with PROFILER.phase("ray_cpu"):
+                self._update_sensors_cpu()
 
     def _update_sensors_shaders(self) -> None:
         """
         Update sensors using GPU shaders.
         """
-        update_inv = False
-        for sensor in self._sensors:
-            if sensor.require_invisible_update:
-                update_inv = True
+        with PROFILER.phase("shader_dispatch"):
+            if self._buffers_need_update or any(
+                    sensor.require_invisible_update for sensor in self._sensors):
+                self._update_buffers_and_shaders()
+                self._buffers_need_update = False
+
+            self._write_positions()
+
+            output_buffer = self._output_rays_buffers[self._output_index]
+
+            # Binding points belong to the current GL context, which may be shared
+            # with the RayCompute of other playgrounds: bind all the buffers again.
+            self._param_buffer.bind_to_storage_buffer(binding=2)
+            self._position_buffer.bind_to_storage_buffer(binding=3)
+            output_buffer.bind_to_storage_buffer(binding=4)
+            self._inv_buffer.bind_to_storage_buffer(binding=5)
+            self._view_params_buffer.bind_to_storage_buffer(binding=6)
 
-        if update_inv:
-            self._update_buffers_and_shaders()
+            self._id_shader["n_invisible"] = self._invisible_capacity
 
-        self._position_buffer = self._ctx.buffer(
-            data=array("f", self._generate_position_buffer())
-        )
-        self._position_buffer.bind_to_storage_buffer(binding=3)
+            self._id_view.texture.use()
+            n_groups = -(-self._shader_n_rays // self._rays_per_group)
+            self._id_shader.run(group_x=n_groups, group_y=self._n_sensors)
+
+        if not self._async_readback:
+            with PROFILER.phase("readback"):
+                self._read_hitpoints(output_buffer)
+            return
+
+        # Make the shader writes visible to the readback, then fence them
+        gl.glMemoryBarrier(gl.GL_BUFFER_UPDATE_BARRIER_BIT)
+        fence = insert_fence()
+
+        with PROFILER.phase("readback"):
+            if self._pending_readback is None:
+                # First step: there is no previous output yet, read the current one
+                self._read_hitpoints(output_buffer)
+            else:
+                previous_buffer, previous_fence = self._pending_readback
+                wait_and_delete_fence(previous_fence)
+                self._read_hitpoints(previous_buffer)
 
-        self._id_view.texture.use()
-        self._id_shader.run(group_x=self._n_sensors)
+        self._pending_readback = output_buffer, fence
+        self._output_index = 1 - self._output_index
 
+    def _read_hitpoints(self, output_buffer) -> None:
+        """
+        Read an output buffer of the compute shader and update the sensors.
+
+        Args:
+            output_buffer: The output buffer to read.
+        """
+        size = self._n_sensors * self._shader_n_rays * 10 * 4
         hitpoints = np.frombuffer(
-            self._output_rays_buffer.read(), dtype=np.float32
-        ).reshape(self._n_sensors, self._max_n_rays, 10)
+            output_buffer.read(size=size), dtype=np.float32
+        ).reshape(self._n_sensors, self._shader_n_rays, 10)
+
+        for index, sensor in enumerate(self._sensors):
+            sensor.update_hitpoints(hitpoints[index, : sensor.resolution, :])
+
+    def _discard_pending_readback(self) -> None:
+        """
+        Forget the output of the previous step, e.g. when the buffers are rebuilt.
+        """
+        if self._pending_readback is not None:
+            delete_fence(self._pending_readback[1])
+            self._pending_readback = None
+
+    @staticmethod
+    def update_sensors_batch(ray_computes: Sequence[RayCompute]) -> None:
+        """
+        Update the sensors of several playgrounds at once.
+
+        The rays of all the analytic backends are cast against the geometries
+        of their playgrounds in a single NumPy kernel call. The other backends
+        are updated one after the other, as their framebuffers are not shared.
+
+        Args:
+            ray_computes (Sequence[RayCompute]): The RayCompute of each playground.
+        """
+        analytic_computes = []
+        for ray_compute in ray_computes:
+            if not ray_compute._sensors:
+                continue
+
+            if ray_compute._use_analytic:
+                analytic_computes.append(ray_compute)
+            else:
+                ray_compute.update_sensors()
+
+        if not analytic_computes:
+            return
+
+        max_n_rays = max(ray_compute._max_n_rays for ray_compute in analytic_computes)
+
+        rays = [
+            ray_compute._ray_caster.sensor_rays(ray_compute._sensors, max_n_rays)
+            for ray_compute in analytic_computes
+        ]
+        geometry = AnalyticRayCaster.stack_geometries(
+            [ray_compute._ray_caster.geometry() for ray_compute in analytic_computes],
+            [ray_compute._n_sensors for ray_compute in analytic_computes],
+        )
+
+        origins = np.concatenate([origins for origins, _, _, _ in rays])
+        directions = np.concatenate([directions for _, directions, _, _ in rays])
+        ranges = np.concatenate([ranges for _, _, ranges, _ in rays])
+        invisible_ids = [inv_ids for _, _, _, inv in rays for inv_ids in inv]
+
+        with PROFILER.phase("ray_analytic"):
+            dist, uids = AnalyticRayCaster.cast(origins, directions, ranges, invisible_ids, geometry)
+
+        begin = 0
+        for ray_compute in analytic_computes:
+            sl = slice(begin, begin + ray_compute._n_sensors)
+            begin = sl.stop
+
+            hitpoints = ray_compute._ray_caster.hitpoints(
+                origins[sl], directions[sl], dist[sl], uids[sl]
+            )
+
+            for index, sensor in enumerate(ray_compute._sensors):
+                sensor.update_hitpoints(hitpoints[index, : sensor.resolution, :])
+
+    def _update_sensors_analytic(self) -> None:
+        """
+        Update sensors by intersecting their rays with the pymunk shapes.
+        """
+        hitpoints = self._ray_caster.compute_hitpoints(self._sensors)
 
         for index, sensor in enumerate(self._sensors):
             sensor.update_hitpoints(hitpoints[index, : sensor.resolution, :])
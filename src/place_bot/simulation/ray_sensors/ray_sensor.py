@@ -14,6 +14,8 @@ class RaySensor(ExternalSensor, ABC):
     Ray sensors use Arcade shaders.
     """
 
+    _snapshot_attributes = ExternalSensor._snapshot_attributes + ("_hitpoints",)
+
     def __init__(
             self,
             spatial_resolution: float = 1,
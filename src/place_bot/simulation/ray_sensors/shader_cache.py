@@ -0,0 +1,82 @@
+"""
+Module that defines ShaderCache, an in-process cache of compiled compute shaders.
+"""
+import weakref
+from collections import OrderedDict
+from typing import Dict, Tuple
+
+from arcade.gl import ComputeShader, Context
+
+from place_bot.simulation.utils.profiler import PROFILER
+
+
+class ShaderCache:
+    """
+    LRU cache of compute shaders compiled from a source template.
+
+    The template parameters are substituted in the source before compiling,
+    and the compiled shader is cached with the substituted parameters as key.
+    Compiled programs belong to a GL context, so there is one cache per
+    context, which is dropped with the context.
+
+    Example Usage
+        shader = SHADER_CACHE.get(ctx, source, {"MAX_N_RAYS": 181})
+    """
+
+    def __init__(self, max_size: int = 16):
+        """
+        Initialize the ShaderCache.
+
+        Args:
+            max_size (int): Maximum number of shaders kept per context.
+        """
+        self._max_size = max_size
+        self._caches: "weakref.WeakKeyDictionary[Context, OrderedDict]" = weakref.WeakKeyDictionary()
+
+        self.n_compilations = 0
+        self.n_hits = 0
+
+    def get(self, ctx: Context, source: str, params: Dict[str, int]) -> ComputeShader:
+        """
+        Returns the compute shader for a source template and its parameters,
+        compiling it if it is not in the cache.
+
+        Args:
+            ctx (Context): The GL context.
+            source (str): The source template of the shader.
+            params (Dict[str, int]): Values of the template parameters.
+
+        Returns:
+            ComputeShader: The compiled shader.
+        """
+        cache = self._caches.setdefault(ctx, OrderedDict())
+        key: Tuple = (source, tuple(sorted(params.items())))
+
+        if key in cache:
+            cache.move_to_end(key)
+            self.n_hits += 1
+            return cache[key]
+
+        new_source = source
+        for name, value in params.items():
+            new_source = new_source.replace(name, str(value))
+
+        shader = ctx.compute_shader(source=new_source)
+        self.n_compilations += 1
+        PROFILER.count("shader_compilations")
+
+        cache[key] = shader
+        if len(cache) > self._max_size:
+            cache.popitem(last=False)
+
+        return shader
+
+    def clear(self) -> None:
+        """
+        Remove all the cached shaders.
+        """
+        self._caches.clear()
+
+
+# Cache shared by all the RayCompute of the process
+SHADER_CACHE = ShaderCache()
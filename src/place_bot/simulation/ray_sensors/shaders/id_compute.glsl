@@ -1,6 +1,6 @@
             #version 440
 
-            layout(local_size_x=MAX_N_RAYS) in;
+            layout(local_size_x=RAYS_PER_GROUP) in;
 
             struct HitPoint
             {
@@ -41,14 +41,17 @@
 
             uniform sampler2D id_texture;
 
+            // Number of invisible IDs stored per sensor
+            uniform int n_invisible;
+
             layout(std430, binding = 2) buffer sparams
             {
-                SensorParam sensor_params[N_SENSORS];
+                SensorParam sensor_params[];
             } Params;
 
             layout(std430, binding = 3) buffer coordinates
             {
-                Coordinate coords[N_SENSORS];
+                Coordinate coords[];
             } In;
 
             layout(std430, binding = 4) buffer hit_points
@@ -58,7 +61,8 @@
 
             layout(std430, binding=5) buffer invisible_ids
             {
-                int inv_ids[N_SENSORS][MAX_N_INVISIBLE];
+                // n_invisible IDs per sensor, padded with zeros
+                int inv_ids[];
             }InvIDs;
 
             layout(std430, binding=6) buffer view_params
@@ -75,8 +79,15 @@
 
             void main() {
 
-                int i_ray = int(gl_LocalInvocationIndex);
-                int i_sensor = int(gl_WorkGroupID);
+                // One row of work groups per sensor: the rays of a sensor may
+                // need several groups, as the size of a group is limited
+                int i_ray = int(gl_GlobalInvocationID.x);
+                int i_sensor = int(gl_WorkGroupID.y);
+
+                if (i_ray >= MAX_N_RAYS)
+                {
+                    return;
+                }
 
                 // SENSOR PARAMETERS
                 SensorParam s_param = Params.sensor_params[i_sensor];
@@ -103,7 +114,7 @@
                 float angle = in_coord.angle;
 
                 // INVISIBLE POINTS
-                int inv_pts[MAX_N_INVISIBLE] = InvIDs.inv_ids[i_sensor];
+                int inv_offset = i_sensor*n_invisible;
 
                 // CENTER AND END OF RAY
                 vec2 center = vec2(sensor_x_on_view, sensor_y_on_view);
@@ -123,15 +134,18 @@
                     sample_point = ivec2(mix(center, end_pos, ratio));
                     id_color_out = texelFetch(id_texture, sample_point, 0);
 
-                    id_out = int(256*256*id_color_out.z*255 + 256*id_color_out.y*255 + id_color_out.x*255);
+                    // Round each channel before combining them: the float error of a
+                    // channel would otherwise be multiplied by 256*256
+                    ivec3 id_bytes = ivec3(round(id_color_out.xyz*255));
+                    id_out = 256*256*id_bytes.z + 256*id_bytes.y + id_bytes.x;
 
                     if (id_out != 0)
                     {
                         bool invisible = false;
 
-                        for(int ind_inv=0; ind_inv<MAX_N_INVISIBLE; ind_inv++)
+                        for(int ind_inv=0; ind_inv<n_invisible; ind_inv++)
                         {
-                            if (inv_pts[ind_inv] == id_out)
+                            if (InvIDs.inv_ids[inv_offset + ind_inv] == id_out)
                             {
                                 invisible = true;
                                 id_out = 0;
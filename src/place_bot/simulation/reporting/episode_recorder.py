@@ -0,0 +1,350 @@
+"""
+Module that defines EpisodeRecorder, which logs what happens in a playground
+at each timestep into compressed chunks of columnar arrays, and
+EpisodeReplayer, which reads them back without running the simulation.
+"""
+from __future__ import annotations
+
+import json
+import os
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from place_bot.simulation.ray_sensors.lidar import Lidar
+from place_bot.simulation.robot.odometer import Odometer
+
+if TYPE_CHECKING:
+    from place_bot.simulation.elements.entity import Entity
+    from place_bot.simulation.gui_map.playground import Playground
+    from place_bot.simulation.robot.agent import Agent
+
+# Name of the metadata file of an episode directory
+METADATA_FILE = "episode.json"
+
+# Event of an episode: timestep, kind ("added", "removed") and entity name
+Event = Tuple[int, str, str]
+
+
+def _chunk_file(index: int) -> str:
+    return f"chunk_{index:05d}.npz"
+
+
+class EpisodeRecorder:
+    """
+    Records, at each timestep, the commands, true pose, odometer values and
+    lidar distances of the robots of a playground, and the elements added to
+    or removed from it (e.g. a DisappearingWall that disappeared).
+
+    The values are kept in preallocated arrays of chunk_size timesteps, one
+    column per value and robot, written to a compressed .npz file each time
+    they are full. The directory also holds a JSON file describing the
+    robots and the columns. Robots added to the playground after the start
+    of the recording are not recorded.
+
+    Example Usage
+        recorder = playground.start_episode_recording("logs/episode_0001")
+        for _ in range(1000):
+            playground.step(...)
+        playground.stop_episode_recording()
+
+        replayer = EpisodeReplayer("logs/episode_0001")
+        trajectory = replayer.poses(robot=0)
+    """
+
+    def __init__(self, playground: Playground, directory: str, chunk_size: int = 1000):
+        """
+        Initialize the EpisodeRecorder.
+
+        Args:
+            playground (Playground): The playground to record.
+            directory (str): Directory of the episode, created if needed.
+            chunk_size (int): Number of timesteps of a chunk file.
+        """
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be a positive integer")
+
+        os.makedirs(directory, exist_ok=True)
+
+        self._playground = playground
+        self._directory = directory
+        self._chunk_size = chunk_size
+
+        self._agents: List[Agent] = list(playground.agents)
+        self._lidars: List[Optional[Lidar]] = []
+        self._odometers: List[Optional[Odometer]] = []
+
+        robots = []
+        shapes: Dict[str, Tuple[Tuple[int, ...], str]] = {"timestep": ((), "int64")}
+        for index, agent in enumerate(self._agents):
+            lidars = agent.sensors_of_type(Lidar)
+            odometers = agent.sensors_of_type(Odometer)
+            self._lidars.append(lidars[0] if lidars else None)
+            self._odometers.append(odometers[0] if odometers else None)
+
+            shapes[f"pose_{index}"] = ((3,), "float64")
+            shapes[f"command_{index}"] = ((len(agent.controllers),), "float32")
+            if odometers:
+                shapes[f"odometer_{index}"] = ((3,), "float32")
+            if lidars:
+                shapes[f"lidar_{index}"] = ((lidars[0].resolution,), "float32")
+
+            robots.append({
+                "name": agent.name,
+                "controllers": [controller.name for controller in agent.controllers],
+                "lidar_ray_angles": lidars[0].get_ray_angles().tolist() if lidars else None,
+                "lidar_max_range": lidars[0].max_range if lidars else None,
+            })
+
+        self._columns = {name: np.zeros((chunk_size,) + shape, dtype=dtype)
+                         for name, (shape, dtype) in shapes.items()}
+        self._events: List[Event] = []
+
+        self._n_rows = 0
+        self._n_steps = 0
+        self._n_chunks = 0
+        self._closed = False
+
+        self._metadata = {
+            "chunk_size": chunk_size,
+            "robots": robots,
+            "columns": {name: [list(shape), dtype] for name, (shape, dtype) in shapes.items()},
+        }
+        self._write_metadata()
+
+    @property
+    def directory(self) -> str:
+        """
+        Returns the directory of the episode.
+        """
+        return self._directory
+
+    @property
+    def n_steps(self) -> int:
+        """
+        Returns the number of timesteps recorded.
+        """
+        return self._n_steps
+
+    def record_step(self) -> None:
+        """
+        Record the current timestep of the playground, after its observations
+        were computed. Called by Playground.end_step().
+        """
+        row = self._n_rows
+        columns = self._columns
+        columns["timestep"][row] = self._playground.timestep
+
+        for index, agent in enumerate(self._agents):
+            body = agent.base.pm_body
+            columns[f"pose_{index}"][row] = (body.position.x, body.position.y, body.angle)
+            columns[f"command_{index}"][row] = [controller.command for controller in agent.controllers]
+
+            odometer = self._odometers[index]
+            if odometer is not None:
+                values = odometer.get_sensor_values()
+                columns[f"odometer_{index}"][row] = np.nan if values is None else values
+
+            lidar = self._lidars[index]
+            if lidar is not None:
+                values = lidar.get_sensor_values()
+                columns[f"lidar_{index}"][row] = np.nan if values is None else values
+
+        self._n_rows += 1
+        self._n_steps += 1
+        if self._n_rows == self._chunk_size:
+            self.flush()
+
+    def record_event(self, kind: str, entity: Entity) -> None:
+        """
+        Record that an entity was added to or removed from the playground.
+        Called by Playground.add() and Playground.remove().
+
+        Args:
+            kind (str): Kind of event, "added" or "removed".
+            entity (Entity): The entity.
+        """
+        self._events.append((self._playground.timestep, kind, str(entity.name)))
+
+    def flush(self) -> None:
+        """
+        Write the timesteps and events recorded since the last chunk.
+        """
+        if not self._n_rows and not self._events:
+            return
+
+        n_rows = self._n_rows
+        arrays = {name: column[:n_rows] for name, column in self._columns.items()}
+        arrays["event_timestep"] = np.array([event[0] for event in self._events], dtype=np.int64)
+        arrays["event_kind"] = np.array([event[1] for event in self._events], dtype=str)
+        arrays["event_name"] = np.array([event[2] for event in self._events], dtype=str)
+
+        np.savez_compressed(os.path.join(self._directory, _chunk_file(self._n_chunks)), **arrays)
+
+        self._n_chunks += 1
+        self._n_rows = 0
+        self._events = []
+        self._write_metadata()
+
+    def close(self) -> None:
+        """
+        Write the last chunk. Nothing is recorded afterwards.
+        """
+        if self._closed:
+            return
+
+        self.flush()
+        self._closed = True
+
+    def _write_metadata(self) -> None:
+        self._metadata["n_steps"] = self._n_steps - self._n_rows
+        self._metadata["n_chunks"] = self._n_chunks
+        with open(os.path.join(self._directory, METADATA_FILE), "w", encoding="utf-8") as file:
+            json.dump(self._metadata, file)
+
+
+class EpisodeReplayer:
+    """
+    Reads an episode recorded by EpisodeRecorder: the streams of poses,
+    commands and sensor values of the robots and the events, without
+    running the simulation. Chunks are read when needed.
+
+    Example Usage
+        replayer = EpisodeReplayer("logs/episode_0001")
+        poses = replayer.poses(robot=0)
+        points = replayer.lidar_points(robot=0, step=120)
+        for timestep, kind, name in replayer.events:
+            print(timestep, kind, name)
+    """
+
+    def __init__(self, directory: str):
+        """
+        Initialize the EpisodeReplayer.
+
+        Args:
+            directory (str): Directory of the episode.
+        """
+        self._directory = directory
+        with open(os.path.join(directory, METADATA_FILE), encoding="utf-8") as file:
+            self._metadata = json.load(file)
+
+        self._columns: Dict[str, np.ndarray] = {}
+        self._events: Optional[List[Event]] = None
+
+    def __len__(self) -> int:
+        return self._metadata["n_steps"]
+
+    @property
+    def robot_names(self) -> List[str]:
+        """
+        Returns the names of the recorded robots, in the order of their index.
+        """
+        return [robot["name"] for robot in self._metadata["robots"]]
+
+    @property
+    def column_names(self) -> List[str]:
+        """
+        Returns the names of the recorded columns.
+        """
+        return list(self._metadata["columns"])
+
+    def chunks(self) -> Iterator[Dict[str, np.ndarray]]:
+        """
+        Iterate over the chunks of the episode, e.g. to process long episodes
+        without loading them entirely.
+
+        Yields:
+            Dict[str, np.ndarray]: The arrays of a chunk, by column name.
+        """
+        for index in range(self._metadata["n_chunks"]):
+            with np.load(os.path.join(self._directory, _chunk_file(index))) as chunk:
+                yield {name: chunk[name] for name in chunk.files}
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        Returns a column for the whole episode, read once.
+
+        Args:
+            name (str): Name of the column, e.g. "timestep" or "pose_0".
+
+        Returns:
+            np.ndarray: The values (n_steps, ...).
+        """
+        if name not in self._metadata["columns"]:
+            raise KeyError(f"No column {name} in the episode")
+
+        if name not in self._columns:
+            shape, dtype = self._metadata["columns"][name]
+            parts = [chunk[name] for chunk in self.chunks()]
+            self._columns[name] = (np.concatenate(parts) if parts
+                                   else np.zeros([0] + shape, dtype=dtype))
+        return self._columns[name]
+
+    @property
+    def timesteps(self) -> np.ndarray:
+        """
+        Returns the timesteps of the playground (n_steps,).
+        """
+        return self.column("timestep")
+
+    def poses(self, robot: int = 0) -> np.ndarray:
+        """
+        Returns the true poses (x, y, angle) of a robot (n_steps, 3).
+        """
+        return self.column(f"pose_{robot}")
+
+    def commands(self, robot: int = 0) -> np.ndarray:
+        """
+        Returns the commands of a robot (n_steps, n_controllers), in the order
+        of the names of its controllers in the metadata.
+        """
+        return self.column(f"command_{robot}")
+
+    def odometer(self, robot: int = 0) -> np.ndarray:
+        """
+        Returns the odometer values (x, y, orientation) of a robot (n_steps, 3).
+        """
+        return self.column(f"odometer_{robot}")
+
+    def lidar(self, robot: int = 0) -> np.ndarray:
+        """
+        Returns the lidar distances of a robot (n_steps, resolution).
+        """
+        return self.column(f"lidar_{robot}")
+
+    def lidar_points(self, robot: int = 0, step: Optional[int] = None) -> np.ndarray:
+        """
+        Returns the points hit by the lidar of a robot, in the frame of the
+        playground, from its true poses and distances. Points at the maximum
+        range did not hit anything.
+
+        Args:
+            robot (int): Index of the robot.
+            step (Optional[int]): Index of a recorded timestep, all of them if None.
+
+        Returns:
+            np.ndarray: Points (n_steps, resolution, 2), or (resolution, 2) for one timestep.
+        """
+        angles = np.array(self._metadata["robots"][robot]["lidar_ray_angles"])
+        poses = self.poses(robot)
+        distances = self.lidar(robot)
+        if step is not None:
+            poses, distances = poses[step:step + 1], distances[step:step + 1]
+
+        directions = poses[:, 2:3] + angles
+        points = np.stack([poses[:, 0:1] + distances * np.cos(directions),
+                           poses[:, 1:2] + distances * np.sin(directions)], axis=-1)
+        return points[0] if step is not None else points
+
+    @property
+    def events(self) -> List[Event]:
+        """
+        Returns the events of the episode: (timestep, kind, entity name).
+        """
+        if self._events is None:
+            self._events = []
+            for chunk in self.chunks():
+                self._events.extend(
+                    (int(timestep), str(kind), str(name)) for timestep, kind, name
+                    in zip(chunk["event_timestep"], chunk["event_kind"], chunk["event_name"]))
+        return self._events
@@ -8,6 +8,8 @@ body parts, sensors and corresponding Keyboard controllers.
 """
 from __future__ import annotations
 
+from typing import Dict, List, Optional, Type, TypeVar
+
 from place_bot.simulation.robot.controller import Controller, CommandsDict
 from place_bot.simulation.robot.robot_base import RobotBase
 from place_bot.simulation.ray_sensors.external_sensor import ExternalSensor
@@ -17,6 +19,8 @@ from place_bot.simulation.elements.entity import Entity
 
 _BORDER_IMAGE = 3
 
+SensorT = TypeVar("SensorT", bound=Sensor)
+
 
 class Agent(Entity):
     """
@@ -38,6 +42,8 @@ class Agent(Entity):
 
     _index_agent: int = 0
 
+    _snapshot_attributes = ("_reward",)
+
     def __init__(
             self,
             **kwargs,
@@ -53,6 +59,14 @@ class Agent(Entity):
         # Body parts
         self._base: RobotBase | None = None
 
+        # Registries of the devices of the base, built on first use and
+        # invalidated when a device is added
+        self._sensors: Optional[List[Sensor]] = None
+        self._external_sensors: Optional[List[ExternalSensor]] = None
+        self._controllers: Optional[List[Controller]] = None
+        self._name_to_controllers: Optional[Dict[str, Controller]] = None
+        self._sensors_by_type: Dict[type, List[Sensor]] = {}
+
         # Reward
         self._reward: float = 0
 
@@ -68,6 +82,7 @@ class Agent(Entity):
         """
         base.agent = self
         self._base = base
+        self.invalidate_devices()
 
     ################
     # Properties
@@ -123,33 +138,73 @@ class Agent(Entity):
             if isinstance(sens, Sensor)
         }
 
+    def invalidate_devices(self) -> None:
+        """
+        Clear the registries of the devices, e.g. after a device was added to the base.
+        """
+        self._sensors = None
+        self._external_sensors = None
+        self._controllers = None
+        self._name_to_controllers = None
+        self._sensors_by_type = {}
+
+    def _build_registries(self) -> None:
+        """
+        Sort the devices of the base into the registries.
+        """
+        devices = self.base.devices if self.base else []
+        self._sensors = [device for device in devices if isinstance(device, Sensor)]
+        self._external_sensors = [sensor for sensor in self._sensors
+                                  if isinstance(sensor, ExternalSensor)]
+        self._controllers = [device for device in devices if isinstance(device, Controller)]
+        self._name_to_controllers = {contr.name: contr for contr in self._controllers}
+
     @property
     def controllers(self) -> list[Controller]:
-        """Return a list of controllers attached to the agent."""
-        return [
-            contr
-            for contr in self.base.devices
-            if isinstance(contr, Controller)
-        ]
+        """Return the cached list of controllers attached to the agent."""
+        if self._controllers is None:
+            self._build_registries()
+        return self._controllers
 
     @property
     def _name_to_controller(self) -> dict:
-        """Return a mapping from controller names to controller objects."""
-        return {contr.name: contr for contr in self.controllers}
+        """Return the cached mapping from controller names to controller objects."""
+        if self._name_to_controllers is None:
+            self._build_registries()
+        return self._name_to_controllers
 
     @property
     def sensors(self) -> list[Sensor]:
-        """Return a list of sensors attached to the agent."""
-        return [
-            sensor
-            for sensor in self.base.devices
-            if isinstance(sensor, Sensor)
-        ]
+        """
+        Return the cached list of sensors attached to the agent, in the order
+        they were added. It must not be modified.
+        """
+        if self._sensors is None:
+            self._build_registries()
+        return self._sensors
 
     @property
     def external_sensors(self) -> list[ExternalSensor]:
-        """Return a list of external sensors attached to the agent."""
-        return [sensor for sensor in self.sensors if isinstance(sensor, ExternalSensor)]
+        """Return the cached list of external sensors attached to the agent."""
+        if self._external_sensors is None:
+            self._build_registries()
+        return self._external_sensors
+
+    def sensors_of_type(self, sensor_type: Type[SensorT]) -> List[SensorT]:
+        """
+        Return the cached list of the sensors of a type attached to the agent.
+
+        Args:
+            sensor_type (Type[SensorT]): Type of the sensors, e.g. Lidar.
+
+        Returns:
+            List[SensorT]: The sensors, in the order they were added.
+        """
+        sensors = self._sensors_by_type.get(sensor_type)
+        if sensors is None:
+            sensors = [sensor for sensor in self.sensors if isinstance(sensor, sensor_type)]
+            self._sensors_by_type[sensor_type] = sensors
+        return sensors
 
     def compute_observations(self) -> None:
         """Update all sensors' values."""
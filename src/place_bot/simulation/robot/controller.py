@@ -22,6 +22,8 @@ class Controller(PocketDevice):
         - interactive actions (eat, grasp, ...)
     """
 
+    _snapshot_attributes = PocketDevice._snapshot_attributes + ("_command", "_currently_disabled")
+
     def __init__(self, name: str, hard_check: bool = True, **_):
         """
         Initialize the controller.
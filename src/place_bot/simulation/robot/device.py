@@ -9,6 +9,8 @@ class Device(InteractiveAnchored):
     Base class for all devices attached to robot parts.
     """
 
+    _snapshot_attributes = ("_disabled",)
+
     def __init__(
             self,
             **kwargs,
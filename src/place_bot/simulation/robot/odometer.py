@@ -5,6 +5,7 @@ import numpy as np
 
 from place_bot.simulation.robot.sensor import Sensor
 from place_bot.simulation.utils.utils import rad2deg, normalize_angle
+from place_bot.simulation.utils.utils_noise import StandardNormalBlocks
 
 
 class OdometerParams:
@@ -52,6 +53,9 @@ class Odometer(Sensor):
     calculations of the noise...
     """
 
+    _snapshot_attributes = Sensor._snapshot_attributes + (
+        "_dist", "_alpha", "_theta", "prev_angle", "prev_position", "_noise_blocks")
+
     def __init__(self, odometer_params: OdometerParams = OdometerParams(), **kwargs):
         """
         Initialize the Odometer sensor instance.
@@ -75,6 +79,45 @@ class Odometer(Sensor):
         self.prev_angle = None
         self.prev_position = None
 
+        # Standard normal values for (alpha, dist, theta), drawn by blocks
+        self._noise_blocks = StandardNormalBlocks(shape=(3,))
+
+        # Whether the values are computed by the OdometerCompute of the playground
+        self._batched = False
+
+    @property
+    def batched(self) -> bool:
+        """
+        Returns whether the values are computed by the OdometerCompute of the
+        playground, together with the other odometers, instead of by the sensor.
+        """
+        return self._batched
+
+    @batched.setter
+    def batched(self, batched: bool) -> None:
+        """
+        Set whether the values are computed by the OdometerCompute of the playground.
+        """
+        self._batched = batched
+
+    @property
+    def noise_enabled(self) -> bool:
+        """
+        Returns whether noise is added to the displacements.
+        """
+        return self._noise
+
+    def set_batched_values(self, values: np.ndarray, displacement: np.ndarray) -> None:
+        """
+        Set the values computed by the OdometerCompute of the playground.
+
+        Args:
+            values (np.ndarray): Integrated position estimate (x, y, orientation).
+            displacement (np.ndarray): Noisy displacement (dist, alpha, theta) of the last timestep.
+        """
+        self._values = values
+        self._dist, self._alpha, self._theta = displacement.tolist()
+
     def _compute_raw_sensor(self) -> None:
         """
         Compute the raw displacement values and integrate them to update position estimate.
@@ -91,7 +134,13 @@ class Odometer(Sensor):
 
         These raw values are NOT returned by get_sensor_values(). They are used
         internally for integration to compute the cumulative position estimate.
+
+        Nothing is done for the odometers of a playground, which are all updated
+        at once by its OdometerCompute.
         """
+        if self._batched:
+            return
+
         # DIST_TRAVEL
         if self.prev_position is None:
             self.prev_position = self._anchor.position
@@ -216,9 +265,13 @@ class Odometer(Sensor):
         sd_trans = self.param1 * self._dist + self.param2 * rad2deg(abs(self._theta))
         sd_rot = self.param3 * self._dist + self.param4 * rad2deg(abs(self._theta))
 
-        noisy_alpha = self._alpha + np.random.normal(0, sd_rot * sd_rot)
-        noisy_dist_travel = self._dist + np.random.normal(0, sd_trans * sd_trans)
-        noisy_theta = self._theta + np.random.normal(0, sd_rot * sd_rot)
+        if self._noise_blocks.rng is None:
+            self._noise_blocks.rng = self.noise_rng
+        noise_alpha, noise_dist, noise_theta = self._noise_blocks.next()
+
+        noisy_alpha = self._alpha + noise_alpha * sd_rot * sd_rot
+        noisy_dist_travel = self._dist + noise_dist * sd_trans * sd_trans
+        noisy_theta = self._theta + noise_theta * sd_rot * sd_rot
 
         self._dist = noisy_dist_travel
         self._alpha = noisy_alpha
@@ -0,0 +1,399 @@
+"""
+Module that defines OdometerCompute, which updates all the odometers of a
+playground at once, and the functions to replay their displacement logs.
+"""
+from __future__ import annotations
+
+import copy
+from typing import Any, BinaryIO, Dict, List, Optional, Union
+
+import numpy as np
+
+from place_bot.simulation.robot.odometer import Odometer, OdometerParams
+from place_bot.simulation.utils.utils import normalize_angle
+from place_bot.simulation.utils.utils_noise import StandardNormalBlocks
+
+# Header of the displacement logs, followed by the number of odometers (uint32)
+LOG_MAGIC = b"PBODOM01"
+
+
+def odometer_params_array(odometer_params: Union[OdometerParams, Odometer]) -> np.ndarray:
+    """
+    Returns the parameters of the noise model of the odometer as an array.
+
+    Args:
+        odometer_params (Union[OdometerParams, Odometer]): Parameters of the
+            odometer, or the odometer itself.
+
+    Returns:
+        np.ndarray: (param1, param2, param3, param4).
+    """
+    return np.array([odometer_params.param1, odometer_params.param2,
+                     odometer_params.param3, odometer_params.param4])
+
+
+def odometer_displacements(previous_poses: np.ndarray, poses: np.ndarray) -> np.ndarray:
+    """
+    Compute the displacements of odometers between two poses of their anchors.
+
+    Args:
+        previous_poses (np.ndarray): Previous poses (n, 3), as (x, y, angle).
+        poses (np.ndarray): Current poses (n, 3).
+
+    Returns:
+        np.ndarray: Displacements (n, 3), as (dist, alpha, theta): distance
+            traveled, angle of the travel in the previous frame and rotation.
+    """
+    travel = poses[:, :2] - previous_poses[:, :2]
+    dist = np.hypot(travel[:, 0], travel[:, 1])
+
+    alpha = np.arctan2(travel[:, 1], travel[:, 0]) - previous_poses[:, 2]
+    alpha[dist < 1e-5] = 0
+
+    displacements = np.empty_like(poses)
+    displacements[:, 0] = dist
+    displacements[:, 1] = normalize_angle(alpha)
+    displacements[:, 2] = normalize_angle(poses[:, 2] - previous_poses[:, 2])
+    return displacements
+
+
+def apply_odometer_noise(displacements: np.ndarray, params: np.ndarray,
+                         samples: np.ndarray) -> np.ndarray:
+    """
+    Add the noise of the odometer model to displacements.
+
+    Args:
+        displacements (np.ndarray): Displacements (n, 3), as (dist, alpha, theta).
+        params (np.ndarray): Parameters (n, 4) or (4,) of the noise model.
+        samples (np.ndarray): Standard normal samples (n, 3), for (alpha, dist, theta).
+
+    Returns:
+        np.ndarray: The noisy displacements (n, 3).
+    """
+    params = np.atleast_2d(params)
+    dist = displacements[:, 0]
+    theta_deg = np.degrees(np.abs(displacements[:, 2]))
+
+    sd_trans = params[:, 0] * dist + params[:, 1] * theta_deg
+    sd_rot = params[:, 2] * dist + params[:, 3] * theta_deg
+
+    noisy = displacements.copy()
+    noisy[:, 0] += samples[:, 1] * sd_trans * sd_trans
+    noisy[:, 1] += samples[:, 0] * sd_rot * sd_rot
+    noisy[:, 2] += samples[:, 2] * sd_rot * sd_rot
+    return noisy
+
+
+def integrate_odometer(values: np.ndarray, displacements: np.ndarray) -> None:
+    """
+    Integrate displacements into the estimated poses of odometers, in place.
+
+    Args:
+        values (np.ndarray): Estimated poses (n, 3), as (x, y, orientation).
+        displacements (np.ndarray): Displacements (n, 3), as (dist, alpha, theta).
+    """
+    direction = displacements[:, 1] + values[:, 2]
+    values[:, 0] += displacements[:, 0] * np.cos(direction)
+    values[:, 1] += displacements[:, 0] * np.sin(direction)
+    values[:, 2] = normalize_angle(values[:, 2] + displacements[:, 2])
+
+
+class OdometerCompute:
+    """
+    Updates all the odometers of a playground at once: displacement, noise and
+    integration are computed on (n_odometers, 3) arrays instead of per sensor.
+
+    The noise-free displacements can be recorded in a binary log, to integrate
+    them again later with other parameters of the noise model, without running
+    the physics again (see read_displacement_log and reintegrate_displacements).
+
+    Example Usage
+        playground.odometer_compute.start_recording("odometry.bin")
+        for _ in range(1000):
+            playground.step(...)
+        playground.odometer_compute.stop_recording()
+
+        displacements = read_displacement_log("odometry.bin")
+        poses = reintegrate_displacements(displacements, other_params)
+    """
+
+    def __init__(self, rng: Optional[np.random.Generator] = None):
+        """
+        Initialize the OdometerCompute.
+
+        Args:
+            rng (Optional[np.random.Generator]): Random generator of the noise.
+        """
+        self._rng = rng
+        self._odometers: List[Odometer] = []
+
+        self._previous_poses = np.zeros((0, 3))
+        self._has_previous = np.zeros(0, dtype=bool)
+        self._values = np.zeros((0, 3))
+        self._params = np.zeros((0, 4))
+        self._noise = np.zeros(0, dtype=bool)
+        self._noise_blocks: Optional[StandardNormalBlocks] = None
+
+        self._log: Optional[BinaryIO] = None
+
+    @property
+    def odometers(self) -> List[Odometer]:
+        """
+        Returns the odometers updated by the engine, in the order of the logs.
+        """
+        return self._odometers
+
+    @property
+    def recording(self) -> bool:
+        """
+        Returns whether the displacements are being recorded.
+        """
+        return self._log is not None
+
+    def add(self, odometer: Odometer) -> None:
+        """
+        Add an odometer to the engine. The odometer no longer computes its values itself.
+
+        Args:
+            odometer (Odometer): The odometer.
+
+        Raises:
+            ValueError: If the displacements are being recorded.
+        """
+        if odometer in self._odometers:
+            return
+
+        if self.recording:
+            raise ValueError("Odometers cannot be added while recording")
+
+        self._odometers.append(odometer)
+        odometer.batched = True
+
+        self._previous_poses = np.vstack([self._previous_poses, np.zeros((1, 3))])
+        self._has_previous = np.append(self._has_previous, False)
+        values = odometer.get_sensor_values()
+        self._values = np.vstack([self._values, np.zeros(3) if values is None else values])
+        self._params = np.vstack([self._params, odometer_params_array(odometer)])
+        self._noise = np.append(self._noise, odometer.noise_enabled)
+
+        # The samples of the noise are drawn for all the odometers at once
+        self._noise_blocks = StandardNormalBlocks(shape=(len(self._odometers), 3), rng=self._rng)
+
+    def remove(self, odometer: Odometer) -> None:
+        """
+        Remove an odometer from the engine, e.g. when its robot is removed
+        definitively from the playground. The odometer computes its values
+        itself again.
+
+        Args:
+            odometer (Odometer): The odometer.
+
+        Raises:
+            ValueError: If the displacements are being recorded.
+        """
+        if odometer not in self._odometers:
+            return
+
+        if self.recording:
+            raise ValueError("Odometers cannot be removed while recording")
+
+        index = self._odometers.index(odometer)
+        self._odometers.pop(index)
+        odometer.batched = False
+
+        self._previous_poses = np.delete(self._previous_poses, index, axis=0)
+        self._has_previous = np.delete(self._has_previous, index)
+        self._values = np.delete(self._values, index, axis=0)
+        self._params = np.delete(self._params, index, axis=0)
+        self._noise = np.delete(self._noise, index)
+
+        self._noise_blocks = StandardNormalBlocks(shape=(len(self._odometers), 3), rng=self._rng)
+
+    def update_sensors(self) -> None:
+        """
+        Update the values of all the odometers. Disabled odometers are reset to
+        their default value, and odometers removed from the playground are frozen.
+        """
+        n_odometers = len(self._odometers)
+        if not n_odometers:
+            return
+
+        anchors = [odometer.anchor for odometer in self._odometers]
+        poses = np.array([(anchor.position[0], anchor.position[1], anchor.angle)
+                          for anchor in anchors])
+        disabled = np.fromiter((odometer.is_disabled() for odometer in self._odometers),
+                               dtype=bool, count=n_odometers)
+        removed = np.fromiter((odometer.removed for odometer in self._odometers),
+                              dtype=bool, count=n_odometers)
+        active = ~disabled & ~removed
+
+        first = active & ~self._has_previous
+        self._previous_poses[first] = poses[first]
+        self._has_previous |= active
+
+        displacements = odometer_displacements(self._previous_poses, poses)
+        displacements[~active] = 0
+
+        if self._log is not None:
+            raw = displacements.astype(np.float32)
+            raw[disabled] = np.nan
+            self._log.write(raw.tobytes())
+
+        samples = self._noise_blocks.next()
+        noisy = np.where(self._noise[:, np.newaxis],
+                         apply_odometer_noise(displacements, self._params, samples),
+                         displacements)
+
+        integrate_odometer(self._values, noisy)
+        self._values[disabled] = 0
+        self._previous_poses[active] = poses[active]
+
+        # A new array at each step, so that the values given to the robots
+        # before are not modified
+        values = self._values.copy()
+        for index, odometer in enumerate(self._odometers):
+            if active[index]:
+                odometer.set_batched_values(values[index], noisy[index])
+
+    def get_state(self) -> Dict[str, Any]:
+        """
+        Returns a copy of the state of the engine that changes during an
+        episode, for Playground.snapshot(). The rows of the odometers are
+        identified by the uids of the odometers.
+
+        Returns:
+            Dict[str, Any]: Previous poses, integrated values and random state.
+        """
+        return copy.deepcopy({
+            "uids": [int(odometer.uid) for odometer in self._odometers],
+            "previous_poses": self._previous_poses,
+            "has_previous": self._has_previous,
+            "values": self._values,
+            "rng": self._rng,
+            "noise_blocks": self._noise_blocks,
+        })
+
+    def set_state(self, state: Dict[str, Any]) -> None:
+        """
+        Restore a state returned by get_state(). The state is copied, so that
+        it can be restored again. The odometers take the order they had when
+        the state was taken, so that they draw the same noise.
+
+        Args:
+            state (Dict[str, Any]): The state.
+
+        Raises:
+            ValueError: If the odometers of the engine are not the ones of the
+                state, or have to be reordered while recording.
+        """
+        odometers = {int(odometer.uid): odometer for odometer in self._odometers}
+        if sorted(odometers) != sorted(state["uids"]):
+            raise ValueError(f"State of the odometers {state['uids']} cannot be restored "
+                             f"with the odometers {list(odometers)}")
+
+        if self.recording and list(odometers) != state["uids"]:
+            raise ValueError("The odometers cannot be reordered while recording")
+
+        state = copy.deepcopy(state)
+        self._odometers = [odometers[uid] for uid in state["uids"]]
+        self._params = np.array([odometer_params_array(odometer) for odometer in self._odometers]
+                                ).reshape(-1, 4)
+        self._noise = np.array([odometer.noise_enabled for odometer in self._odometers], dtype=bool)
+        self._previous_poses = state["previous_poses"]
+        self._has_previous = state["has_previous"]
+        self._values = state["values"]
+        self._rng = state["rng"]
+        self._noise_blocks = state["noise_blocks"]
+
+    def start_recording(self, file_path: str) -> None:
+        """
+        Start recording the noise-free displacements of the odometers.
+
+        The log starts with LOG_MAGIC and the number of odometers (uint32), then
+        holds one (n_odometers, 3) float32 array of (dist, alpha, theta) per
+        timestep. Rows of disabled odometers are NaN.
+
+        Args:
+            file_path (str): Path of the log.
+        """
+        self.stop_recording()
+
+        self._log = open(file_path, "wb")  # pylint: disable=consider-using-with
+        self._log.write(LOG_MAGIC)
+        self._log.write(np.uint32(len(self._odometers)).tobytes())
+
+    def stop_recording(self) -> None:
+        """
+        Stop recording and close the log.
+        """
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+
+
+def read_displacement_log(file_path: str) -> np.ndarray:
+    """
+    Read a log of displacements recorded by OdometerCompute.
+
+    Args:
+        file_path (str): Path of the log.
+
+    Returns:
+        np.ndarray: Displacements (n_steps, n_odometers, 3), as (dist, alpha, theta).
+
+    Raises:
+        ValueError: If the file is not a displacement log.
+    """
+    with open(file_path, "rb") as file:
+        if file.read(len(LOG_MAGIC)) != LOG_MAGIC:
+            raise ValueError(f"{file_path} is not an odometer displacement log")
+        n_odometers = int(np.frombuffer(file.read(4), dtype=np.uint32)[0])
+        data = np.frombuffer(file.read(), dtype=np.float32)
+
+    return data.reshape(-1, n_odometers, 3).astype(float)
+
+
+def reintegrate_displacements(
+        displacements: np.ndarray,
+        odometer_params: Optional[OdometerParams] = None,
+        rng: Optional[np.random.Generator] = None,
+        noise: bool = True,
+) -> np.ndarray:
+    """
+    Integrate recorded displacements again, with other parameters of the noise model.
+
+    Args:
+        displacements (np.ndarray): Displacements (n_steps, n_odometers, 3).
+        odometer_params (Optional[OdometerParams]): Parameters of the noise model,
+            by default OdometerParams().
+        rng (Optional[np.random.Generator]): Random generator of the noise.
+        noise (bool): Whether to add noise to the displacements.
+
+    Returns:
+        np.ndarray: Estimated poses (n_steps + 1, n_odometers, 3), starting at zero.
+    """
+    if odometer_params is None:
+        odometer_params = OdometerParams()
+    if rng is None:
+        rng = np.random.default_rng()
+
+    n_steps, n_odometers, _ = displacements.shape
+    params = odometer_params_array(odometer_params)
+
+    poses = np.zeros((n_steps + 1, n_odometers, 3))
+    values = np.zeros((n_odometers, 3))
+    samples = rng.standard_normal((n_steps, n_odometers, 3)) if noise else None
+
+    for step in range(n_steps):
+        step_displacements = displacements[step]
+        disabled = np.isnan(step_displacements[:, 0])
+        step_displacements = np.nan_to_num(step_displacements)
+
+        if noise:
+            step_displacements = apply_odometer_noise(step_displacements, params, samples[step])
+
+        integrate_odometer(values, step_displacements)
+        values[disabled] = 0
+        poses[step + 1] = values
+
+    return poses
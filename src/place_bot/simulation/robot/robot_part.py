@@ -79,6 +79,10 @@ class RobotPart(PhysicalEntity, ABC):
         else:
             raise ValueError("Not implemented")
 
+        # The agent keeps registries of the devices of its base
+        if self._agent:
+            self._agent.invalidate_devices()
+
     def move_to(  # pylint: disable=arguments-differ
             self,
             coordinates: Coordinate,
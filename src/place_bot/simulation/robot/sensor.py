@@ -10,6 +10,7 @@ from typing import List, Optional, Union, Any
 import numpy as np
 
 from place_bot.simulation.robot.pocket_device import PocketDevice
+from place_bot.simulation.utils.profiler import PROFILER
 
 SensorValue = Union[np.ndarray, List[np.ndarray]]
 
@@ -30,6 +31,10 @@ class Sensor(PocketDevice):
 
     """
 
+    # Subclasses add the attributes of their noise models, e.g. the
+    # _last_noise of an AutoregressiveModelNoise
+    _snapshot_attributes = PocketDevice._snapshot_attributes + ("_values", "_noise_rng")
+
     def __init__(
             self,
             normalize: Optional[bool] = False,
@@ -62,6 +67,22 @@ class Sensor(PocketDevice):
         self._normalize = normalize
 
         self._noise = False
+        self._noise_rng: Optional[np.random.Generator] = None
+
+    @property
+    def noise_rng(self) -> np.random.Generator:
+        """
+        Returns the random generator of the noise of the sensor. It is spawned
+        from the generator of the playground on first use, so that the noise is
+        reproducible for a given seed of the playground.
+        """
+        if self._noise_rng is None:
+            if self._playground:
+                self._noise_rng = self._playground.spawn_rng()
+            else:
+                self._noise_rng = np.random.default_rng()
+
+        return self._noise_rng
 
     def update(self) -> None:
         """
@@ -74,7 +95,8 @@ class Sensor(PocketDevice):
             self._compute_raw_sensor()
 
             if self._noise:
-                self._apply_noise()
+                with PROFILER.phase("sensor_noise"):
+                    self._apply_noise()
 
             if self._normalize:
                 self._apply_normalization()
@@ -1,6 +1,9 @@
+from typing import Optional
+
 import numpy as np
 
 from place_bot.simulation.utils.pose import Pose
+from place_bot.simulation.utils.trajectory import Trajectory
 
 
 class Path:
@@ -8,14 +11,17 @@ class Path:
     Represents a path as a sequence of poses.
 
     Attributes:
-        _poses (np.ndarray): Array of poses (x, y, orientation).
+        _poses (Trajectory): Store of the poses (x, y, orientation).
     """
 
-    def __init__(self) -> None:
+    def __init__(self, max_length: Optional[int] = None) -> None:
         """
         Initialize an empty path.
+
+        Args:
+            max_length (Optional[int]): If given, only the last max_length poses are kept.
         """
-        self._poses = np.zeros((0, 3))
+        self._poses = Trajectory(max_length=max_length)
 
     def append(self, pose: Pose) -> None:
         """
@@ -24,8 +30,15 @@ class Path:
         Args:
             pose (Pose): The pose to append.
         """
-        my_array_pose = [[pose.position[0], pose.position[1], pose.orientation]]
-        self._poses = np.append(self._poses, my_array_pose, axis=0)
+        self._poses.append((pose.position[0], pose.position[1], pose.orientation))
+
+    @property
+    def poses(self) -> np.ndarray:
+        """
+        Returns the poses as a (n, 3) array of (x, y, orientation). It is a view,
+        valid until the next append.
+        """
+        return self._poses.array
 
     def length(self) -> int:
         """
@@ -34,7 +47,7 @@ class Path:
         Returns:
             int: Number of poses.
         """
-        return int(self._poses.shape[0])
+        return len(self._poses)
 
     def get(self, index: int) -> Pose:
         """
@@ -44,15 +57,15 @@ class Path:
             index (int): Index of the pose.
 
         Returns:
-            Pose: The pose at the index.
+            Pose: The pose at the index, independent of the storage of the path.
         """
         v = self._poses[index]
-        pose = Pose(v[0:2], float(v[2]))
+        pose = Pose(v[0:2].copy(), float(v[2]))
         return pose
 
     def reset(self) -> None:
         """
         Reset the path to be empty.
         """
-        self._poses = np.zeros((0, 3))
+        self._poses.clear()
 
@@ -0,0 +1,285 @@
+"""
+Module that defines the step profiler, which measures where the time of a
+simulation step goes.
+"""
+import json
+import math
+from time import perf_counter
+from typing import Dict, List, Optional
+
+
+class PhaseStats:
+    """
+    Wall-clock statistics of one phase of the step, with a histogram of the
+    durations on logarithmic bins (10 bins per decade, from 1 µs to 100 s).
+    """
+
+    BINS_PER_DECADE = 10
+    MIN_EXPONENT = -6
+    N_BINS = 8 * BINS_PER_DECADE
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+        self.histogram = [0] * self.N_BINS
+
+    def add(self, duration: float) -> None:
+        """
+        Add a duration to the statistics.
+
+        Args:
+            duration (float): Duration in seconds.
+        """
+        self.count += 1
+        self.total += duration
+        self.min = min(self.min, duration)
+        self.max = max(self.max, duration)
+
+        if duration > 0:
+            index = int((math.log10(duration) - self.MIN_EXPONENT) * self.BINS_PER_DECADE)
+        else:
+            index = 0
+        self.histogram[min(max(index, 0), self.N_BINS - 1)] += 1
+
+    @property
+    def mean(self) -> float:
+        """
+        Returns the mean duration, in seconds.
+        """
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, q: float) -> float:
+        """
+        Returns an approximation of a percentile of the durations, from the
+        upper edge of the histogram bin that contains it.
+
+        Args:
+            q (float): Percentile, between 0 and 100.
+
+        Returns:
+            float: The duration, in seconds.
+        """
+        if not self.count:
+            return 0.0
+
+        threshold = q / 100 * self.count
+        cumulated = 0
+        for index, n in enumerate(self.histogram):
+            cumulated += n
+            if cumulated >= threshold:
+                upper = 10 ** (self.MIN_EXPONENT + (index + 1) / self.BINS_PER_DECADE)
+                return min(upper, self.max)
+
+        return self.max
+
+    def to_dict(self) -> Dict:
+        """
+        Returns the statistics as a dictionary that can be serialized in JSON.
+        """
+        return {
+            "count": self.count,
+            "total": self.total,
+            "mean": self.mean,
+            "min": self.min if self.count else 0.0,
+            "max": self.max,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "histogram": {
+                "bins_per_decade": self.BINS_PER_DECADE,
+                "min_exponent": self.MIN_EXPONENT,
+                "counts": list(self.histogram),
+            },
+        }
+
+
+class _Phase:
+    """
+    Context manager measuring the duration of one phase.
+    """
+
+    __slots__ = ("_stats", "_start")
+
+    def __init__(self, stats: PhaseStats):
+        self._stats = stats
+        self._start = 0.0
+
+    def __enter__(self):
+        self._start = perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._stats.add(perf_counter() - self._start)
+        return False
+
+
+class _NullPhase:
+    """
+    Context manager doing nothing, used when the profiler is disabled.
+    """
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_PHASE = _NullPhase()
+
+
+class StepProfiler:
+    """
+    Collects the wall-clock duration of the phases of the simulation step,
+    and counters of events such as sprite updates or shader compilations.
+
+    The profiler is disabled by default. When disabled, phase() returns a
+    shared context manager that does nothing and count() returns immediately,
+    so the instrumentation costs a function call per phase.
+
+    Phases measured by place_bot: "pre_step", "commands", "physics", "render"
+    (ID framebuffer), "shader_dispatch", "readback" (GPU to CPU), "ray_cpu",
+    "ray_analytic", "odometer" (all the odometers of a playground), "sensors"
+    (sensor values), "sensor_noise", "post_step"
+    and "control" (call of the control() function of the robot).
+
+    Counters: "steps", "sprite_updates" and "shader_compilations".
+
+    Example Usage
+        PROFILER.enable()
+        for _ in range(1000):
+            playground.step(...)
+        PROFILER.print_summary()
+        PROFILER.dump_json("profile.json")
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._phases: Dict[str, PhaseStats] = {}
+        self._counters: Dict[str, int] = {}
+
+    def enable(self) -> None:
+        """
+        Start collecting statistics.
+        """
+        self.enabled = True
+
+    def disable(self) -> None:
+        """
+        Stop collecting statistics. The collected statistics are kept.
+        """
+        self.enabled = False
+
+    def reset(self) -> None:
+        """
+        Remove all the collected statistics.
+        """
+        self._phases.clear()
+        self._counters.clear()
+
+    def phase(self, name: str):
+        """
+        Returns a context manager measuring the duration of a phase.
+
+        Args:
+            name (str): Name of the phase.
+        """
+        if not self.enabled:
+            return _NULL_PHASE
+
+        stats = self._phases.get(name)
+        if stats is None:
+            stats = self._phases[name] = PhaseStats()
+
+        return _Phase(stats)
+
+    def count(self, name: str, n: int = 1) -> None:
+        """
+        Increment a counter.
+
+        Args:
+            name (str): Name of the counter.
+            n (int): Increment.
+        """
+        if not self.enabled:
+            return
+
+        self._counters[name] = self._counters.get(name, 0) + n
+
+    @property
+    def phases(self) -> Dict[str, PhaseStats]:
+        """
+        Returns the statistics of each phase.
+        """
+        return self._phases
+
+    @property
+    def counters(self) -> Dict[str, int]:
+        """
+        Returns the value of each counter.
+        """
+        return self._counters
+
+    def to_dict(self) -> Dict:
+        """
+        Returns all the statistics as a dictionary that can be serialized in JSON.
+        """
+        return {
+            "phases": {name: stats.to_dict() for name, stats in self._phases.items()},
+            "counters": dict(self._counters),
+        }
+
+    def dump_json(self, file_path: Optional[str] = None) -> str:
+        """
+        Serialize all the statistics in JSON.
+
+        Args:
+            file_path (Optional[str]): If given, the JSON is also written in this file.
+
+        Returns:
+            str: The JSON string.
+        """
+        text = json.dumps(self.to_dict(), indent=2)
+
+        if file_path:
+            with open(file_path, "w", encoding="utf-8") as file:
+                file.write(text)
+
+        return text
+
+    def summary(self) -> str:
+        """
+        Returns a table summarizing the statistics, with the durations in ms.
+        """
+        n_steps = self._counters.get("steps", 0)
+
+        lines: List[str] = [
+            f"{'phase':<16}{'count':>8}{'total':>10}{'mean':>9}{'p50':>9}"
+            f"{'p95':>9}{'max':>9}{'per step':>10}"
+        ]
+        for name, stats in sorted(self._phases.items(), key=lambda item: -item[1].total):
+            per_step = 1000 * stats.total / n_steps if n_steps else math.nan
+            lines.append(
+                f"{name:<16}{stats.count:>8}{1000 * stats.total:>10.1f}"
+                f"{1000 * stats.mean:>9.3f}{1000 * stats.percentile(50):>9.3f}"
+                f"{1000 * stats.percentile(95):>9.3f}{1000 * stats.max:>9.3f}"
+                f"{per_step:>10.3f}"
+            )
+
+        for name, value in sorted(self._counters.items()):
+            lines.append(f"{name:<16}{value:>8}")
+
+        return "\n".join(lines)
+
+    def print_summary(self) -> None:
+        """
+        Print the table summarizing the statistics.
+        """
+        print(self.summary())
+
+
+# Profiler shared by all the playgrounds of the process
+PROFILER = StepProfiler()
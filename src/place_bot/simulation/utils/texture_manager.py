@@ -0,0 +1,184 @@
+"""
+Module that defines TextureManager, an in-process cache of the textures
+generated for the entities.
+"""
+from typing import Dict, Tuple
+
+import arcade
+import numpy as np
+from PIL import Image
+
+# Number of different crops of a texture file used for the walls of a given size
+N_TEXTURE_VARIANTS = 4
+
+
+class TextureManager:
+    """
+    Cache of the textures generated for the entities, shared by all the
+    playgrounds of the process.
+
+    Walls and boxes share their textures: solid-color textures are cached by
+    (size, color), and crops of a texture file by (file, size, variant), the
+    file being decoded only once. Mask textures (the shape of a texture in
+    white) let the ID views tint one texture per shape with the color
+    encoding the UID of each entity, instead of painting one texture per
+    entity. Since all the sprite lists of a GL context pack their textures
+    into the same atlas, identical walls then take a single region of the
+    atlas.
+
+    Example Usage
+        texture = TEXTURE_MANAGER.solid_texture((120, 6), (128, 128, 128))
+        mask = TEXTURE_MANAGER.mask_texture(texture)
+    """
+
+    def __init__(self):
+        """
+        Initialize the TextureManager.
+        """
+        self._solid_textures: Dict[Tuple, arcade.Texture] = {}
+        self._crop_textures: Dict[Tuple, arcade.Texture] = {}
+        self._mask_textures: Dict[str, arcade.Texture] = {}
+        self._images: Dict[str, Image.Image] = {}
+
+    def solid_texture(self, size: Tuple[int, int], color: Tuple[int, ...]) -> arcade.Texture:
+        """
+        Returns a texture filled with a color, shared by all the callers asking
+        for the same size and color.
+
+        Args:
+            size (Tuple[int, int]): Width and height of the texture, in pixels.
+            color (Tuple[int, ...]): RGB or RGBA color.
+
+        Returns:
+            arcade.Texture: The texture.
+        """
+        size = (max(1, int(size[0])), max(1, int(size[1])))
+        color = tuple(color) if len(color) == 4 else tuple(color) + (255,)
+        key = (size, color)
+
+        texture = self._solid_textures.get(key)
+        if texture is None:
+            texture = arcade.Texture(
+                name="solid_{}x{}_{}_{}_{}_{}".format(*size, *color),
+                image=Image.new("RGBA", size, color),
+                hit_box_algorithm="Detailed",
+                hit_box_detail=1,
+            )
+            self._solid_textures[key] = texture
+
+        return texture
+
+    def crop_texture(self, file_name: str, size: Tuple[int, int], variant: int = 0) -> arcade.Texture:
+        """
+        Returns a crop of a texture file, shared by all the callers asking for
+        the same file, size and variant. The position of the crop in the file
+        only depends on the size and the variant.
+
+        Args:
+            file_name (str): Path of the texture file.
+            size (Tuple[int, int]): Width and height of the crop, in pixels.
+            variant (int): Index of the crop among the crops of the same size.
+
+        Returns:
+            arcade.Texture: The texture.
+        """
+        size = (max(1, int(size[0])), max(1, int(size[1])))
+        key = (file_name, size, variant)
+
+        texture = self._crop_textures.get(key)
+        if texture is None:
+            image = self._image(file_name)
+            rng = np.random.default_rng([size[0], size[1], variant])
+            x = int(rng.integers(0, max(1, image.width - size[0])))
+            y = int(rng.integers(0, max(1, image.height - size[1])))
+
+            texture = arcade.Texture(
+                name=f"{file_name}|crop={x},{y},{size[0]}x{size[1]}",
+                image=image.crop((x, y, x + size[0], y + size[1])),
+            )
+            self._crop_textures[key] = texture
+
+        return texture
+
+    def mask_texture(self, texture: arcade.Texture) -> arcade.Texture:
+        """
+        Returns the texture with the shape of a source texture in white. Drawn
+        with the color of a sprite, the non-transparent pixels of the source
+        texture take that color, e.g. the color encoding the UID of an entity.
+
+        Args:
+            texture (arcade.Texture): The source texture.
+
+        Returns:
+            arcade.Texture: The mask texture.
+        """
+        mask_texture = self._mask_textures.get(texture.name)
+        if mask_texture is None:
+            mask_texture = arcade.Texture(
+                name=f"{texture.name}|mask",
+                image=paint_alpha_mask(texture.image, (255, 255, 255, 255)),
+                hit_box_algorithm="Detailed",
+                hit_box_detail=1,
+            )
+            self._mask_textures[texture.name] = mask_texture
+
+        return mask_texture
+
+    def _image(self, file_name: str) -> Image.Image:
+        """
+        Returns the RGBA image of a texture file, decoded once.
+        """
+        image = self._images.get(file_name)
+        if image is None:
+            with Image.open(file_name) as source:
+                image = source.convert("RGBA")
+            self._images[file_name] = image
+        return image
+
+    def clear(self) -> None:
+        """
+        Remove all the cached textures and images.
+        """
+        self._solid_textures.clear()
+        self._crop_textures.clear()
+        self._mask_textures.clear()
+        self._images.clear()
+
+
+def uid_to_color(uid: int) -> Tuple[int, int, int, int]:
+    """
+    Returns the RGBA color encoding a UID, as read back by the ray sensors.
+
+    Args:
+        uid (int): UID on 24 bits.
+
+    Returns:
+        Tuple[int, int, int, int]: RGBA color.
+    """
+    return uid & 255, (uid >> 8) & 255, (uid >> 16) & 255, 255
+
+
+def paint_alpha_mask(image: Image.Image, color: Tuple[int, int, int, int]) -> Image.Image:
+    """
+    Returns a new image where the non-transparent pixels of an image take a
+    color, and the transparent ones are (0, 0, 0, 0).
+
+    Args:
+        image (Image.Image): The source image.
+        color (Tuple[int, int, int, int]): RGBA color.
+
+    Returns:
+        Image.Image: The painted RGBA image.
+    """
+    if image.mode != "RGBA":
+        image = image.convert("RGBA")
+
+    alpha = np.asarray(image.getchannel("A"))
+    pixels = np.zeros(alpha.shape + (4,), dtype=np.uint8)
+    pixels[alpha != 0] = color
+
+    return Image.fromarray(pixels, "RGBA")
+
+
+# Texture cache shared by all the playgrounds of the process
+TEXTURE_MANAGER = TextureManager()
@@ -0,0 +1,126 @@
+from typing import Optional, Sequence
+
+import numpy as np
+
+
+class Trajectory:
+    """
+    Array-backed store of poses (or any fixed-size rows), with amortized O(1)
+    append.
+
+    Without max_length, the storage doubles when it is full. With max_length,
+    only the last max_length rows are kept, as a ring buffer: each row is
+    written twice, at index i and i + max_length of a buffer of twice the size,
+    so that the kept rows are always contiguous and can be read as a view.
+
+    The array returned by the 'array' property is a view on the storage, not a
+    copy: it is only valid until the next append.
+
+    Example Usage
+        trajectory = Trajectory(max_length=150)
+        for _ in range(1000):
+            trajectory.append((x, y, orientation))
+        plt.plot(trajectory.array[:, 0], trajectory.array[:, 1])
+
+    Args:
+        max_length (Optional[int]): Maximum number of rows kept, None for no limit.
+        n_columns (int): Number of values of a row, 3 for (x, y, orientation).
+        initial_capacity (int): Initial number of rows of the storage, without max_length.
+    """
+
+    def __init__(self, max_length: Optional[int] = None, n_columns: int = 3,
+                 initial_capacity: int = 64):
+        if max_length is not None and max_length <= 0:
+            raise ValueError("max_length must be a positive integer")
+
+        self._max_length = max_length
+        self._n_columns = n_columns
+
+        if max_length is None:
+            self._buffer = np.zeros((max(1, initial_capacity), n_columns))
+        else:
+            self._buffer = np.zeros((2 * max_length, n_columns))
+
+        # Index of the first kept row and number of kept rows
+        self._start = 0
+        self._length = 0
+
+    @property
+    def max_length(self) -> Optional[int]:
+        """
+        Returns the maximum number of rows kept, None if there is no limit.
+        """
+        return self._max_length
+
+    @property
+    def array(self) -> np.ndarray:
+        """
+        Returns the kept rows, as a (n, n_columns) view on the storage.
+        """
+        return self._buffer[self._start:self._start + self._length]
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index):
+        """
+        Returns rows of the trajectory, indexed as the 'array' property. Like
+        it, the result is a view on the storage, valid until the next append:
+        copy it to keep it.
+        """
+        return self.array[index]
+
+    def append(self, row: Sequence[float]) -> None:
+        """
+        Append a row, e.g. a pose (x, y, orientation).
+
+        Args:
+            row (Sequence[float]): Values of the row.
+        """
+        if self._max_length is None:
+            if self._length == len(self._buffer):
+                self._buffer = np.concatenate([self._buffer, np.zeros_like(self._buffer)])
+            self._buffer[self._length] = row
+            self._length += 1
+            return
+
+        index = (self._start + self._length) % self._max_length
+        self._buffer[index] = row
+        self._buffer[index + self._max_length] = row
+
+        if self._length < self._max_length:
+            self._length += 1
+        else:
+            self._start = (self._start + 1) % self._max_length
+
+    def extend(self, rows: np.ndarray) -> None:
+        """
+        Append several rows.
+
+        Args:
+            rows (np.ndarray): Rows (n, n_columns).
+        """
+        rows = np.asarray(rows, dtype=float).reshape(-1, self._n_columns)
+
+        if self._max_length is None:
+            needed = self._length + len(rows)
+            if needed > len(self._buffer):
+                capacity = len(self._buffer)
+                while capacity < needed:
+                    capacity *= 2
+                buffer = np.zeros((capacity, self._n_columns))
+                buffer[:self._length] = self._buffer[:self._length]
+                self._buffer = buffer
+            self._buffer[self._length:needed] = rows
+            self._length = needed
+            return
+
+        for row in rows[-self._max_length:]:
+            self.append(row)
+
+    def clear(self) -> None:
+        """
+        Remove all the rows. The storage is kept.
+        """
+        self._start = 0
+        self._length = 0
@@ -3,9 +3,91 @@ from typing import Union, Type, Optional
 
 import numpy as np
 
+# Default number of timesteps of noise drawn at once
+NOISE_BLOCK_SIZE = 1024
+
+# Maximal number of values of a block, so that the block of a large sensor
+# stays small in memory (8 MB)
+MAX_NOISE_BLOCK_VALUES = 2 ** 20
+
+
+class StandardNormalBlocks:
+    """
+    Draws standard normal values of a given shape, one sample per timestep.
+
+    The samples are pre-generated by blocks of many timesteps with one call
+    of the random generator, then consumed one by one, which is much faster
+    than one call per timestep for small shapes.
+
+    Example Usage
+        blocks = StandardNormalBlocks(shape=(3,), rng=np.random.default_rng(0))
+        noise = 2.0 * blocks.next()
+
+    Args:
+        shape (tuple): Shape of one sample, () for a scalar.
+        block_size (int): Number of samples drawn at once. It is reduced for
+            large shapes, to limit the memory used by a block.
+        rng (Optional[np.random.Generator]): Random generator. If None, a
+            generator seeded from the OS entropy is created on first use.
+    """
+
+    def __init__(self, shape: tuple = (), block_size: int = NOISE_BLOCK_SIZE,
+                 rng: Optional[np.random.Generator] = None):
+        self._shape = tuple(shape)
+        sample_size = max(1, int(np.prod(self._shape)))
+        self._block_size = max(1, min(block_size, MAX_NOISE_BLOCK_VALUES // sample_size))
+
+        self._rng = rng
+        self._block: Optional[np.ndarray] = None
+        self._index = 0
+
+    @property
+    def shape(self) -> tuple:
+        """
+        Returns the shape of one sample.
+        """
+        return self._shape
+
+    @property
+    def rng(self) -> Optional[np.random.Generator]:
+        """
+        Returns the random generator.
+        """
+        return self._rng
+
+    @rng.setter
+    def rng(self, rng: Optional[np.random.Generator]) -> None:
+        """
+        Set the random generator. The samples already drawn are discarded.
+        """
+        self._rng = rng
+        self._block = None
+
+    def next(self) -> Union[np.ndarray, float]:
+        """
+        Returns the next sample.
+
+        Returns:
+            np.ndarray or float: A sample of the shape of the blocks, or a float
+                for a scalar shape.
+        """
+        if self._block is None or self._index == len(self._block):
+            if self._rng is None:
+                self._rng = np.random.default_rng()
+            self._block = self._rng.standard_normal((self._block_size,) + self._shape)
+            self._index = 0
+
+        sample = self._block[self._index]
+        self._index += 1
+
+        if not self._shape:
+            return float(sample)
+        return sample
+
 
 def vector_gaussian_noise(size: int, mean_noise: float = 0,
-                          std_dev_noise: float = 1.0) -> np.ndarray:
+                          std_dev_noise: float = 1.0,
+                          rng: Optional[np.random.Generator] = None) -> np.ndarray:
     """
     The vector_gaussian_noise function generates a vector of Gaussian noise
     using the NumPy library.
@@ -23,6 +105,8 @@ def vector_gaussian_noise(size: int, mean_noise: float = 0,
         Defaults to 0.
         std_dev_noise (float, optional): The standard deviation of the Gaussian
         distribution. Defaults to 1.0.
+        rng (np.random.Generator, optional): Random generator. Defaults to the
+        global generator of NumPy.
     """
 
     if not isinstance(size, int) or size <= 0:
@@ -34,10 +118,10 @@ def vector_gaussian_noise(size: int, mean_noise: float = 0,
     if not isinstance(mean_noise, (int, float)):
         raise ValueError("mean_noise must be a number")
 
-    gaussian_noise = np.random.normal(loc=mean_noise,
-                                      scale=std_dev_noise,
-                                      size=size)
-    return gaussian_noise
+    if rng is None:
+        return np.random.normal(loc=mean_noise, scale=std_dev_noise, size=size)
+
+    return rng.normal(loc=mean_noise, scale=std_dev_noise, size=size)
 
 
 class GaussianNoise:
@@ -63,19 +147,55 @@ class GaussianNoise:
         # noisy_values will be the original values plus random values drawn
         from a Gaussian distribution with mean 0 and standard deviation 1.0
 
+    The noise is drawn by blocks of many timesteps (see StandardNormalBlocks),
+    so the values given to add_noise() must always have the same shape.
+
     Args:
         mean_noise (float): Mean of the Gaussian noise.
         std_dev_noise (float): Standard deviation of the Gaussian noise.
+        rng (Optional[np.random.Generator]): Random generator, e.g. spawned
+            from the generator of the playground.
+        block_size (int): Number of timesteps of noise drawn at once.
     """
 
-    def __init__(self, mean_noise: float = 0, std_dev_noise: float = 1.0):
+    def __init__(self, mean_noise: float = 0, std_dev_noise: float = 1.0,
+                 rng: Optional[np.random.Generator] = None,
+                 block_size: int = NOISE_BLOCK_SIZE):
         self._mean_noise = mean_noise
         # std_dev_noise is the standard deviation of the resulted gaussian
         # noise
         self._std_dev_noise = std_dev_noise
 
+        self._rng = rng
+        self._block_size = block_size
+        self._blocks: Optional[StandardNormalBlocks] = None
         self._shape: Optional[tuple] = None
 
+    @property
+    def rng(self) -> Optional[np.random.Generator]:
+        """
+        Returns the random generator of the noise.
+        """
+        return self._rng
+
+    @rng.setter
+    def rng(self, rng: Optional[np.random.Generator]) -> None:
+        """
+        Set the random generator of the noise.
+        """
+        self._rng = rng
+        if self._blocks is not None:
+            self._blocks.rng = rng
+
+    def _next_noise(self, shape: tuple) -> Union[np.ndarray, float]:
+        """
+        Returns the noise of the current timestep.
+        """
+        if self._blocks is None:
+            self._blocks = StandardNormalBlocks(shape, self._block_size, self._rng)
+
+        return self._mean_noise + self._std_dev_noise * self._blocks.next()
+
     def add_noise(self, values: Union[np.ndarray, float]):
         """
         Add Gaussian noise to the input values.
@@ -100,12 +220,13 @@ class GaussianNoise:
                 self._shape = values2.shape
             assert (self._shape == values2.shape)
 
-            gaussian_noise = np.random.normal(loc=self._mean_noise,
-                                              scale=self._std_dev_noise,
-                                              size=values2.shape)
+            gaussian_noise = self._next_noise(values2.shape)
         elif isinstance(values, float):
-            gaussian_noise = np.random.normal(loc=self._mean_noise,
-                                              scale=self._std_dev_noise)
+            if self._shape is None:
+                self._shape = ()
+            assert (self._shape == ())
+
+            gaussian_noise = self._next_noise(())
         return values2 + gaussian_noise
 
 
@@ -120,12 +241,21 @@ class AutoregressiveModelNoise:
      if model_param = 0 : the final noise is a white noise
      if model_param -> 1 : the noise get some derive
 
+    The white noise is drawn by blocks of many timesteps (see
+    StandardNormalBlocks), so the values given to add_noise() must always have
+    the same shape.
+
     Args:
         model_param (float): AR(1) model parameter (0 <= model_param < 1).
         std_dev_noise (float): Standard deviation of the resulting noise.
+        rng (Optional[np.random.Generator]): Random generator, e.g. spawned
+            from the generator of the playground.
+        block_size (int): Number of timesteps of white noise drawn at once.
     """
 
-    def __init__(self, model_param: float, std_dev_noise: float):
+    def __init__(self, model_param: float, std_dev_noise: float,
+                 rng: Optional[np.random.Generator] = None,
+                 block_size: int = NOISE_BLOCK_SIZE):
         self._model_param = model_param
         # std_dev is the real standard deviation of the resulted noise
         self._std_dev_noise = std_dev_noise
@@ -134,9 +264,38 @@ class AutoregressiveModelNoise:
         self._std_dev_wn = math.sqrt(
             self._std_dev_noise ** 2 * (1 - self._model_param ** 2))
 
+        self._rng = rng
+        self._block_size = block_size
+        self._blocks: Optional[StandardNormalBlocks] = None
+
         self._last_noise: Union[np.ndarray, float, None] = None
         self._shape: Union[tuple, None] = None
 
+    @property
+    def rng(self) -> Optional[np.random.Generator]:
+        """
+        Returns the random generator of the noise.
+        """
+        return self._rng
+
+    @rng.setter
+    def rng(self, rng: Optional[np.random.Generator]) -> None:
+        """
+        Set the random generator of the noise.
+        """
+        self._rng = rng
+        if self._blocks is not None:
+            self._blocks.rng = rng
+
+    def _next_white_noise(self, shape: tuple) -> Union[np.ndarray, float]:
+        """
+        Returns the white noise of the current timestep.
+        """
+        if self._blocks is None:
+            self._blocks = StandardNormalBlocks(shape, self._block_size, self._rng)
+
+        return self._std_dev_wn * self._blocks.next()
+
     def add_noise(self, values: Union[np.ndarray, float, Type[None]]):
         """
         Add AR(1) noise to the input values.
@@ -157,20 +316,22 @@ class AutoregressiveModelNoise:
             #     # change shape from (n,) to (n, 1), ie a column vector
             #     values2 = values[:, np.newaxis]
 
-            white_noise = np.random.normal(0, self._std_dev_wn,
-                                           size=values2.shape)
-
             if self._last_noise is None:
                 self._last_noise = np.zeros(values2.shape)
                 self._shape = values2.shape
 
             assert (self._shape == values2.shape)
-            assert white_noise.all()
+
+            white_noise = self._next_white_noise(values2.shape)
 
         elif isinstance(values, float):
-            white_noise = np.random.normal(0, self._std_dev_wn)
             if self._last_noise is None:
                 self._last_noise = 0
+                self._shape = ()
+
+            assert (self._shape == ())
+
+            white_noise = self._next_white_noise(())
 
         additive_noise = self._model_param * self._last_noise + white_noise
         self._last_noise = additive_noise
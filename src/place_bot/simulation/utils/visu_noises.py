@@ -1,10 +1,11 @@
 import math
-from collections import deque
-from typing import Tuple, List, Dict, Union, Deque
+from typing import Tuple, Union
 
 import arcade
+import numpy as np
 
 from place_bot.simulation.robot.robot_abstract import RobotAbstract
+from place_bot.simulation.utils.trajectory import Trajectory
 
 
 def _draw_pseudo_robot(position_screen: Tuple[int, int, float],
@@ -57,6 +58,10 @@ class VisuNoises:
     """
     Visualization tool for displaying noisy and true positions of the robot.
 
+    The last poses are kept in two Trajectory ring buffers, which can also be
+    read by user code as (n, 3) arrays of (x, y, orientation):
+    true_trajectory and odometer_trajectory.
+
     Args:
         playground_size (Tuple[int, int]): Size of the playground.
         robot (RobotAbstract): Robot to visualize.
@@ -68,18 +73,31 @@ class VisuNoises:
         self._half_playground_size: Tuple[float, float] = (playground_size[0] / 2,
                                                            playground_size[1] / 2)
 
-        self._scr_pos_odom: Dict[RobotAbstract, deque[Tuple[int, int, float]]] = {}
-        self._scr_pos_true: Dict[RobotAbstract, deque[Tuple[float, float, float]]] = {}
         self._max_size_circular_buffer = 150
+        self._true_trajectory = Trajectory(max_length=self._max_size_circular_buffer)
+        self._odometer_trajectory = Trajectory(max_length=self._max_size_circular_buffer)
+
+    @property
+    def true_trajectory(self) -> Trajectory:
+        """
+        Returns the last true poses of the robot.
+        """
+        return self._true_trajectory
+
+    @property
+    def odometer_trajectory(self) -> Trajectory:
+        """
+        Returns the last odometer values of the robot.
+        """
+        return self._odometer_trajectory
 
     def reset(self) -> None:
         """
         The reset method is responsible for resetting the state of the
-        VisuNoises object by clearing all the dictionaries that store the
-        screen positions and other data related to the robot.
+        VisuNoises object by clearing the trajectories of the robot.
         """
-        self._scr_pos_odom.clear()
-        self._scr_pos_true.clear()
+        self._true_trajectory.clear()
+        self._odometer_trajectory.clear()
 
     def draw(self, enable: bool = True) -> None:
         """
@@ -96,6 +114,15 @@ class VisuNoises:
 
         self._draw_true_path(self._robot)
 
+    def _to_screen(self, poses: np.ndarray) -> np.ndarray:
+        """
+        Convert an array of poses from world to screen coordinates.
+        """
+        screen = poses.copy()
+        screen[:, 0] += self._half_playground_size[0]
+        screen[:, 1] += self._half_playground_size[1]
+        return screen
+
     def _draw_odom_position(self, robot: RobotAbstract, enable: bool = True) -> None:
         """
         Draw the odometry position of a robot.
@@ -106,12 +133,11 @@ class VisuNoises:
         """
         if not enable:
             return
-        if not self._scr_pos_odom:
-            return
-        if robot not in self._scr_pos_odom:
+        if robot is not self._robot or not len(self._odometer_trajectory):
             return
 
-        last_pos_screen = self._scr_pos_odom[robot][-1]
+        x, y, angle = self._odometer_trajectory[-1]
+        last_pos_screen = self.conv_world2screen(pos_world=(x, y), angle=float(angle))
         _draw_pseudo_robot(position_screen=last_pos_screen,
                            color=arcade.color.RED)
 
@@ -126,31 +152,21 @@ class VisuNoises:
         """
         if not enable:
             return
-        if not self._scr_pos_odom:
+        if robot is not self._robot or not len(self._odometer_trajectory):
             return
-        if robot not in self._scr_pos_odom:
-            return
-
-        point_list = []
-        for pos_screen in self._scr_pos_odom[robot]:
-            point_list.append((pos_screen[0], pos_screen[1]))
 
-        arcade.draw_line_strip(point_list=point_list, color=arcade.color.RED)
+        point_list = self._to_screen(self._odometer_trajectory.array)[:, :2]
+        arcade.draw_line_strip(point_list=point_list.tolist(), color=arcade.color.RED)
 
     def _draw_true_path(self, robot: RobotAbstract) -> None:
         """
         Draw the true path of a robot.
         """
-        if not self._scr_pos_true:
+        if robot is not self._robot or not len(self._true_trajectory):
             return
-        if robot not in self._scr_pos_true:
-            return
-
-        point_list = []
-        for pos_screen in self._scr_pos_true[robot]:
-            point_list.append((pos_screen[0], pos_screen[1]))
 
-        arcade.draw_line_strip(point_list=point_list, color=arcade.color.BLACK)
+        point_list = self._to_screen(self._true_trajectory.array)[:, :2]
+        arcade.draw_line_strip(point_list=point_list.tolist(), color=arcade.color.BLACK)
 
     def update(self, enable: bool = True) -> None:
         """
@@ -162,34 +178,15 @@ class VisuNoises:
         if not enable:
             return
 
-        if not self._scr_pos_true:
-            self._scr_pos_true = \
-                {None: deque(maxlen=self._max_size_circular_buffer)}
-
-        if not self._scr_pos_odom:
-            self._scr_pos_odom = {None: deque(maxlen=self._max_size_circular_buffer)}
-
         # TRUE VALUES
         true_position = self._robot.true_position()
         true_angle = self._robot.true_angle()
         if true_position is not None:
-            pos = self.conv_world2screen(
-                pos_world=true_position, angle=true_angle)
-            if self._robot in self._scr_pos_true:
-                self._scr_pos_true[self._robot].append(pos)
-            else:
-                self._scr_pos_true[self._robot] = (
-                    deque([pos], maxlen=self._max_size_circular_buffer))
+            self._true_trajectory.append((true_position[0], true_position[1], true_angle))
 
         # ODOMETER
-        x, y, orient = (0.0, 0.0, 0.0)
         if not self._robot.odometer_is_disabled():
-            x, y, orient = tuple(self._robot.odometer_values())
-            pos_odom_screen = self.conv_world2screen(pos_world=(x, y), angle=orient)
-            if self._robot in self._scr_pos_odom:
-                self._scr_pos_odom[self._robot].append(pos_odom_screen)
-            else:
-                self._scr_pos_odom[self._robot] = deque([pos_odom_screen], maxlen=self._max_size_circular_buffer)
+            self._odometer_trajectory.append(self._robot.odometer_values())
 
     def conv_world2screen(self, pos_world: Tuple[float, float], angle: float) -> Tuple[int, int, float]:
         """
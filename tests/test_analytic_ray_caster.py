@@ -0,0 +1,120 @@
+import math
+
+import numpy as np
+
+from place_bot.simulation.gui_map.closed_playground import ClosedPlayground
+from place_bot.simulation.ray_sensors import analytic_ray_caster
+from place_bot.simulation.ray_sensors.analytic_ray_caster import (
+    intersect_rays_circles,
+    intersect_rays_segments,
+)
+from place_bot.simulation.ray_sensors.lidar import LidarParams
+from place_bot.simulation.robot.robot_abstract import RobotAbstract
+
+
+class MyRobot(RobotAbstract):
+    def __init__(self):
+        lidar_params = LidarParams()
+        lidar_params.noise_enable = False
+        super().__init__(lidar_params=lidar_params)
+
+    def control(self):
+        return {"forward": 0.0, "rotation": 0.0}
+
+
+def test_intersect_rays_segments():
+    origins = np.array([[0.0, 0.0]])
+    directions = np.array([[[1.0, 0.0], [0.0, 1.0], [-1.0, 0.0]]])
+    seg_start = np.array([[10.0, -5.0], [-5.0, 20.0]])
+    seg_end = np.array([[10.0, 5.0], [5.0, 20.0]])
+    seg_mask = np.ones((1, 2), dtype=bool)
+
+    dist, index = intersect_rays_segments(origins, directions, seg_start, seg_end, seg_mask)
+
+    assert dist[0, 0] == 10.0 and index[0, 0] == 0
+    assert dist[0, 1] == 20.0 and index[0, 1] == 1
+    assert np.isinf(dist[0, 2])
+
+
+def test_intersect_rays_circles():
+    origins = np.array([[0.0, 0.0], [30.0, 0.0]])
+    directions = np.array([[[1.0, 0.0]], [[1.0, 0.0]]])
+    centers = np.array([[30.0, 0.0]])
+    radii = np.array([5.0])
+    circle_mask = np.ones((2, 1), dtype=bool)
+
+    dist, _ = intersect_rays_circles(origins, directions, centers, radii, circle_mask)
+
+    assert math.isclose(dist[0, 0], 25.0)
+    # A ray starting inside the circle hits it immediately
+    assert dist[1, 0] == 0.0
+
+
+def test_intersect_rays_circles_chunked(monkeypatch):
+    rng = np.random.default_rng(0)
+    origins = rng.uniform(-50, 50, (6, 2))
+    angles = rng.uniform(-np.pi, np.pi, (6, 8))
+    directions = np.stack([np.cos(angles), np.sin(angles)], axis=-1)
+    centers = rng.uniform(-60, 60, (6, 5, 2))
+    radii = rng.uniform(2, 15, (6, 5))
+    circle_mask = rng.random((6, 5)) < 0.8
+
+    expected = intersect_rays_circles(origins, directions, centers, radii, circle_mask)
+    shared = intersect_rays_circles(origins, directions, centers[0], radii[0], circle_mask)
+
+    # One sensor per chunk
+    monkeypatch.setattr(analytic_ray_caster, "MAX_KERNEL_PAIRS", 1)
+    for result, (batch_centers, batch_radii) in ((expected, (centers, radii)),
+                                                 (shared, (centers[0], radii[0]))):
+        dist, index = intersect_rays_circles(origins, directions, batch_centers,
+                                             batch_radii, circle_mask)
+        assert np.array_equal(dist, result[0])
+        assert np.array_equal(index, result[1])
+
+
+def test_analytic_lidar_distances():
+    """
+    In a closed playground of 200x200 with borders of thickness 6, the inner
+    faces of the walls are at 94 pixels from the center.
+    """
+    playground = ClosedPlayground(size=(200, 200), analytic_rays=True)
+    robot = MyRobot()
+    playground.add(robot, ((0, 0), 0))
+
+    playground.step()
+
+    values = robot.lidar_values()
+    angles = robot.lidar_rays_angles()
+
+    expected = 94 / np.maximum(np.abs(np.cos(angles)), np.abs(np.sin(angles)))
+
+    assert np.allclose(values, expected, atol=1e-6)
+
+
+def test_analytic_lidar_sees_other_robot():
+    playground = ClosedPlayground(size=(400, 200), analytic_rays=True)
+    robot = MyRobot()
+    other_robot = MyRobot()
+    playground.add(robot, ((0, 0), 0))
+    playground.add(other_robot, ((100, 0), 0))
+
+    playground.step()
+
+    # Ray pointing forward is the middle one
+    forward_dist = robot.lidar_values()[180]
+    hitpoints = robot.lidar()._hitpoints
+
+    assert forward_dist < 100
+    assert hitpoints[180, 8] == other_robot.base.uid
+
+
+def test_windowless_playground():
+    playground = ClosedPlayground(size=(200, 200), windowless=True)
+    robot = MyRobot()
+    playground.add(robot, ((0, 0), 0))
+
+    for _ in range(10):
+        playground.step(all_commands={robot: {"forward": 1.0, "rotation": 0.0}})
+
+    assert not playground.has_window
+    assert not np.isnan(robot.lidar_values()).any()
@@ -0,0 +1,36 @@
+from benchmarks.bench_step import REFERENCE_CASE, SWEEP, compare, make_cases, run_case
+
+
+def test_make_cases_sweeps_around_reference():
+    cases = make_cases(SWEEP)
+
+    assert REFERENCE_CASE in cases
+    assert all(sum(case[name] != REFERENCE_CASE[name] for name in case) <= 1
+               for case in cases)
+    assert len(make_cases(SWEEP, full=True)) == 4 * 3 * 3 * 3 * 3
+
+
+def test_make_cases_follows_filtered_sweep():
+    sweep = {"world": ["random"], "n_robots": [1], "resolution": [91],
+             "pymunk_steps": [5], "backend": ["analytic"]}
+    assert make_cases(sweep) == [{"world": "random", "n_robots": 1, "resolution": 91,
+                                  "pymunk_steps": 5, "backend": "analytic"}]
+
+    sweep = {**sweep, "backend": ["cpu", "analytic"]}
+    assert sorted(case["backend"] for case in make_cases(sweep)) == ["analytic", "cpu"]
+    assert all(case["world"] == "random" and case["resolution"] == 91
+               for case in make_cases(sweep))
+
+
+def test_run_case_and_compare():
+    case = {**REFERENCE_CASE, "world": "intermediate_01", "n_robots": 2, "backend": "analytic"}
+    result = run_case(case, n_steps=5, n_warmup=1)
+
+    assert result["steps_per_sec"] > 0
+    assert "physics" in result["phases"]
+    assert result["counters"]["steps"] == 5
+
+    slower = {**result, "steps_per_sec": result["steps_per_sec"] / 2}
+    comparison = compare({"results": [result]}, {"results": [slower]}, tolerance=0.1)
+    assert len(comparison) == 1
+    assert comparison[0]["regression"]
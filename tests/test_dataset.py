@@ -0,0 +1,125 @@
+import json
+import shutil
+
+import numpy as np
+import pytest
+
+from place_bot.simulation.batch.dataset import Dataset, DatasetWriter, dataset_dtype
+from place_bot.simulation.batch.episode_farm import EpisodeFarm, run_episode
+from place_bot.simulation.gui_map.closed_playground import ClosedPlayground
+from place_bot.simulation.gui_map.world_abstract import WorldAbstract
+from place_bot.simulation.robot.robot_abstract import RobotAbstract
+
+
+class MyRobot(RobotAbstract):
+    def control(self):
+        return {"forward": 0.5, "rotation": 0.1}
+
+
+class MyWorld(WorldAbstract):
+    def __init__(self, robot: RobotAbstract, playground_options=None):
+        super().__init__(robot=robot, playground_options=playground_options)
+        self._size_area = (200, 200)
+        self._playground = ClosedPlayground(size=self._size_area, **self.playground_options)
+        self._playground.add(robot, ((0, 0), 0))
+
+
+def test_run_episode_dataset(tmp_path):
+    directory = str(tmp_path / "dataset")
+    results = [run_episode(MyWorld, MyRobot, n_steps=30, seed=seed, dataset_directory=directory)
+               for seed in (3, 4)]
+
+    dataset = Dataset(directory)
+    assert len(dataset) == 60
+    assert len(dataset.shards) == 1
+    assert isinstance(dataset.shards[0], np.memmap)
+    assert [episode[3] for episode in dataset.episodes] == [3, 4]
+
+    for index, result in enumerate(results):
+        records = dataset.episode(index)
+        assert np.shares_memory(records, dataset.shards[0])
+        assert np.array_equal(records["seed"], np.full(30, result.seed))
+        assert np.array_equal(records["timestep"], np.arange(30))
+        assert np.allclose(records["pose"], result.trajectory[:-1], atol=1e-3)
+        # The robot is not controlled at the first timestep
+        assert np.allclose(records["command"][0], 0.0)
+        assert np.allclose(records["command"][1:], [0.5, 0.1])
+        assert records["lidar"].shape == (30, 361)
+
+    # The shards can be opened with np.memmap and the index alone
+    with open(tmp_path / "dataset" / "index.json", encoding="utf-8") as file:
+        index = json.load(file)
+    shard = index["shards"][0]
+    records = np.memmap(tmp_path / "dataset" / shard["file"], mode="r",
+                        dtype=dataset_dtype(index["lidar_resolution"]), shape=(shard["n_records"],))
+    assert np.array_equal(records["lidar"], dataset.shards[0]["lidar"], equal_nan=True)
+
+
+def test_dataset_writer_grows(tmp_path):
+    world = MyWorld(MyRobot())
+    robot = world.robot
+    writer = DatasetWriter(str(tmp_path), shard="0", lidar_resolution=361, capacity=4)
+    for timestep in range(10):
+        world.playground.step(all_commands={robot: robot.control()})
+        writer.append(robot, robot.control(), seed=None, timestep=timestep)
+    writer.end_episode()
+    writer.close()
+    assert writer.closed
+    with pytest.raises(ValueError):
+        writer.append(robot, robot.control())
+
+    # Appending to an existing shard
+    writer = DatasetWriter(str(tmp_path), shard="0", lidar_resolution=361)
+    writer.append(robot, robot.control(), seed=1, timestep=0)
+    writer.end_episode(1)
+    writer.close()
+
+    dataset = Dataset(str(tmp_path))
+    assert len(dataset) == 11
+    assert dataset.episodes == [(0, 0, 10, None), (0, 10, 11, 1)]
+    assert np.array_equal(dataset.shards[0]["seed"], [-1] * 10 + [1])
+
+    world.playground.cleanup()
+
+
+def test_run_episode_dataset_recreated(tmp_path):
+    directory = tmp_path / "dataset"
+    run_episode(MyWorld, MyRobot, n_steps=10, seed=1, dataset_directory=str(directory))
+    run_episode(MyWorld, MyRobot, n_steps=10, seed=2, dataset_directory=str(directory))
+    assert [episode[3] for episode in Dataset(str(directory)).episodes] == [1, 2]
+
+    # No writer is kept open between the episodes: a new directory starts empty
+    shutil.rmtree(directory)
+    run_episode(MyWorld, MyRobot, n_steps=5, seed=3, dataset_directory=str(directory))
+    dataset = Dataset(str(directory))
+    assert len(dataset) == 5
+    assert [episode[3] for episode in dataset.episodes] == [3]
+
+
+def test_episode_farm_dataset(tmp_path):
+    directory = str(tmp_path / "dataset")
+    farm = EpisodeFarm(MyWorld, MyRobot, n_steps=10, max_workers=2, dataset_directory=directory)
+    farm.run_all(seeds=[0, 1, 2])
+
+    dataset = Dataset(directory)
+    assert len(dataset) == 30
+    assert 1 <= len(dataset.shards) <= 2
+    assert sorted(episode[3] for episode in dataset.episodes) == [0, 1, 2]
+
+
+def test_episode_farm_dataset_after_parent(tmp_path):
+    directory = str(tmp_path / "dataset")
+    run_episode(MyWorld, MyRobot, n_steps=10, seed=100, dataset_directory=directory)
+
+    # Forked workers must not write to the shard of the parent
+    farm = EpisodeFarm(MyWorld, MyRobot, n_steps=10, max_workers=2, dataset_directory=directory)
+    farm.run_all(seeds=[0, 1, 2, 3])
+
+    dataset = Dataset(directory)
+    assert len(dataset) == 50
+    assert sorted(episode[3] for episode in dataset.episodes) == [0, 1, 2, 3, 100]
+    assert len({episode[0] for episode in dataset.episodes if episode[3] != 100}) <= 2
+    for index, (_, _, _, seed) in enumerate(dataset.episodes):
+        records = dataset.episode(index)
+        assert np.array_equal(records["seed"], np.full(10, seed))
+        assert np.array_equal(records["timestep"], np.arange(10))
@@ -0,0 +1,93 @@
+import numpy as np
+
+from place_bot.simulation.batch.episode_farm import EpisodeFarm, odometer_drift, run_episode
+from place_bot.simulation.gui_map.closed_playground import ClosedPlayground
+from place_bot.simulation.gui_map.world_abstract import WorldAbstract
+from place_bot.simulation.robot.robot_abstract import RobotAbstract
+from place_bot.simulation.utils.constants import FRAME_RATE
+
+
+class MyRobot(RobotAbstract):
+    def control(self):
+        return {"forward": 1.0, "rotation": 0.0}
+
+
+class MyFaultyRobot(RobotAbstract):
+    def control(self):
+        raise RuntimeError("bug in the controller")
+
+
+class MyClockRobot(RobotAbstract):
+    # Elapsed timesteps and wall times seen by control(), for all the instances
+    clock = []
+
+    def control(self):
+        MyClockRobot.clock.append((self.elapsed_timestep, self.elapsed_walltime))
+        return {"forward": 0.0, "rotation": 0.0}
+
+
+class MyWorld(WorldAbstract):
+    def __init__(self, robot: RobotAbstract, playground_options=None):
+        super().__init__(robot=robot, playground_options=playground_options)
+        self._size_area = (200, 200)
+        self._playground = ClosedPlayground(size=self._size_area, **self.playground_options)
+        self._playground.add(robot, ((0, 0), 0))
+
+
+def test_run_episode():
+    result = run_episode(MyWorld, MyRobot, n_steps=100, seed=0)
+
+    assert result.error is None
+    assert result.n_steps == 100
+    assert result.trajectory.shape == (101, 3)
+    assert result.odometer_drift.shape == (101, 2)
+    # Going straight in a small closed playground, the robot hits the wall
+    assert result.n_collisions >= 1
+    assert result.n_steps_in_contact > 0
+
+
+def test_run_episode_faulty_controller():
+    result = run_episode(MyWorld, MyFaultyRobot, n_steps=10, seed=0)
+
+    # Only the first timestep, where the robot is not controlled, was run
+    assert result.n_steps == 1
+    assert "bug in the controller" in result.error
+
+
+def test_run_episode_sets_elapsed_time():
+    MyClockRobot.clock = []
+    result = run_episode(MyWorld, MyClockRobot, n_steps=5, seed=0)
+
+    # Same sequence as Simulator: no control at the first timestep, and the
+    # simulated time of the previous controlled timestep
+    assert result.n_steps == 5
+    timesteps, walltimes = zip(*MyClockRobot.clock)
+    assert timesteps == (2, 3, 4, 5)
+    assert np.allclose(walltimes, [0.001, 2 * FRAME_RATE, 3 * FRAME_RATE, 4 * FRAME_RATE])
+
+
+def test_odometer_drift_without_noise():
+    trajectory = np.array([[10.0, 10.0, np.pi / 2], [10.0, 20.0, np.pi / 2]])
+    odometer = np.array([[0.0, 0.0, 0.0], [10.0, 0.0, 0.0]])
+
+    drift = odometer_drift(trajectory, odometer)
+
+    assert np.allclose(drift, 0.0)
+
+
+def test_episode_farm():
+    farm = EpisodeFarm(MyWorld, MyRobot, n_steps=20, max_workers=2)
+    results = farm.run_all(seeds=[0, 1, 2])
+
+    assert [result.seed for result in results] == [0, 1, 2]
+    assert all(result.n_steps == 20 for result in results)
+
+
+def test_episode_farm_repeated_seeds():
+    farm = EpisodeFarm(MyWorld, MyRobot, n_steps=5, max_workers=2)
+    seeds = [None, 3, None, 3, 1]
+    results = farm.run_all(seeds=seeds)
+
+    assert [result.seed for result in results] == seeds
+    # Same seed, same episode
+    assert np.array_equal(results[1].trajectory, results[3].trajectory)
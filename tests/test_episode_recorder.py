@@ -0,0 +1,49 @@
+import numpy as np
+
+from place_bot.simulation.elements.disappearing_wall import DisappearingWall
+from place_bot.simulation.gui_map.closed_playground import ClosedPlayground
+from place_bot.simulation.reporting.episode_recorder import EpisodeReplayer
+from place_bot.simulation.robot.robot_abstract import RobotAbstract
+
+
+class MyRobot(RobotAbstract):
+    def control(self):
+        return {"forward": 0.5, "rotation": 0.2}
+
+
+def test_record_and_replay(tmp_path):
+    playground = ClosedPlayground(size=(300, 200), use_shaders=False)
+    wall = DisappearingWall(pos_start=(80, -100), pos_end=(80, 100), disappear_after_timesteps=10)
+    playground.add(wall, wall.wall_coordinates)
+    robot = MyRobot()
+    playground.add(robot, ((-60, 0), 0))
+
+    directory = str(tmp_path / "episode")
+    playground.start_episode_recording(directory, chunk_size=8)
+
+    poses, lidars, odometers = [], [], []
+    for _ in range(20):
+        playground.step(all_commands={robot: robot.control()})
+        poses.append([*robot.true_position(), robot.base.pm_body.angle])
+        lidars.append(robot.lidar_values())
+        odometers.append(robot.odometer_values())
+
+    playground.stop_episode_recording()
+    assert sorted(path.name for path in (tmp_path / "episode").iterdir()) == [
+        "chunk_00000.npz", "chunk_00001.npz", "chunk_00002.npz", "episode.json"]
+
+    replayer = EpisodeReplayer(directory)
+    assert len(replayer) == 20
+    assert replayer.robot_names == [robot.name]
+    assert np.array_equal(replayer.timesteps, np.arange(20))
+    assert np.allclose(replayer.poses(0), poses)
+    assert np.allclose(replayer.lidar(0), lidars)
+    assert np.allclose(replayer.odometer(0), odometers, atol=1e-4)
+    assert np.allclose(replayer.commands(0), [0.5, 0.2])
+    assert replayer.events == [(10, "removed", wall.name)]
+
+    points = replayer.lidar_points(0)
+    assert points.shape == (20, robot.lidar().resolution, 2)
+    assert np.allclose(replayer.lidar_points(0, step=5), points[5])
+
+    playground.cleanup()
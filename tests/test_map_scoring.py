@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+from place_bot.simulation.reporting.map_scoring import METRICS, MapScorer
+
+
+def _ground_truth():
+    grid = np.zeros((40, 60), dtype=np.uint8)
+    grid[[0, -1]] = 1
+    grid[:, [0, -1]] = 1
+    grid[10:30, 30] = 1
+    return grid
+
+
+def test_perfect_and_unknown_maps():
+    ground_truth = _ground_truth()
+    scorer = MapScorer(ground_truth, resolution=2)
+
+    scores = scorer.score(ground_truth.astype(float))
+    assert scores["coverage"] == 1
+    assert scores["occupied_iou"] == 1
+    assert scores["free_iou"] == 1
+    assert scores["accuracy_error"] == 0
+    assert scores["completeness_error"] == 0
+
+    scores = scorer.score(np.full(ground_truth.shape, 0.5))
+    assert scores["coverage"] == 0
+    assert scores["occupied_iou"] == 0
+    assert np.isnan(scores["accuracy_error"])
+    assert np.isnan(scores["completeness_error"])
+
+
+def test_distance_errors():
+    ground_truth = _ground_truth()
+    scorer = MapScorer(ground_truth, resolution=2, max_distance=100)
+
+    # Inner wall shifted by 3 cells, borders right
+    robot_map = ground_truth.astype(float)
+    robot_map[10:30, 30] = 0
+    robot_map[10:30, 33] = 1
+
+    scores = scorer.score(robot_map)
+    n_occupied = (robot_map > 0.6).sum()
+    assert scores["accuracy_error"] == pytest.approx(20 * 3 * 2 / n_occupied)
+    assert scores["completeness_error"] == pytest.approx(20 * 3 * 2 / ground_truth.sum())
+    assert 0 < scores["occupied_iou"] < 1
+
+
+def test_score_many_matches_score(tmp_path):
+    ground_truth = _ground_truth()
+    scorer = MapScorer(ground_truth)
+    rng = np.random.default_rng(0)
+    maps = rng.uniform(0, 1, (7,) + ground_truth.shape)
+    maps[2] = np.nan
+
+    expected = [scorer.score(robot_map) for robot_map in maps]
+    scores = scorer.score_many(maps, chunk_size=3)
+    assert list(scores) == list(METRICS)
+    for name in METRICS:
+        np.testing.assert_allclose(scores[name], [entry[name] for entry in expected])
+
+    paths = []
+    for index, robot_map in enumerate(maps):
+        paths.append(str(tmp_path / f"map_{index}.npy"))
+        np.save(paths[-1], robot_map)
+    np.testing.assert_allclose(scorer.score_files(paths)["free_iou"], scores["free_iou"])
+
+    with pytest.raises(ValueError):
+        scorer.score(np.zeros((3, 3)))
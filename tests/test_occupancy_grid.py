@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from place_bot.simulation.elements.disappearing_wall import DisappearingWall
+from place_bot.simulation.elements.normal_wall import NormalBox
+from place_bot.simulation.gui_map.closed_playground import ClosedPlayground
+from place_bot.simulation.gui_map.occupancy_grid import FREE, OCCUPIED, OccupancyGrid
+from place_bot.simulation.robot.robot_abstract import RobotAbstract
+
+
+class MyRobot(RobotAbstract):
+    def control(self):
+        return {"forward": 0.0, "rotation": 0.0}
+
+
+def _full_grid(playground, resolution):
+    grid = OccupancyGrid(playground.size, playground.center, resolution)
+    for element in playground.elements:
+        if not element.removed:
+            grid.add(element)
+    return grid.array.copy()
+
+
+def test_occupancy_grid():
+    playground = ClosedPlayground(size=(200, 100), use_shaders=False)
+    wall = DisappearingWall(pos_start=(20, -50), pos_end=(20, 50), disappear_after_timesteps=2)
+    playground.add(wall, wall.wall_coordinates)
+    box = NormalBox(up_left_point=(-80, 20), width=20, height=20, mass=10)
+    playground.add(box, box.wall_coordinates)
+    robot = MyRobot()
+    playground.add(robot, ((-50, -20), 0))
+
+    grid = playground.occupancy_grid(resolution=2)
+    assert grid.shape == (50, 100)
+    assert grid.dtype == np.uint8
+    assert not grid.flags.writeable
+    assert playground.occupancy_grid(resolution=2).base is grid.base
+
+    # Borders, wall and box occupied, robot excluded
+    assert grid[0].all() and grid[-1].all() and grid[:, 0].all()
+    assert grid[25, 60] == OCCUPIED
+    assert grid[16:24, 11:19].all()
+    assert grid[35, 25] == FREE
+    assert np.array_equal(grid, _full_grid(playground, 2))
+
+    # The wall disappears: its cells are freed in the same array
+    for _ in range(3):
+        playground.step(all_commands={robot: robot.control()})
+    playground.occupancy_grid(resolution=2)
+    assert grid[25, 60] == FREE
+    assert np.array_equal(grid, _full_grid(playground, 2))
+
+    # The box is moved
+    box.move_to(((40, -20), 0))
+    playground.occupancy_grid(resolution=2)
+    assert grid[16:24, 11:19].sum() == 0
+    assert grid[31:39, 66:74].all()
+    assert np.array_equal(grid, _full_grid(playground, 2))
+
+    playground.cleanup()
+
+
+def test_occupancy_grid_needs_size():
+    grid = OccupancyGrid(size=(10, 10), center=(0, 0), resolution=3)
+    assert grid.shape == (4, 4)
+    with pytest.raises(ValueError):
+        OccupancyGrid(size=(10, 10), center=(0, 0), resolution=0)
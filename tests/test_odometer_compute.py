@@ -0,0 +1,102 @@
+import numpy as np
+
+from place_bot.simulation.batch.episode_farm import odometer_drift
+from place_bot.simulation.gui_map.closed_playground import ClosedPlayground
+from place_bot.simulation.robot.odometer import Odometer, OdometerParams
+from place_bot.simulation.robot.odometer_compute import (
+    read_displacement_log,
+    reintegrate_displacements,
+)
+from place_bot.simulation.robot.robot_abstract import RobotAbstract
+
+
+class MyRobot(RobotAbstract):
+    def __init__(self, rotation, noise=True):
+        odometer_params = OdometerParams()
+        if not noise:
+            odometer_params.param1 = odometer_params.param2 = 0
+            odometer_params.param3 = odometer_params.param4 = 0
+        super().__init__(odometer_params=odometer_params)
+        self.rotation = rotation
+
+    def control(self):
+        return {"forward": 0.5, "rotation": self.rotation}
+
+
+def _run(tmp_path, noise):
+    playground = ClosedPlayground(size=(600, 600), seed=0, windowless=True)
+    robots = [MyRobot(rotation, noise) for rotation in (0.2, -0.4, 0.0)]
+    for index, robot in enumerate(robots):
+        playground.add(robot, ((-150 + 150 * index, 0), 0.5 * index))
+
+    log_path = str(tmp_path / "odometry.bin")
+    playground.odometer_compute.start_recording(log_path)
+
+    poses, odometers = [], []
+    for _ in range(50):
+        poses.append([(*robot.true_position(), robot.true_angle()) for robot in robots])
+        playground.step(all_commands={robot: robot.control() for robot in robots})
+        odometers.append([robot.odometer_values() for robot in robots])
+    poses.append([(*robot.true_position(), robot.true_angle()) for robot in robots])
+
+    playground.odometer_compute.stop_recording()
+    playground.cleanup()
+    return np.array(poses), np.array(odometers), log_path
+
+
+def test_batched_odometers_follow_true_poses(tmp_path):
+    poses, odometers, _ = _run(tmp_path, noise=False)
+
+    # The odometer starts integrating at its first update, after the first step
+    for index in range(3):
+        trajectory = poses[1:, index]
+        odometer = odometers[:, index]
+        assert np.allclose(odometer_drift(trajectory, odometer), 0, atol=1e-6)
+
+
+def test_reintegrate_displacement_log(tmp_path):
+    _, odometers, log_path = _run(tmp_path, noise=True)
+    displacements = read_displacement_log(log_path)
+    assert displacements.shape == (50, 3, 3)
+
+    no_noise = OdometerParams()
+    no_noise.param1 = no_noise.param2 = no_noise.param3 = no_noise.param4 = 0
+
+    # Offline without noise: the true odometry, close to the noisy online one
+    reintegrated = reintegrate_displacements(displacements, no_noise)
+    assert reintegrated.shape == (51, 3, 3)
+    assert np.abs(reintegrated[1:, :, :2] - odometers[:, :, :2]).max() < 20
+
+    # Other parameters give another drift, reproducibly
+    noisier = OdometerParams()
+    noisier.param1 = 1.0
+    first = reintegrate_displacements(displacements, noisier, rng=np.random.default_rng(0))
+    second = reintegrate_displacements(displacements, noisier, rng=np.random.default_rng(0))
+    assert np.array_equal(first, second)
+    assert not np.allclose(first, reintegrated)
+
+
+def test_remove_odometer():
+    playground = ClosedPlayground(size=(600, 600), seed=0, windowless=True)
+    robots = [MyRobot(rotation) for rotation in (0.2, -0.4, 0.0)]
+    for index, robot in enumerate(robots):
+        playground.add(robot, ((-150 + 150 * index, 0), 0.5 * index))
+    odometers = [robot.sensors_of_type(Odometer)[0] for robot in robots]
+
+    for _ in range(5):
+        playground.step(all_commands={robot: robot.control() for robot in robots})
+    removed_values = robots[1].odometer_values()
+
+    playground.remove(robots[1], definitive=True)
+    odometer_compute = playground.odometer_compute
+    assert odometer_compute.odometers == [odometers[0], odometers[2]]
+    assert not odometers[1].batched
+
+    kept = [robots[0], robots[2]]
+    playground.step(all_commands={robot: robot.control() for robot in kept})
+    assert np.array_equal(robots[1].odometer_values(), removed_values)
+    for robot in kept:
+        trajectory_length = np.hypot(*robot.odometer_values()[:2])
+        assert 0 < trajectory_length < 20
+
+    playground.cleanup()
@@ -0,0 +1,47 @@
+import json
+
+from place_bot.simulation.gui_map.closed_playground import ClosedPlayground
+from place_bot.simulation.robot.robot_abstract import RobotAbstract
+from place_bot.simulation.utils.profiler import PROFILER, PhaseStats
+
+
+class MyRobot(RobotAbstract):
+    def control(self):
+        return {"forward": 1.0, "rotation": 0.0}
+
+
+def test_phase_stats():
+    stats = PhaseStats()
+    for duration in (0.001, 0.002, 0.003, 0.1):
+        stats.add(duration)
+
+    assert stats.count == 4
+    assert stats.max == 0.1
+    assert 0.002 <= stats.percentile(50) <= 0.003
+    assert sum(stats.histogram) == 4
+
+
+def test_profiler_step():
+    playground = ClosedPlayground(size=(200, 200), windowless=True)
+    robot = MyRobot()
+    playground.add(robot, ((0, 0), 0))
+
+    PROFILER.reset()
+    PROFILER.enable()
+    try:
+        for _ in range(5):
+            playground.step(all_commands={robot: robot.control()})
+    finally:
+        PROFILER.disable()
+
+    data = json.loads(PROFILER.dump_json())
+
+    assert data["counters"]["steps"] == 5
+    assert data["phases"]["physics"]["count"] == 5
+    assert data["phases"]["ray_analytic"]["count"] == 5
+    assert "physics" in PROFILER.summary()
+
+    # Nothing is collected when disabled
+    playground.step(all_commands={robot: robot.control()})
+    assert PROFILER.counters["steps"] == 5
+    PROFILER.reset()
@@ -0,0 +1,147 @@
+import gc
+
+import arcade
+import numpy as np
+
+from place_bot.simulation.gui_map.closed_playground import ClosedPlayground
+from place_bot.simulation.ray_sensors.lidar import LidarParams
+from place_bot.simulation.ray_sensors.shader_cache import SHADER_CACHE
+from place_bot.simulation.robot.robot_abstract import RobotAbstract
+
+
+class MyRobot(RobotAbstract):
+    def __init__(self, resolution=LidarParams.resolution):
+        lidar_params = LidarParams()
+        lidar_params.noise_enable = False
+        lidar_params.resolution = resolution
+        super().__init__(lidar_params=lidar_params)
+
+    def control(self):
+        return {"forward": 1.0, "rotation": 0.5}
+
+
+def _make_playground(**kwargs):
+    playground = ClosedPlayground(size=(300, 200), **kwargs)
+    robot = MyRobot()
+    playground.add(robot, ((0, 0), 0))
+    return playground, robot
+
+
+def test_async_readback_has_one_step_latency():
+    sync_playground, sync_robot = _make_playground()
+    async_playground, async_robot = _make_playground(async_ray_readback=True)
+
+    sync_values = []
+    for step in range(10):
+        sync_playground.step(all_commands={sync_robot: sync_robot.control()})
+        async_playground.step(all_commands={async_robot: async_robot.control()})
+
+        sync_values.append(sync_robot.lidar_values().copy())
+        async_values = async_robot.lidar_values()
+
+        expected = sync_values[max(step - 1, 0)]
+        assert np.allclose(async_values, expected)
+
+
+def test_async_readback_after_adding_a_sensor():
+    sync_playground, sync_robot = _make_playground()
+    async_playground, async_robot = _make_playground(async_ray_readback=True)
+    for playground in (sync_playground, async_playground):
+        playground.add(MyRobot(), ((-80, 40), 0))
+        playground.add(MyRobot(), ((-80, -40), 0))
+    for _ in range(3):
+        sync_playground.step()
+        async_playground.step()
+
+    # No buffer reallocation: the capacity has headroom for a fourth sensor
+    capacity = async_playground.ray_compute._sensor_capacity
+    sync_other, async_other = MyRobot(), MyRobot()
+    sync_playground.add(sync_other, ((60, 40), 1.0))
+    async_playground.add(async_other, ((60, 40), 1.0))
+    sync_playground.step()
+    async_playground.step()
+
+    assert async_playground.ray_compute._sensor_capacity == capacity
+    assert np.allclose(async_other.lidar_values(), sync_other.lidar_values())
+    assert np.allclose(async_robot.lidar_values(), sync_robot.lidar_values())
+
+    sync_playground.cleanup()
+    async_playground.cleanup()
+
+
+def test_persistent_buffers_and_invisible_update():
+    playground = ClosedPlayground(size=(400, 200))
+    robot = MyRobot()
+    other_robot = MyRobot()
+    playground.add(robot, ((0, 0), 0))
+    playground.add(other_robot, ((100, 0), 0))
+
+    playground.step()
+    assert robot.lidar_values()[180] < 100
+
+    ray_compute = playground.ray_compute
+    shader = ray_compute._id_shader
+    position_buffer = ray_compute._position_buffer
+
+    robot.lidar().add_to_temporary_invisible(other_robot.base)
+    playground.step()
+
+    # The other robot is now invisible, without any new shader nor buffer
+    assert robot.lidar_values()[180] > 150
+    assert ray_compute._id_shader is shader
+    assert ray_compute._position_buffer is position_buffer
+
+
+def test_shader_compiled_once_for_many_robots():
+    n_compilations = SHADER_CACHE.n_compilations
+
+    playground = ClosedPlayground(size=(400, 400))
+    robots = [MyRobot() for _ in range(5)]
+    for index, robot in enumerate(robots):
+        playground.add(robot, ((-150 + 70 * index, 0), 0))
+
+    playground.step()
+
+    assert SHADER_CACHE.n_compilations <= n_compilations + 1
+    assert all(robot.lidar_values().min() > 5 for robot in robots)
+
+    # The compiled shader is reused from the cache
+    shader = playground.ray_compute._id_shader
+    assert SHADER_CACHE.get(playground.ctx, playground.ray_compute._source_compute_ids,
+                            {"MAX_N_RAYS": robots[0].lidar().resolution,
+                             "RAYS_PER_GROUP": playground.ray_compute._rays_per_group}) is shader
+
+
+def test_more_rays_than_work_group_size():
+    values = []
+    for analytic_rays in (False, True):
+        playground = ClosedPlayground(size=(300, 200), analytic_rays=analytic_rays)
+        robot = MyRobot(resolution=1441)
+        playground.add(robot, ((0, 0), 0))
+        playground.step()
+        values.append(robot.lidar_values().copy())
+        playground.cleanup()
+
+    shader_values, analytic_values = values
+    assert len(shader_values) == 1441
+    assert np.median(np.abs(shader_values - analytic_values)) < 3
+
+
+def test_discarded_playground_keeps_active_window():
+    discarded, _ = _make_playground()
+    discarded.step()
+    playground, robot = _make_playground()
+    playground.step()
+
+    # The playground is not cleaned up: its window is closed when collected
+    del discarded
+    gc.collect()
+    assert arcade.get_window() is playground.window
+
+    other, _ = _make_playground()
+    other.step()
+    playground.step()
+    assert robot.lidar_values() is not None
+
+    other.cleanup()
+    playground.cleanup()
@@ -8,8 +8,8 @@ import pytest
 from place_bot.simulation.robot.robot_abstract import RobotAbstract
 from place_bot.simulation.robot.robot_abstract_display_lidar import RobotAbstractDisplayLidar
 from place_bot.simulation.robot.exceptions import DisabledFunctionError
-from place_bot.simulation.ray_sensors.lidar import LidarParams
-from place_bot.simulation.robot.odometer import OdometerParams
+from place_bot.simulation.ray_sensors.lidar import Lidar, LidarParams
+from place_bot.simulation.robot.odometer import Odometer, OdometerParams
 
 
 class TestRobot(RobotAbstract):
@@ -168,6 +168,20 @@ def test_estimated_velocity():
     assert linear >= 0.0
 
 
+def test_device_registries_are_cached():
+    """Test that the sensor registries are cached and updated when a device is added."""
+    robot = TestRobot()
+    sensors = robot.sensors
+    assert robot.sensors is sensors
+    assert robot.sensors_of_type(Lidar) == [robot.lidar()]
+    assert isinstance(robot.sensors[robot.SensorType.ODOMETER], Odometer)
+
+    other_lidar = Lidar(lidar_params=LidarParams())
+    robot.base.add_device(other_lidar)
+    assert robot.sensors is not sensors
+    assert robot.sensors[-1] is other_lidar
+    assert robot.sensors_of_type(Lidar) == [robot.lidar(), other_lidar]
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
-
@@ -0,0 +1,69 @@
+import arcade
+import pytest
+
+from place_bot.simulation.gui_map.closed_playground import ClosedPlayground
+from place_bot.simulation.gui_map.simulator import Simulator
+from place_bot.simulation.gui_map.world_abstract import WorldAbstract
+from place_bot.simulation.robot.robot_abstract import RobotAbstract
+from place_bot.simulation.utils.constants import FRAME_RATE
+
+
+class MyRobot(RobotAbstract):
+    def __init__(self):
+        super().__init__()
+        self.walltimes = []
+
+    def control(self):
+        self.walltimes.append(self.elapsed_walltime)
+        return {"forward": 0.5, "rotation": 0.1}
+
+
+class MyWorld(WorldAbstract):
+    def __init__(self, robot):
+        super().__init__(robot=robot)
+        self._size_area = (300, 200)
+        self._playground = ClosedPlayground(size=self._size_area, use_shaders=False)
+        self._playground.add(robot, ((0, 0), 0))
+
+
+def test_run_steps():
+    robot = MyRobot()
+    world = MyWorld(robot)
+    simulator = Simulator(the_world=world, size=(300, 200), headless=True)
+
+    assert simulator.run_steps(50, render_every=10) == 50
+    assert simulator.elapsed_timestep == 50
+    assert simulator.elapsed_walltime == pytest.approx(50 * FRAME_RATE)
+
+    # The robot is not controlled at the first timestep, and sees the
+    # simulated time of the previous timestep
+    assert len(robot.walltimes) == 49
+    assert robot.walltimes[-1] == pytest.approx(49 * FRAME_RATE)
+    assert robot.true_position()[0] > 0
+
+    world.playground.cleanup()
+
+
+def test_steps_per_frame_and_turbo():
+    robot = MyRobot()
+    world = MyWorld(robot)
+    simulator = Simulator(the_world=world, size=(300, 200), headless=True,
+                          steps_per_frame=3, turbo_steps_per_frame=20, turbo_fps=1)
+    frames = []
+    simulator.recorder.capture_frame = frames.append
+
+    simulator.on_update(FRAME_RATE)
+    assert simulator.elapsed_timestep == 3
+    assert len(frames) == 1
+
+    simulator.on_key_press(arcade.key.T, 0)
+    assert simulator.turbo
+    simulator.on_update(FRAME_RATE)
+    assert simulator.elapsed_timestep == 23
+    assert len(frames) == 2
+
+    simulator.on_key_press(arcade.key.T, 0)
+    simulator.on_update(FRAME_RATE)
+    assert simulator.elapsed_timestep == 26
+
+    world.playground.cleanup()
@@ -0,0 +1,96 @@
+import pickle
+
+import numpy as np
+
+from place_bot.simulation.elements.disappearing_wall import DisappearingWall
+from place_bot.simulation.elements.normal_wall import NormalBox
+from place_bot.simulation.gui_map.closed_playground import ClosedPlayground
+from place_bot.simulation.robot.odometer import Odometer
+from place_bot.simulation.robot.robot_abstract import RobotAbstract
+
+
+class MyRobot(RobotAbstract):
+    def control(self):
+        return {"forward": 1.0, "rotation": 0.3}
+
+
+def _build():
+    playground = ClosedPlayground(size=(300, 200), use_shaders=False, seed=3)
+    wall = DisappearingWall(pos_start=(60, -100), pos_end=(60, 100), disappear_after_timesteps=15)
+    playground.add(wall, wall.wall_coordinates)
+    box = NormalBox(up_left_point=(-120, 60), width=20, height=20, mass=10)
+    playground.add(box, box.wall_coordinates)
+    robot = MyRobot()
+    playground.add(robot, ((-60, -20), 0))
+    return playground, wall, box, robot
+
+
+def _run(playground, robot, n_steps):
+    states = []
+    for _ in range(n_steps):
+        playground.step(all_commands={robot: robot.control()})
+        states.append(np.concatenate([robot.true_position(), [robot.true_angle()],
+                                      robot.lidar_values(), robot.odometer_values()]))
+    return np.array(states)
+
+
+def test_restore_gives_same_rollouts():
+    playground, wall, box, robot = _build()
+    _run(playground, robot, 10)
+
+    snapshot = playground.snapshot()
+    reference = _run(playground, robot, 20)
+    assert wall.disappeared
+
+    playground.restore(snapshot)
+    assert playground.timestep == 10
+    assert not wall.disappeared and not wall.removed
+    assert wall in playground.elements
+    assert playground.get_entity_from_uid(wall.uid) is wall
+
+    first = _run(playground, robot, 20)
+    playground.restore(pickle.loads(pickle.dumps(snapshot)))
+    second = _run(playground, robot, 20)
+
+    assert np.array_equal(first, second)
+    assert wall.disappeared
+    assert np.allclose(first[:, :3], reference[:, :3], atol=1e-6)
+
+    playground.cleanup()
+
+
+def test_restore_removes_added_entities():
+    playground, _, box, robot = _build()
+    snapshot = playground.snapshot()
+
+    extra_box = NormalBox(up_left_point=(100, 60), width=10, height=10)
+    playground.add(extra_box, extra_box.wall_coordinates)
+    playground.remove(box)
+
+    playground.restore(snapshot)
+    assert extra_box not in playground.elements
+    assert extra_box.playground is None
+    assert not box.removed
+
+    playground.cleanup()
+
+
+def test_restore_removes_added_agents():
+    playground, _, _, robot = _build()
+    _run(playground, robot, 5)
+    snapshot = playground.snapshot()
+    reference = _run(playground, robot, 10)
+
+    playground.restore(snapshot)
+    other_robot = MyRobot()
+    playground.add(other_robot, ((100, 50), 0))
+    playground.step(all_commands={robot: robot.control(), other_robot: other_robot.control()})
+
+    playground.restore(snapshot)
+    assert other_robot not in playground.agents
+    assert other_robot.playground is None
+    assert playground.odometer_compute.odometers == robot.sensors_of_type(Odometer)
+
+    assert np.array_equal(_run(playground, robot, 10), reference)
+
+    playground.cleanup()
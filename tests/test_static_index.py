@@ -0,0 +1,74 @@
+import numpy as np
+import pymunk
+
+from place_bot.simulation.elements.normal_wall import NormalWall
+from place_bot.simulation.gui_map.closed_playground import ClosedPlayground
+from place_bot.simulation.gui_map.static_index import StaticIndex
+from place_bot.simulation.robot.robot_abstract import RobotAbstract
+
+
+class MyRobot(RobotAbstract):
+    def control(self):
+        return {"forward": 0.0, "rotation": 0.0}
+
+
+def _random_shapes(rng, n_shapes):
+    body = pymunk.Body(body_type=pymunk.Body.STATIC)
+    shapes = []
+    for _ in range(n_shapes):
+        x, y = rng.uniform(-300, 300, 2)
+        kind = rng.integers(3)
+        if kind == 0:
+            w, h = rng.uniform(5, 80, 2)
+            shapes.append(pymunk.Poly(body, [(x, y), (x + w, y), (x + w, y + h), (x, y + h)]))
+        elif kind == 1:
+            shapes.append(pymunk.Segment(body, (x, y), tuple(rng.uniform(-300, 300, 2)), 3))
+        else:
+            shapes.append(pymunk.Circle(body, rng.uniform(2, 30), (x, y)))
+    space = pymunk.Space()
+    space.add(body, *shapes)
+    return space, shapes
+
+
+def test_overlaps_many_matches_pymunk():
+    rng = np.random.default_rng(0)
+    space, shapes = _random_shapes(rng, 60)
+    positions = rng.uniform(-350, 350, (2000, 2))
+    radius = 12
+
+    expected = np.array([bool(space.point_query(tuple(position), radius, pymunk.ShapeFilter()))
+                         for position in positions])
+
+    for cell_size in (None, 7, 500):
+        index = StaticIndex(shapes, cell_size=cell_size)
+        assert np.array_equal(index.overlaps_many(positions, radius), expected)
+
+
+def test_empty_index():
+    index = StaticIndex([])
+    assert not index.overlaps_many(np.zeros((3, 2)), 10).any()
+
+
+def test_playground_sample_free_positions():
+    playground = ClosedPlayground(size=(400, 300), seed=1, use_shaders=False)
+    wall = NormalWall(pos_start=(0, -150), pos_end=(0, 150))
+    playground.add(wall, wall.wall_coordinates)
+    robot = MyRobot()
+    playground.add(robot, ((-100, 0), 0))
+
+    assert playground.overlaps_many([(0, 50), (-100, 10), (100, 0)], 10).tolist() == [True, True, False]
+
+    # A part of the robot does not overlap the other parts of the robot
+    assert not playground.overlaps(robot.base, ((-100, 0), 0))
+    assert playground.overlaps(robot.base, ((0, 0), 0))
+
+    positions = playground.sample_free_positions(20, radius=15)
+    assert positions.shape == (20, 2)
+    assert not playground.overlaps_many(positions, 15).any()
+    distances = np.hypot(*(positions[:, np.newaxis] - positions[np.newaxis]).transpose(2, 0, 1))
+    assert distances[~np.eye(20, dtype=bool)].min() >= 30
+
+    # The index follows the static entities
+    playground.remove(wall, definitive=True)
+    assert not playground.overlaps_many([(0, 50)], 10)[0]
+    playground.cleanup()
@@ -0,0 +1,55 @@
+import arcade
+import numpy as np
+from PIL import Image
+
+from place_bot.simulation.utils.texture_manager import TextureManager, paint_alpha_mask, uid_to_color
+
+
+def test_paint_alpha_mask():
+    pixels = np.zeros((4, 5, 4), dtype=np.uint8)
+    pixels[1:3, 2:4] = (10, 20, 30, 128)
+    image = Image.fromarray(pixels, "RGBA")
+
+    painted = np.asarray(paint_alpha_mask(image, uid_to_color(0x030201)))
+
+    assert painted.shape == (4, 5, 4)
+    assert np.all(painted[1:3, 2:4] == (1, 2, 3, 255))
+    assert np.all(painted[0] == 0)
+    assert np.all(painted[:, 0] == 0)
+
+
+def test_solid_textures_are_shared():
+    manager = TextureManager()
+
+    texture = manager.solid_texture((40, 6), (128, 128, 128))
+    assert manager.solid_texture((40, 6), (128, 128, 128, 255)) is texture
+    assert manager.solid_texture((41, 6), (128, 128, 128)) is not texture
+    assert texture.size == (40, 6)
+    assert texture.image.getpixel((0, 0)) == (128, 128, 128, 255)
+
+
+def test_crop_textures_are_shared(tmp_path):
+    file_name = str(tmp_path / "stone.png")
+    pixels = np.random.default_rng(0).integers(0, 255, (100, 100, 3), dtype=np.uint8)
+    Image.fromarray(pixels, "RGB").save(file_name)
+    manager = TextureManager()
+
+    texture = manager.crop_texture(file_name, (50, 6), variant=1)
+    assert manager.crop_texture(file_name, (50, 6), variant=1) is texture
+    assert manager.crop_texture(file_name, (50, 6), variant=2).name != texture.name
+    assert texture.size == (50, 6)
+    assert texture.image.mode == "RGBA"
+
+
+def test_mask_texture_tinted_gives_painted_texture():
+    manager = TextureManager()
+    pixels = np.zeros((4, 5, 4), dtype=np.uint8)
+    pixels[1:3, 2:4] = (10, 20, 30, 128)
+    texture = arcade.Texture("shape", image=Image.fromarray(pixels, "RGBA"))
+
+    mask = manager.mask_texture(texture)
+    assert manager.mask_texture(texture) is mask
+
+    color = np.array(uid_to_color(0x030201))
+    tinted = np.asarray(mask.image).astype(int) * color // 255
+    assert np.array_equal(tinted, np.asarray(paint_alpha_mask(texture.image, uid_to_color(0x030201))))
@@ -0,0 +1,69 @@
+import numpy as np
+
+from place_bot.simulation.elements.disappearing_wall import DisappearingWall
+from place_bot.simulation.gui_map.closed_playground import ClosedPlayground
+from place_bot.simulation.gui_map.top_down_view import TopDownView
+from place_bot.simulation.robot.robot_abstract import RobotAbstract
+
+
+class MyRobot(RobotAbstract):
+    def control(self):
+        return {"forward": 1.0, "rotation": 0.0}
+
+
+def test_static_layer():
+    playground = ClosedPlayground(size=(200, 200), use_shaders=False)
+    robot = MyRobot()
+    playground.add(robot, ((-50, 0), 0))
+    wall = DisappearingWall(pos_start=(20, -50), pos_end=(20, 50), disappear_after_timesteps=5)
+    playground.add(wall, wall.wall_coordinates)
+
+    view = TopDownView(playground, use_color_uid=True,
+                       draw_interactive=False, draw_transparent=False)
+
+    for _ in range(3):
+        playground.step(all_commands={robot: robot.control()})
+        view.update_and_draw_in_framebuffer()
+
+    assert view.uses_static_layer
+    img_with_layer = view.get_np_img().copy()
+
+    # The moving robot leaves no trail over the cached layer
+    fresh_view = TopDownView(playground, use_color_uid=True,
+                             draw_interactive=False, draw_transparent=False)
+    fresh_view.update_and_draw_in_framebuffer()
+    assert np.array_equal(img_with_layer, fresh_view.get_np_img())
+
+    # The wall disappears: the static layer is rebaked without it
+    wall_pixel = img_with_layer[100, 120].copy()
+    for _ in range(5):
+        playground.step(all_commands={robot: {"forward": 0.0, "rotation": 0.0}})
+    view.update_and_draw_in_framebuffer()
+
+    assert wall not in view.sprites
+    assert not np.array_equal(view.get_np_img()[100, 120], wall_pixel)
+
+
+def test_dirty_sprites():
+    playground = ClosedPlayground(size=(200, 200), use_shaders=False)
+    robot = MyRobot()
+    playground.add(robot, ((-50, 0), 0))
+    wall = DisappearingWall(pos_start=(20, -50), pos_end=(20, 50), disappear_after_timesteps=100)
+    playground.add(wall, wall.wall_coordinates)
+
+    view = TopDownView(playground, use_color_uid=True,
+                       draw_interactive=False, draw_transparent=False)
+    view.update_and_draw_in_framebuffer()
+
+    # Only the robot is checked at each update
+    assert wall not in view._dynamic_sprites
+    assert robot.base in view._dynamic_sprites
+
+    wall_pixel = view.get_np_img()[100, 120].copy()
+
+    # Moving a static entity marks its sprite as dirty in the view
+    wall.move_to(((60, 0), wall.wall_coordinates[1]), allow_overlapping=True)
+    view.update_and_draw_in_framebuffer()
+
+    assert np.array_equal(view.get_np_img()[100, 160], wall_pixel)
+    assert not np.array_equal(view.get_np_img()[100, 120], wall_pixel)
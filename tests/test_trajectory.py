@@ -0,0 +1,70 @@
+import numpy as np
+
+from place_bot.simulation.utils.path import Path
+from place_bot.simulation.utils.pose import Pose
+from place_bot.simulation.utils.trajectory import Trajectory
+
+
+def test_growable_trajectory():
+    trajectory = Trajectory(initial_capacity=2)
+    for index in range(100):
+        trajectory.append((index, 2 * index, 0.1))
+
+    assert len(trajectory) == 100
+    assert trajectory.array.shape == (100, 3)
+    assert np.array_equal(trajectory.array[:, 0], np.arange(100))
+
+    trajectory.extend(np.ones((300, 3)))
+    assert len(trajectory) == 400
+    assert np.all(trajectory[100:] == 1)
+
+
+def test_ring_buffer_trajectory():
+    trajectory = Trajectory(max_length=10)
+    for index in range(25):
+        trajectory.append((index, 0, 0))
+
+    assert len(trajectory) == 10
+    assert np.array_equal(trajectory.array[:, 0], np.arange(15, 25))
+    # The kept rows are a view on the storage, not a copy
+    assert trajectory.array.base is not None
+
+    trajectory.extend(np.arange(36).reshape(12, 3))
+    assert np.array_equal(trajectory.array[:, 0], np.arange(6, 36, 3))
+
+    trajectory.clear()
+    assert len(trajectory) == 0
+
+
+def test_path():
+    path = Path()
+    for index in range(5):
+        path.append(Pose(np.array([index, -index]), 0.5))
+
+    assert path.length() == 5
+    assert path.poses.shape == (5, 3)
+    assert path.get(3).orientation == 0.5
+    assert np.array_equal(path.get(3).position, [3, -3])
+
+    path.reset()
+    assert path.length() == 0
+
+
+def test_path_poses_are_independent():
+    path = Path()
+    path.append(Pose(np.array([1.0, 2.0]), 0.5))
+    pose = path.get(0)
+
+    path.reset()
+    path.append(Pose(np.array([9.0, 9.0]), 1.0))
+    assert np.array_equal(pose.position, [1.0, 2.0])
+    assert pose.orientation == 0.5
+
+    # Overwritten rows of a ring buffer
+    path = Path(max_length=2)
+    for index in range(2):
+        path.append(Pose(np.array([index, index]), 0.0))
+    pose = path.get(0)
+    for index in range(2, 5):
+        path.append(Pose(np.array([index, index]), 0.0))
+    assert np.array_equal(pose.position, [0, 0])
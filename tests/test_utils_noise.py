@@ -0,0 +1,61 @@
+import numpy as np
+
+from place_bot.simulation.gui_map.closed_playground import ClosedPlayground
+from place_bot.simulation.robot.robot_abstract import RobotAbstract
+from place_bot.simulation.utils.utils_noise import (
+    AutoregressiveModelNoise,
+    GaussianNoise,
+    StandardNormalBlocks,
+)
+
+
+class MyRobot(RobotAbstract):
+    def control(self):
+        return {"forward": 1.0, "rotation": 0.3}
+
+
+def test_standard_normal_blocks():
+    blocks = StandardNormalBlocks(shape=(3,), block_size=4, rng=np.random.default_rng(0))
+    samples = np.array([blocks.next() for _ in range(10)])
+
+    # Same values as drawn at once, whatever the block boundaries
+    expected = np.random.default_rng(0).standard_normal((12, 3))[:10]
+    assert np.allclose(samples, expected)
+
+    scalars = StandardNormalBlocks(rng=np.random.default_rng(0))
+    assert isinstance(scalars.next(), float)
+
+
+def test_noise_models_are_reproducible():
+    values = np.zeros(361)
+    for model_class, kwargs in ((GaussianNoise, {"std_dev_noise": 2.0}),
+                                (AutoregressiveModelNoise, {"model_param": 0.5, "std_dev_noise": 2.0})):
+        first = model_class(rng=np.random.default_rng(1), **kwargs)
+        second = model_class(rng=np.random.default_rng(1), **kwargs)
+        for _ in range(5):
+            assert np.array_equal(first.add_noise(values.copy()), second.add_noise(values.copy()))
+
+    noise = GaussianNoise(std_dev_noise=2.0, rng=np.random.default_rng(2))
+    samples = np.array([noise.add_noise(values) for _ in range(100)])
+    assert abs(samples.std() - 2.0) < 0.05
+
+
+def test_sensor_noise_depends_on_playground_seed():
+    def run(seed):
+        playground = ClosedPlayground(size=(300, 200), seed=seed, windowless=True)
+        robot = MyRobot()
+        playground.add(robot, ((0, 0), 0))
+        for _ in range(10):
+            playground.step(all_commands={robot: robot.control()})
+        values = robot.lidar_values().copy(), robot.odometer_values().copy()
+        playground.cleanup()
+        return values
+
+    lidar_0, odometer_0 = run(seed=0)
+    lidar_0_again, odometer_0_again = run(seed=0)
+    lidar_1, odometer_1 = run(seed=1)
+
+    assert np.array_equal(lidar_0, lidar_0_again)
+    assert np.array_equal(odometer_0, odometer_0_again)
+    assert not np.array_equal(lidar_0, lidar_1)
+    assert not np.array_equal(odometer_0, odometer_1)
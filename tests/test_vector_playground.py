@@ -0,0 +1,75 @@
+import random
+
+import numpy as np
+
+from place_bot.simulation.batch.vector_playground import (
+    VectorPlayground,
+    make_windowless_world,
+)
+from place_bot.simulation.gui_map.closed_playground import ClosedPlayground
+from place_bot.simulation.gui_map.world_abstract import WorldAbstract
+from place_bot.simulation.ray_sensors.lidar import LidarParams
+from place_bot.simulation.robot.robot_abstract import RobotAbstract
+
+
+class MyRobot(RobotAbstract):
+    def __init__(self):
+        lidar_params = LidarParams()
+        lidar_params.noise_enable = False
+        super().__init__(lidar_params=lidar_params)
+
+    def control(self):
+        return {"forward": 0.5, "rotation": 0.1}
+
+
+class MyWorld(WorldAbstract):
+    def __init__(self, robot: RobotAbstract, playground_options=None):
+        super().__init__(robot=robot, playground_options=playground_options)
+        self._size_area = (300, 200)
+        self._playground = ClosedPlayground(size=self._size_area, **self.playground_options)
+        self._playground.add(robot, ((20, -10), 0.3))
+
+
+def test_vector_playground_shapes():
+    vector_playground = VectorPlayground(MyWorld, MyRobot, seeds=range(3))
+    lidar, odometer = vector_playground.reset()
+
+    assert lidar.shape == (3, vector_playground.robots[0].lidar().resolution)
+    assert odometer.shape == (3, 3)
+    assert all(not playground.has_window for playground in vector_playground.playgrounds)
+
+    lidar, odometer = vector_playground.step(vector_playground.robot_commands())
+
+    assert not np.isnan(lidar).any()
+    assert vector_playground.true_poses().shape == (3, 3)
+
+
+def test_vector_playground_matches_single_world():
+    commands = np.array([[1.0, 0.0], [0.5, 0.2]])
+    vector_playground = VectorPlayground(MyWorld, MyRobot, seeds=[0, 1])
+    vector_playground.reset()
+
+    single_world = make_windowless_world(MyWorld, MyRobot)
+    robot = single_world.robot
+
+    for _ in range(5):
+        lidar, _ = vector_playground.step(commands)
+        single_world.playground.step(
+            all_commands={robot: {"forward": 0.5, "rotation": 0.2}})
+
+    assert np.allclose(vector_playground.true_poses()[1, :2], robot.true_position())
+    assert np.allclose(lidar[1], robot.lidar_values(), atol=1e-6)
+
+
+def test_make_windowless_world_keeps_global_random_state():
+    random.seed(7)
+    np.random.seed(7)
+    expected = (random.random(), np.random.random())
+
+    random.seed(7)
+    np.random.seed(7)
+    world = make_windowless_world(MyWorld, MyRobot, seed=3)
+    assert (random.random(), np.random.random()) == expected
+
+    assert world.playground.windowless
+    world.playground.cleanup()